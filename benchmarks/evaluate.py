@@ -0,0 +1,430 @@
+import os
+import sys
+import glob
+import json
+import copy
+import argparse
+import itertools
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from config.settings import Settings
+from config.constants import CACHE_DIR
+from core.detections import box_iou
+from core.events import SignEvent, SignEventType
+from core.processor import FrameProcessor, cascade_summary
+from core.replay_cache import ReplayCache, REPLAY_DIR
+from services.model_service import ModelService
+from utils.file_handler import FileHandler
+from benchmarks.synthetic import load_fixture, make_frames, _background
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov")
+GRID_KEYS = {
+    "model": str,
+    "input_size": int,
+    "conf_threshold": float,
+    "nms_iou": float,
+    "votes_needed": int,
+    "detect_every": int,
+    "frames_per_second": int,
+    "gatekeeper": lambda v: "" if v == "none" else v,
+    "gatekeeper_size": int,
+    "gatekeeper_conf": float,
+    "cascade_every": int,
+}
+SETTING_NAMES = {"model": "model_name", "gatekeeper": "gatekeeper_model"}
+SYNTHETIC_DIR = os.path.join(CACHE_DIR, "benchmarks", "eval")
+
+
+@dataclass
+class GroundTruthEvent:
+    label: str
+    start: float
+    end: float
+
+
+@dataclass
+class Dataset:
+    images: List[Tuple[str, str]]
+    videos: List[Tuple[str, str]]
+    
+    @classmethod
+    def scan(cls, root: str) -> "Dataset":
+        images = []
+        for path in sorted(glob.glob(os.path.join(root, "images", "*"))):
+            stem, ext = os.path.splitext(os.path.basename(path))
+            label = os.path.join(root, "labels", f"{stem}.txt")
+            if ext.lower() in IMAGE_EXTENSIONS and os.path.exists(label):
+                images.append((path, label))
+        videos = []
+        for path in sorted(glob.glob(os.path.join(root, "videos", "*"))):
+            stem, ext = os.path.splitext(path)
+            if ext.lower() in VIDEO_EXTENSIONS and os.path.exists(f"{stem}.json"):
+                videos.append((path, f"{stem}.json"))
+        return cls(images, videos)
+
+
+def load_yolo_labels(path: str, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 5:
+                rows.append([float(p) for p in parts[:5]])
+    if not rows:
+        return np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.int32)
+    arr = np.array(rows, dtype=np.float32)
+    cx, cy, w, h = arr[:, 1] * width, arr[:, 2] * height, arr[:, 3] * width, arr[:, 4] * height
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    return np.rint(boxes).astype(np.int32), arr[:, 0].astype(np.int32)
+
+
+def load_events(path: str) -> List[GroundTruthEvent]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    events = data.get("events", []) if isinstance(data, dict) else data
+    return [GroundTruthEvent(e["label"], float(e["start"]), float(e["end"])) for e in events]
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    r = np.concatenate([[0.0], recall, [1.0]])
+    p = np.concatenate([[0.0], precision, [0.0]])
+    p = np.maximum.accumulate(p[::-1])[::-1]
+    idx = np.flatnonzero(r[1:] != r[:-1])
+    return float(np.sum((r[idx + 1] - r[idx]) * p[idx + 1]))
+
+
+def detection_map(predictions: List[Tuple], ground_truth: List[Tuple], iou_threshold: float = 0.5) -> Tuple[float, Dict[int, float]]:
+    classes = sorted({int(c) for _, ids in ground_truth for c in ids})
+    per_class = {}
+    for cls in classes:
+        scores, hits = [], []
+        total = 0
+        for (p_boxes, p_scores, p_ids), (g_boxes, g_ids) in zip(predictions, ground_truth):
+            gt = g_boxes[g_ids == cls]
+            total += len(gt)
+            mask = p_ids == cls
+            boxes, conf = p_boxes[mask], p_scores[mask]
+            if not len(boxes):
+                continue
+            order = np.argsort(-conf)
+            boxes, conf = boxes[order], conf[order]
+            used = np.zeros(len(gt), dtype=bool)
+            ious = box_iou(boxes, gt) if len(gt) else np.zeros((len(boxes), 0))
+            for i in range(len(boxes)):
+                scores.append(float(conf[i]))
+                j = int(np.argmax(ious[i])) if ious.shape[1] else -1
+                hit = j >= 0 and ious[i, j] >= iou_threshold and not used[j]
+                if hit:
+                    used[j] = True
+                hits.append(hit)
+        if not total:
+            continue
+        if not scores:
+            per_class[cls] = 0.0
+            continue
+        order = np.argsort(-np.array(scores), kind="stable")
+        tp = np.cumsum(np.array(hits)[order])
+        fp = np.cumsum(~np.array(hits)[order])
+        per_class[cls] = average_precision(tp / total, tp / np.maximum(tp + fp, 1))
+    mean = float(np.mean(list(per_class.values()))) if per_class else 0.0
+    return mean, per_class
+
+
+def match_decisions(decided: List[Tuple[float, str]], truth: List[GroundTruthEvent], tolerance: float = 1.0) -> Dict:
+    used = [False] * len(decided)
+    correct, wrong, delays = 0, 0, []
+    for event in sorted(truth, key=lambda e: e.start):
+        match = None
+        for i, (t, label) in enumerate(decided):
+            if not used[i] and event.start <= t <= event.end + tolerance:
+                match = i
+                if label == event.label:
+                    break
+        if match is None:
+            continue
+        used[match] = True
+        t, label = decided[match]
+        if label == event.label:
+            correct += 1
+            delays.append(t - event.start)
+        else:
+            wrong += 1
+    return {
+        "events": len(truth),
+        "correct": correct,
+        "wrong": wrong,
+        "missed": len(truth) - correct - wrong,
+        "spurious": used.count(False),
+        "delays": delays,
+    }
+
+
+class Evaluator:
+    def __init__(self, dataset: Dataset, settings: Settings, model_service: ModelService, tolerance: float = 1.0, cache: bool = False):
+        self.dataset = dataset
+        self.settings = settings
+        self.model_service = model_service
+        self.tolerance = tolerance
+        self.cache = cache
+        self.replayed = 0
+    
+    def _settings(self, config: Dict) -> Settings:
+        settings = copy.deepcopy(self.settings)
+        det = settings.detection
+        det.target_classes = []
+        det.exclude_classes = []
+        det.auto_roi = False
+        det.telemetry_sample = 0
+        for key, value in config.items():
+            setattr(det, SETTING_NAMES.get(key, key), value)
+        return settings
+    
+    def _processor(self, detector, settings: Settings) -> FrameProcessor:
+        processor = FrameProcessor(detector, settings)
+        processor.gatekeeper = self.model_service.gatekeeper
+        processor.cascade_audit = True
+        return processor
+    
+    def _load(self, settings: Settings):
+        if not self.model_service.load_model(settings.detection.model_name):
+            raise RuntimeError(f"Cannot load model: {settings.detection.model_name}")
+        gatekeeper = settings.detection.gatekeeper_model
+        if not gatekeeper:
+            self.model_service.unload_gatekeeper()
+        elif not self.model_service.load_gatekeeper(gatekeeper):
+            raise RuntimeError(f"Cannot load gatekeeper model: {gatekeeper}")
+    
+    def _run_video(self, processor: FrameProcessor, video_path: str) -> Optional[Tuple[int, float]]:
+        frames, total_ms = 0, 0.0
+        cache = None
+        if self.cache and not (processor.gatekeeper or processor.flow or processor.resolution or processor.prior):
+            model = self.model_service.current_model
+            classifier = processor.classifier
+            classifier_md5 = FileHandler.md5(classifier.model_path) if classifier and classifier.is_loaded else ""
+            cache = ReplayCache.for_video(
+                video_path, model.md5 if model else "", processor.input_size, processor.process_rate, classifier_md5
+            )
+            replay = cache.open()
+            if replay:
+                for _, time_ms in processor.replay(replay):
+                    frames += 1
+                    total_ms += time_ms
+                self.replayed += 1
+                return frames, total_ms
+        
+        if not processor.open_video(video_path, video_clock=True):
+            return None
+        recorder = cache.record(processor) if cache else None
+        try:
+            for _, _, time_ms in processor.stream_video():
+                frames += 1
+                total_ms += time_ms
+        except BaseException:
+            if recorder:
+                recorder.abort()
+            raise
+        finally:
+            processor.close()
+        if recorder:
+            recorder.finish(video=video_path, input_size=processor.input_size, process_rate=processor.process_rate)
+        return frames, total_ms
+    
+    def evaluate(self, config: Dict) -> Dict:
+        settings = self._settings(config)
+        self._load(settings)
+        detector = self.model_service.detector
+        
+        frames, total_ms = 0, 0.0
+        predictions, truth = [], []
+        processor = self._processor(detector, settings)
+        processor.flow = None
+        processors = [processor]
+        for image_path, label_path in self.dataset.images:
+            image = cv2.imread(image_path)
+            if image is None:
+                continue
+            detections, time_ms = processor.process_frame(image)
+            predictions.append((detections.boxes, detections.scores, detections.class_ids))
+            truth.append(load_yolo_labels(label_path, image.shape[1], image.shape[0]))
+            frames += 1
+            total_ms += time_ms
+        
+        decisions = {"events": 0, "correct": 0, "wrong": 0, "missed": 0, "spurious": 0, "delays": []}
+        for video_path, events_path in self.dataset.videos:
+            processor = self._processor(detector, settings)
+            processors.append(processor)
+            decided: List[Tuple[float, str]] = []
+            
+            def on_event(event: SignEvent, out=decided):
+                if event.type == SignEventType.DECIDED:
+                    out.append((event.timestamp, event.label))
+            
+            processor.sign_state.add_listener(on_event)
+            run = self._run_video(processor, video_path)
+            if run is None:
+                continue
+            frames += run[0]
+            total_ms += run[1]
+            result = match_decisions(decided, load_events(events_path), self.tolerance)
+            for key, value in result.items():
+                decisions[key] += value
+        
+        mean_ap, per_class = detection_map(predictions, truth) if truth else (None, {})
+        delays = decisions.pop("delays")
+        cascade = None
+        if self.model_service.gatekeeper:
+            stats = {k: sum(p.cascade_stats[k] for p in processors) for k in processors[0].cascade_stats}
+            cascade = cascade_summary(stats, [t for p in processors for t in p.detect_times], audited=True)
+        return {
+            "config": config,
+            "frames": frames,
+            "fps": round(frames / (total_ms / 1000), 2) if total_ms else 0.0,
+            "map50": round(mean_ap, 4) if mean_ap is not None else None,
+            "ap50": {detector.class_names[c] if c < len(detector.class_names) else str(c): round(v, 4) for c, v in per_class.items()},
+            "decision_acc": round(decisions["correct"] / decisions["events"], 4) if decisions["events"] else None,
+            "ttd_s": round(float(np.median(delays)), 3) if delays else None,
+            "decisions": decisions,
+            "cascade": cascade,
+        }
+
+
+def parse_grid(specs: List[str], defaults: Dict) -> List[Dict]:
+    axes = {}
+    for spec in specs:
+        key, _, values = spec.partition("=")
+        if key not in GRID_KEYS or not values:
+            raise ValueError(f"bad grid axis '{spec}', expected one of {', '.join(GRID_KEYS)}=v1,v2")
+        axes[key] = [GRID_KEYS[key](v) for v in values.split(",")]
+    if not axes:
+        return [dict(defaults)]
+    keys = list(axes)
+    return [dict(defaults, **dict(zip(keys, combo))) for combo in itertools.product(*(axes[k] for k in keys))]
+
+
+def pareto_front(rows: List[Dict], objectives: Tuple[str, ...] = ("fps", "map50", "decision_acc")) -> List[bool]:
+    keys = [k for k in objectives if all(r.get(k) is not None for r in rows)]
+    values = [[r[k] for k in keys] for r in rows]
+    front = []
+    for i, a in enumerate(values):
+        dominated = any(
+            all(x >= y for x, y in zip(b, a)) and any(x > y for x, y in zip(b, a))
+            for j, b in enumerate(values) if j != i
+        )
+        front.append(not dominated)
+    return front
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def print_table(rows: List[Dict]):
+    front = pareto_front(rows)
+    axes = list(rows[0]["config"]) if rows else []
+    cascade = any(row.get("cascade") for row in rows)
+    header = axes + ["fps", "mAP50", "dec.acc", "ttd s"] + (["skip", "saved", "miss"] if cascade else []) + ["pareto"]
+    table = []
+    for row, best in sorted(zip(rows, front), key=lambda x: -x[0]["fps"]):
+        line = [str(row["config"][k]) for k in axes] + [
+            _fmt(row["fps"], ".1f"),
+            _fmt(row["map50"], ".3f"),
+            _fmt(row["decision_acc"], ".3f"),
+            _fmt(row["ttd_s"], ".2f"),
+        ]
+        if cascade:
+            stats = row.get("cascade") or {}
+            line += [_fmt(stats.get("skip_rate"), ".1%"), _fmt(stats.get("savings"), ".1%"), _fmt(stats.get("miss_rate"), ".1%")]
+        table.append(line + ["*" if best else ""])
+    widths = [max(len(h), *(len(r[i]) for r in table)) for i, h in enumerate(header)]
+    print("  ".join(h.rjust(w) for h, w in zip(header, widths)))
+    for r in table:
+        print("  ".join(v.rjust(w) for v, w in zip(r, widths)))
+
+
+def write_synthetic(root: str, class_name: str = "P.127", images: int = 12, videos: int = 2, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    for sub in ("images", "labels", "videos"):
+        os.makedirs(os.path.join(root, sub), exist_ok=True)
+    
+    for i, frame in enumerate(make_frames(images, resolutions=[(640, 360), (1280, 720)], seed=seed)):
+        cv2.imwrite(os.path.join(root, "images", f"{i:04d}.jpg"), frame.image)
+        w, h = frame.resolution
+        with open(os.path.join(root, "labels", f"{i:04d}.txt"), "w", encoding="utf-8") as f:
+            for x1, y1, x2, y2 in frame.boxes:
+                f.write(f"0 {(x1 + x2) / 2 / w:.6f} {(y1 + y2) / 2 / h:.6f} {(x2 - x1) / w:.6f} {(y2 - y1) / h:.6f}\n")
+    
+    fixture = load_fixture()
+    fps, width, height = 10, 640, 360
+    for v in range(videos):
+        background = _background(width, height, rng)
+        path = os.path.join(root, "videos", f"clip{v:02d}.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+        start, end = 10, 40
+        for t in range(60):
+            frame = background.copy()
+            if start <= t < end:
+                size = 60 + (t - start) * 2
+                x = 80 + (t - start) * 12
+                frame[100:100 + size, x:x + size] = cv2.resize(fixture, (size, size))
+            writer.write(frame)
+        writer.release()
+        with open(os.path.join(root, "videos", f"clip{v:02d}.json"), "w", encoding="utf-8") as f:
+            json.dump({"events": [{"label": class_name, "start": start / fps, "end": end / fps}]}, f)
+    return root
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Accuracy vs throughput evaluation over labeled footage",
+        epilog="Dataset layout: images/*.jpg + labels/*.txt (YOLO), videos/*.mp4 + videos/*.json "
+               "({\"events\": [{\"label\", \"start\", \"end\"}]}, seconds from video start)"
+    )
+    parser.add_argument("dataset", nargs="?", help="Dataset root folder")
+    parser.add_argument("--grid", nargs="*", default=[], metavar="KEY=V1,V2", help=f"Sweep axes: {', '.join(GRID_KEYS)}")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Seconds after an event ends a decision still counts")
+    parser.add_argument("--threads", type=int, default=1, help="OpenCV/torch thread count")
+    parser.add_argument("--synthetic", action="store_true", help="Generate and use a small synthetic dataset")
+    parser.add_argument("--output", type=str, help="Write results JSON to path")
+    parser.add_argument("--cache", action="store_true", help="Record raw detector outputs per video and replay them when only post-processing settings change")
+    args = parser.parse_args(argv)
+    
+    if not args.dataset and not args.synthetic:
+        parser.error("dataset folder required (or --synthetic)")
+    root = write_synthetic(SYNTHETIC_DIR) if args.synthetic else args.dataset
+    dataset = Dataset.scan(root)
+    if not dataset.images and not dataset.videos:
+        parser.error(f"no labeled images or videos found in {root}")
+    
+    cv2.setNumThreads(args.threads)
+    try:
+        import torch
+        torch.set_num_threads(args.threads)
+    except ImportError:
+        pass
+    
+    settings = Settings.load()
+    try:
+        configs = parse_grid(args.grid, {"model": settings.detection.model_name})
+    except ValueError as e:
+        parser.error(str(e))
+    
+    evaluator = Evaluator(dataset, settings, ModelService(), args.tolerance, args.cache)
+    rows = []
+    for config in configs:
+        rows.append(evaluator.evaluate(config))
+        print(f"evaluated {config}: {rows[-1]['fps']:.1f} fps")
+    
+    print_table(rows)
+    if evaluator.replayed:
+        print(f"replayed {evaluator.replayed} video run(s) from {REPLAY_DIR}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
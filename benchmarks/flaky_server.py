@@ -0,0 +1,143 @@
+import os
+import re
+import argparse
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Tuple
+
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class FlakyFileServer:
+    def __init__(
+        self,
+        path: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        drop_after: int = 0,
+        ranges: bool = True,
+        head: bool = True
+    ):
+        self.path = path
+        self.drop_after = drop_after
+        self.ranges = ranges
+        self.head = head
+        self.requests = 0
+        self.bytes_sent = 0
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.etag = '"' + hashlib.md5(self.data).hexdigest() + '"'
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{os.path.basename(self.path)}"
+    
+    def start(self) -> "FlakyFileServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _range(self, header: str) -> Optional[Tuple[int, int]]:
+        match = RANGE_RE.match(header or "")
+        if not match or not self.ranges:
+            return None
+        start, end = match.groups()
+        size = len(self.data)
+        if not start:
+            return max(0, size - int(end)), size
+        return int(start), min(size, int(end) + 1) if end else size
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, fmt, *args):
+                pass
+            
+            def _headers(self, status: int, length: int, extra: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Length", str(length))
+                self.send_header("ETag", server.etag)
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                for key, value in (extra or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+            
+            def do_HEAD(self):
+                if not server.head:
+                    self.send_error(405)
+                    return
+                self._headers(200, len(server.data))
+            
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                size = len(server.data)
+                span = server._range(self.headers.get("Range"))
+                if_range = self.headers.get("If-Range")
+                if span and if_range and if_range != server.etag:
+                    span = None
+                if span:
+                    start, end = span
+                    self._headers(206, end - start, {"Content-Range": f"bytes {start}-{end - 1}/{size}"})
+                else:
+                    start, end = 0, size
+                    self._headers(200, size)
+                
+                limit = end - start
+                if server.drop_after:
+                    limit = min(limit, server.drop_after)
+                self.wfile.write(server.data[start:start + limit])
+                with server._lock:
+                    server.bytes_sent += limit
+                if limit < end - start:
+                    self.close_connection = True
+        
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a file over HTTP, dropping connections part way through")
+    parser.add_argument("path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--drop-after", type=int, default=0, help="Close each response after N bytes (0 = never)")
+    parser.add_argument("--no-ranges", action="store_true")
+    parser.add_argument("--no-head", action="store_true")
+    args = parser.parse_args()
+    
+    server = FlakyFileServer(args.path, args.host, args.port, args.drop_after, not args.no_ranges, not args.no_head)
+    print(f"Serving {server.url}")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import cv2
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from config.settings import Settings
+from config.constants import MODELS_DIR, CACHE_DIR
+from core.onnx_detector import ONNXDetector, Detection
+from core.classifier import SpeedClassifier
+from core.processor import MultiSignState
+from core.visualizer import Visualizer
+from core.flow_tracker import FlowTracker
+from core.detections import DetectionBatch
+from services.model_service import ModelService
+from benchmarks.synthetic import make_frames, jitter_boxes
+from benchmarks.tiny_model import write_tiny_yolo, write_tiny_classifier
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+FIXTURE_DIR = os.path.join(CACHE_DIR, "benchmarks")
+TINY_CLASSES = ["P.127", "P.115", "P.102", "W.201", "W.207", "R.302", "I.423"]
+
+
+class BenchmarkContext:
+    def __init__(self, frame_count: int = 24, input_size: int = 320, force_tiny: bool = False, seed: int = 0):
+        self.settings = Settings()
+        self.settings.detection.input_size = input_size
+        self.seed = seed
+        self.frames = make_frames(frame_count, seed=seed)
+        self.model_service = ModelService()
+        self.detector, self.detector_source = self._load_detector(force_tiny)
+        self.classifier, self.classifier_source = self._load_classifier(force_tiny)
+        self.labels = self.detector.class_names or TINY_CLASSES
+        self.detections = self._ground_truth_detections()
+    
+    def _load_detector(self, force_tiny: bool):
+        name = self.settings.detection.model_name
+        if not force_tiny and os.path.exists(os.path.join(MODELS_DIR, name)) and self.model_service.load_model(name):
+            return self.model_service.detector, name
+        path = write_tiny_yolo(os.path.join(FIXTURE_DIR, "tiny_yolo.onnx"), TINY_CLASSES, seed=self.seed)
+        detector = ONNXDetector()
+        if not detector.load(path, TINY_CLASSES):
+            raise RuntimeError("Cannot load generated benchmark model")
+        self.model_service._detector = detector
+        return detector, "tiny"
+    
+    def _load_classifier(self, force_tiny: bool):
+        path = os.path.join(MODELS_DIR, self.settings.detection.classifier_model)
+        source = self.settings.detection.classifier_model
+        if force_tiny or not os.path.exists(path):
+            path = write_tiny_classifier(os.path.join(FIXTURE_DIR, "tiny_classifier.pth"), SpeedClassifier.CLASSES, seed=self.seed)
+            source = "tiny"
+        classifier = SpeedClassifier()
+        if not classifier.load(path):
+            raise RuntimeError(f"Cannot load classifier: {path}")
+        return classifier, source
+    
+    def _ground_truth_detections(self) -> List[List[Detection]]:
+        rng = np.random.default_rng(self.seed)
+        out = []
+        for frame in self.frames:
+            boxes = jitter_boxes(frame.boxes, rng)
+            out.append([
+                Detection(bbox=box, conf=0.8, label=self.labels[i % len(self.labels)], class_id=i % len(self.labels))
+                for i, box in enumerate(boxes)
+            ])
+        return out
+
+
+def bench_detect(ctx: BenchmarkContext) -> List[Callable]:
+    conf = ctx.settings.detection.conf_threshold
+    imgsz = ctx.settings.detection.input_size
+    return [lambda f=f: ctx.detector.detect(f.image, conf=conf, imgsz=imgsz) for f in ctx.frames]
+
+
+def bench_classify(ctx: BenchmarkContext) -> List[Callable]:
+    crops = [f.image[y1:y2, x1:x2] for f in ctx.frames for x1, y1, x2, y2 in f.boxes]
+    return [lambda c=c: ctx.classifier.classify(c) for c in crops]
+
+
+def bench_sign_state(ctx: BenchmarkContext) -> List[Callable]:
+    state = MultiSignState(votes_needed=3)
+    
+    def step(dets: List[Detection]):
+        for det in dets:
+            state.add_vote(det.bbox, det.label)
+        state.cleanup()
+        return state.results, state.progress_list, state.active_trackers
+    
+    return [lambda d=d: step(d) for d in ctx.detections]
+
+
+def bench_visualizer(ctx: BenchmarkContext) -> List[Callable]:
+    vis = Visualizer()
+    return [
+        lambda f=f, d=d: vis.render(f.image, d, 12.0, d[0].label if d else None, "2/3")
+        for f, d in zip(ctx.frames, ctx.detections)
+    ]
+
+
+def bench_flow(ctx: BenchmarkContext) -> List[Callable]:
+    tracker = FlowTracker()
+    calls = []
+    for frame, dets in zip(ctx.frames, ctx.detections):
+        moved = np.roll(frame.image, (3, 6), axis=(0, 1))
+        batch = DetectionBatch.from_detections(dets, ctx.labels)
+        ids = list(range(len(dets)))
+        calls.append(lambda f=frame.image, m=moved, b=batch, i=ids: (tracker.seed(f, b, i), tracker.propagate(m)))
+    return calls
+
+
+def _dashboard_calls(ctx: BenchmarkContext, cold: bool) -> List[Callable]:
+    from ui.dashboard import Dashboard
+    
+    dashboard = Dashboard(ctx.settings, ctx.model_service)
+    state = MultiSignState(votes_needed=3)
+    for dets in ctx.detections:
+        for det in dets:
+            state.add_vote(det.bbox, det.label)
+    results, progress, trackers = state.results, state.progress_list, state.active_trackers
+    
+    def step(frame, dets):
+        if cold:
+            dashboard.invalidate()
+        return dashboard.render(frame, dets, 12.0, results, progress, trackers)
+    
+    return [lambda f=f, d=d: step(f.image, d) for f, d in zip(ctx.frames, ctx.detections)]
+
+
+def bench_dashboard(ctx: BenchmarkContext) -> List[Callable]:
+    return _dashboard_calls(ctx, cold=False)
+
+
+def bench_dashboard_cold(ctx: BenchmarkContext) -> List[Callable]:
+    return _dashboard_calls(ctx, cold=True)
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], List[Callable]]] = {
+    "detect": bench_detect,
+    "classify": bench_classify,
+    "sign_state": bench_sign_state,
+    "visualizer": bench_visualizer,
+    "flow": bench_flow,
+    "dashboard": bench_dashboard,
+    "dashboard_cold": bench_dashboard_cold,
+}
+
+
+def measure(calls: List[Callable], repeat: int = 3, warmup: int = 3) -> Dict:
+    for call in calls[:warmup]:
+        call()
+    latencies = []
+    t_start = time.perf_counter()
+    for _ in range(repeat):
+        for call in calls:
+            t0 = time.perf_counter()
+            call()
+            latencies.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - t_start
+    arr = np.array(latencies)
+    return {
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / total, 2) if total > 0 else 0.0,
+        "mean_ms": round(float(arr.mean()), 4),
+        "p50_ms": round(float(np.percentile(arr, 50)), 4),
+        "p95_ms": round(float(np.percentile(arr, 95)), 4),
+        "max_ms": round(float(arr.max()), 4),
+    }
+
+
+def run(ctx: BenchmarkContext, names: List[str], repeat: int) -> Dict:
+    results = {}
+    for name in names:
+        results[name] = measure(BENCHMARKS[name](ctx), repeat=repeat)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "detector": ctx.detector_source,
+            "classifier": ctx.classifier_source,
+            "frames": len(ctx.frames),
+            "input_size": ctx.settings.detection.input_size,
+            "seed": ctx.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"{'benchmark':<16}{'p50 ms':>10}{'base ms':>10}{'ratio':>8}")
+    for name, res in current["results"].items():
+        base = base_results.get(name)
+        if not base or not base.get("p50_ms"):
+            print(f"{name:<16}{res['p50_ms']:>10.3f}{'-':>10}{'-':>8}")
+            continue
+        ratio = res["p50_ms"] / base["p50_ms"]
+        flag = " REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:<16}{res['p50_ms']:>10.3f}{base['p50_ms']:>10.3f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    for key in ("detector", "classifier", "input_size", "frames"):
+        if baseline.get("meta", {}).get(key) != current["meta"].get(key):
+            print(f"warning: baseline {key}={baseline.get('meta', {}).get(key)} differs from current {current['meta'].get(key)}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Detection pipeline benchmarks")
+    parser.add_argument("--only", type=str, help="Comma separated benchmark names")
+    parser.add_argument("--frames", type=int, default=24, help="Synthetic frame count")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the frame set")
+    parser.add_argument("--input-size", type=int, default=320, help="Detector input size")
+    parser.add_argument("--threads", type=int, default=1, help="OpenCV/torch thread count")
+    parser.add_argument("--tiny", action="store_true", help="Always use generated models")
+    parser.add_argument("--output", type=str, help="Write results JSON to path")
+    parser.add_argument("--baseline", type=str, default=BASELINE_FILE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite baseline with results")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown ratio")
+    args = parser.parse_args(argv)
+    
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    
+    cv2.setNumThreads(args.threads)
+    try:
+        import torch
+        torch.set_num_threads(args.threads)
+    except ImportError:
+        pass
+    
+    ctx = BenchmarkContext(frame_count=args.frames, input_size=args.input_size, force_tiny=args.tiny)
+    current = run(ctx, names, args.repeat)
+    payload = json.dumps(current, indent=2)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(payload)
+        return 0
+    
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import os
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Tuple
+from config.constants import BASE_DIR
+
+FIXTURE_PATH = os.path.join(BASE_DIR, "test.jpg")
+RESOLUTIONS = [(640, 360), (1280, 720), (1920, 1080)]
+SCALES = [0.15, 0.3, 0.5]
+
+
+@dataclass
+class SyntheticFrame:
+    image: np.ndarray
+    boxes: List[Tuple[int, int, int, int]]
+    resolution: Tuple[int, int]
+
+
+def load_fixture() -> np.ndarray:
+    image = cv2.imread(FIXTURE_PATH)
+    if image is None:
+        raise FileNotFoundError(FIXTURE_PATH)
+    return image
+
+
+def _background(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    gx = np.linspace(30, 180, width, dtype=np.float32)
+    gy = np.linspace(60, 140, height, dtype=np.float32)[:, None]
+    base = (gx + gy) / 2
+    noise = rng.normal(0, 8, (height, width)).astype(np.float32)
+    gray = np.clip(base + noise, 0, 255).astype(np.uint8)
+    return cv2.merge([gray, np.roll(gray, 7, axis=1), np.roll(gray, 13, axis=0)])
+
+
+def make_frame(width: int, height: int, fixture: np.ndarray, rng: np.random.Generator, pastes: int = 2) -> SyntheticFrame:
+    frame = _background(width, height, rng)
+    fh, fw = fixture.shape[:2]
+    boxes = []
+    for _ in range(pastes):
+        scale = SCALES[int(rng.integers(len(SCALES)))]
+        pw = max(16, int(width * scale))
+        ph = max(16, int(pw * fh / fw))
+        if ph >= height:
+            ph = height - 1
+        x1 = int(rng.integers(0, width - pw))
+        y1 = int(rng.integers(0, height - ph))
+        frame[y1:y1+ph, x1:x1+pw] = cv2.resize(fixture, (pw, ph))
+        boxes.append((x1, y1, x1 + pw, y1 + ph))
+    return SyntheticFrame(image=frame, boxes=boxes, resolution=(width, height))
+
+
+def make_frames(count: int, resolutions: List[Tuple[int, int]] = None, seed: int = 0) -> List[SyntheticFrame]:
+    rng = np.random.default_rng(seed)
+    fixture = load_fixture()
+    resolutions = resolutions or RESOLUTIONS
+    return [make_frame(*resolutions[i % len(resolutions)], fixture, rng) for i in range(count)]
+
+
+def jitter_boxes(boxes: List[tuple], rng: np.random.Generator, amount: int = 6) -> List[tuple]:
+    out = []
+    for x1, y1, x2, y2 in boxes:
+        dx, dy = (int(v) for v in rng.integers(-amount, amount + 1, 2))
+        out.append((x1 + dx, y1 + dy, x2 + dx, y2 + dy))
+    return out
@@ -0,0 +1,111 @@
+import os
+import numpy as np
+from typing import List
+
+FLOAT = 1
+INT64 = 7
+ATTR_INTS = 7
+
+
+def _varint(value: int) -> bytes:
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field: int, wire: int) -> bytes:
+    return _varint((field << 3) | wire)
+
+
+def _int(field: int, value: int) -> bytes:
+    return _key(field, 0) + _varint(value)
+
+
+def _bytes(field: int, value: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(value)) + value
+
+
+def _str(field: int, value: str) -> bytes:
+    return _bytes(field, value.encode("utf-8"))
+
+
+def _tensor(name: str, array: np.ndarray) -> bytes:
+    dtype = INT64 if array.dtype == np.int64 else FLOAT
+    array = array.astype(np.int64 if dtype == INT64 else np.float32)
+    body = b"".join(_int(1, d) for d in array.shape)
+    body += _int(2, dtype) + _str(8, name) + _bytes(9, array.tobytes())
+    return body
+
+
+def _ints_attr(name: str, values: List[int]) -> bytes:
+    body = _str(1, name) + b"".join(_int(8, v) for v in values) + _int(20, ATTR_INTS)
+    return _bytes(5, body)
+
+
+def _node(op: str, inputs: List[str], outputs: List[str], attrs: bytes = b"") -> bytes:
+    body = b"".join(_str(1, i) for i in inputs) + b"".join(_str(2, o) for o in outputs)
+    body += _str(4, op) + attrs
+    return _bytes(1, body)
+
+
+def _value_info(name: str, dims: List) -> bytes:
+    shape = b""
+    for d in dims:
+        shape += _bytes(1, _int(1, d) if isinstance(d, int) else _str(2, d))
+    tensor_type = _int(1, FLOAT) + _bytes(2, shape)
+    return _str(1, name) + _bytes(2, _bytes(1, tensor_type))
+
+
+def build_tiny_yolo(num_classes: int, stride: int = 8, hidden: int = 8, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    channels = 4 + num_classes
+    w1 = rng.normal(0, 0.5, (hidden, 3, 3, 3))
+    b1 = np.zeros(hidden)
+    w2 = rng.normal(0, 0.5, (channels, hidden, 1, 1))
+    b2 = np.concatenate([np.zeros(4), np.full(num_classes, -3.0)])
+    scale = np.concatenate([[320.0, 320.0, 64.0, 64.0], np.ones(num_classes)]).reshape(1, channels, 1, 1)
+    shape = np.array([1, channels, -1], dtype=np.int64)
+    
+    nodes = _node("Conv", ["images", "w1", "b1"], ["c1"],
+                  _ints_attr("kernel_shape", [3, 3]) + _ints_attr("strides", [stride, stride])
+                  + _ints_attr("pads", [1, 1, 1, 1]))
+    nodes += _node("Relu", ["c1"], ["r1"])
+    nodes += _node("Conv", ["r1", "w2", "b2"], ["c2"], _ints_attr("kernel_shape", [1, 1]))
+    nodes += _node("Sigmoid", ["c2"], ["s2"])
+    nodes += _node("Mul", ["s2", "scale"], ["m2"])
+    nodes += _node("Reshape", ["m2", "shape"], ["output0"])
+    
+    graph = nodes + _str(2, "tiny_yolo")
+    for name, array in (("w1", w1), ("b1", b1), ("w2", w2), ("b2", b2), ("scale", scale), ("shape", shape)):
+        graph += _bytes(5, _tensor(name, array))
+    graph += _bytes(11, _value_info("images", [1, 3, "height", "width"]))
+    graph += _bytes(12, _value_info("output0", [1, channels, "anchors"]))
+    
+    opset = _str(1, "") + _int(2, 12)
+    return _int(1, 7) + _str(2, "benchmarks") + _bytes(7, graph) + _bytes(8, opset)
+
+
+def write_tiny_yolo(path: str, class_names: List[str], seed: int = 0) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(build_tiny_yolo(len(class_names), seed=seed))
+    return path
+
+
+def write_tiny_classifier(path: str, classes: List[str], seed: int = 0) -> str:
+    import torch
+    from core.classifier import SpeedClassifier
+    
+    torch.manual_seed(seed)
+    model = SpeedClassifier()._build_model(len(classes))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    torch.save({"model_state_dict": model.state_dict(), "classes": list(classes)}, path)
+    return path
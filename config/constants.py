@@ -11,5 +11,6 @@ MODEL_EXTENSION = ".pt"
 API_TIMEOUT = 30
 API_RETRY_COUNT = 3
 UPDATE_CHECK_INTERVAL = 3600
+UPDATE_CHECK_DEADLINE = 10
 
 WINDOW_NAME = "Assistant Detection"
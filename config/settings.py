@@ -20,8 +20,26 @@ class DetectionConfig:
     model_name: str = DEFAULT_MODEL
     classifier_model: str = "speed_classifier.pth"
     frames_per_second: int = 5
+    detect_every: int = 1
     input_size: int = 320
+    model_pool_mb: int = 256
+    gatekeeper_model: str = ""
+    gatekeeper_size: int = 160
+    gatekeeper_conf: float = 0.25
+    cascade_every: int = 10
+    cascade_regions: bool = True
+    frame_pool_buffers: int = 8
+    adaptive_resolution: bool = False
+    resolution_ladder: list = field(default_factory=lambda: [224, 256, 320, 416])
     conf_threshold: float = 0.5
+    nms_iou: float = 0.5
+    votes_needed: int = 3
+    decided_ttl: float = 0.0
+    auto_roi: bool = False
+    auto_roi_refresh: int = 15
+    telemetry_sample: int = 0
+    journal: bool = True
+    journal_thumbnails: bool = False
     target_classes: list = field(default_factory=lambda: ["P.127"])
     exclude_classes: list = field(default_factory=list)
 
@@ -1,4 +1,9 @@
-from core.onnx_detector import ONNXDetector, Detection
+from core.onnx_detector import ONNXDetector
+from core.detections import Detection, DetectionBatch
 from core.processor import FrameProcessor
 from core.visualizer import Visualizer
 from core.classifier import SpeedClassifier
+from core.events import SignEvent, SignEventType
+from core.event_stream import SignEventStream
+from core.shared_frames import SharedFrameRing, SharedFramePipeline
+from core.video_segments import ParallelVideoProcessor
@@ -3,10 +3,19 @@ import numpy as np
 import cv2
 import torch
 import torch.nn as nn
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+from core.frame_pool import FramePool
 from utils.logger import log
 
 
+def decide(logits: np.ndarray, classes: List[str]) -> Tuple[str, float]:
+    logits = logits.astype(np.float32)
+    probs = np.exp(logits - logits.max())
+    probs /= probs.sum()
+    idx = int(np.argmax(probs))
+    return classes[idx], float(probs[idx])
+
+
 class SpeedClassifier:
     CLASSES = [
         "P.127-5", "P.127-10", "P.127-15", "P.127-20", "P.127-25",
@@ -20,12 +29,17 @@ class SpeedClassifier:
         self._model: Optional[nn.Module] = None
         self._model_path: Optional[str] = None
         self.input_size = input_size
+        self.pool: Optional[FramePool] = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     
     @property
     def is_loaded(self) -> bool:
         return self._model is not None
     
+    @property
+    def model_path(self) -> Optional[str]:
+        return self._model_path
+    
     def _build_model(self, num_classes: int) -> nn.Module:
         class SpeedNet(nn.Module):
             def __init__(self, num_classes):
@@ -93,23 +107,29 @@ class SpeedClassifier:
         return final
     
     def preprocess(self, image: np.ndarray) -> torch.Tensor:
-        img = cv2.resize(image, (self.input_size, self.input_size))
-        img = self.apply_clahe(img)
+        size = (self.input_size, self.input_size)
+        if self.pool:
+            with self.pool.borrow((self.input_size, self.input_size, 3)) as scratch:
+                img = self.apply_clahe(cv2.resize(image, size, dst=scratch))
+        else:
+            img = self.apply_clahe(cv2.resize(image, size))
         img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         img = img.astype(np.float32) / 255.0
         img = np.transpose(img, (2, 0, 1))
         return torch.from_numpy(img).unsqueeze(0).to(self.device)
     
-    def classify(self, image: np.ndarray) -> Tuple[str, float]:
+    def logits(self, image: np.ndarray) -> Optional[np.ndarray]:
         if not self._model:
-            return "", 0.0
+            return None
         
         with torch.no_grad():
-            tensor = self.preprocess(image)
-            output = self._model(tensor)
-            probs = torch.softmax(output, dim=1)
-            conf, idx = torch.max(probs, dim=1)
-            return self.CLASSES[idx.item()], conf.item()
+            return self._model(self.preprocess(image))[0].float().cpu().numpy()
+    
+    def classify(self, image: np.ndarray) -> Tuple[str, float]:
+        logits = self.logits(image)
+        if logits is None:
+            return "", 0.0
+        return decide(logits, self.CLASSES)
     
     def classify_crop(self, frame: np.ndarray, bbox: tuple) -> Tuple[str, float]:
         x1, y1, x2, y2 = bbox
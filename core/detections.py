@@ -0,0 +1,181 @@
+import numpy as np
+from typing import List, Optional, Iterable, Iterator, Union, Dict
+
+
+class Detection:
+    def __init__(self, bbox: tuple, conf: float, label: str, class_id: int):
+        self.bbox = bbox
+        self.conf = conf
+        self.label = label
+        self.class_id = class_id
+    
+    def to_dict(self) -> Dict:
+        return {
+            "bbox": self.bbox,
+            "conf": self.conf,
+            "label": self.label,
+            "class_id": self.class_id
+        }
+
+
+class DetectionBatch:
+    def __init__(
+        self,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        class_ids: np.ndarray,
+        class_names: Optional[List[str]] = None,
+        labels: Optional[np.ndarray] = None
+    ):
+        self.boxes = np.ascontiguousarray(boxes, dtype=np.int32).reshape(-1, 4)
+        self.scores = np.ascontiguousarray(scores, dtype=np.float32).reshape(-1)
+        self.class_ids = np.ascontiguousarray(class_ids, dtype=np.int32).reshape(-1)
+        self.class_names = class_names or []
+        self._labels = labels
+    
+    @classmethod
+    def empty(cls, class_names: Optional[List[str]] = None) -> "DetectionBatch":
+        return cls(np.empty((0, 4)), np.empty(0), np.empty(0), class_names)
+    
+    @classmethod
+    def from_detections(cls, detections: Iterable[Detection], class_names: Optional[List[str]] = None) -> "DetectionBatch":
+        if isinstance(detections, DetectionBatch):
+            return detections
+        detections = list(detections)
+        if not detections:
+            return cls.empty(class_names)
+        return cls(
+            np.array([d.bbox for d in detections]),
+            np.array([d.conf for d in detections]),
+            np.array([d.class_id for d in detections]),
+            class_names,
+            np.array([d.label for d in detections], dtype=object)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.scores)
+    
+    def __bool__(self) -> bool:
+        return len(self.scores) > 0
+    
+    def __iter__(self) -> Iterator[Detection]:
+        return iter(self.to_detections())
+    
+    def __getitem__(self, index: Union[int, slice, np.ndarray, list]) -> Union[Detection, "DetectionBatch"]:
+        if isinstance(index, (int, np.integer)):
+            return self.detection(int(index))
+        return self._take(index)
+    
+    def _take(self, index) -> "DetectionBatch":
+        labels = self._labels[index] if self._labels is not None else None
+        return DetectionBatch(self.boxes[index], self.scores[index], self.class_ids[index], self.class_names, labels)
+    
+    def label(self, i: int) -> str:
+        if self._labels is not None:
+            return self._labels[i]
+        cid = int(self.class_ids[i])
+        return self.class_names[cid] if cid < len(self.class_names) else str(cid)
+    
+    @property
+    def labels(self) -> List[str]:
+        if self._labels is not None:
+            return list(self._labels)
+        return [self.label(i) for i in range(len(self))]
+    
+    def set_label(self, i: int, label: str, conf: Optional[float] = None):
+        if self._labels is None:
+            self._labels = np.array(self.labels, dtype=object)
+        self._labels[i] = label
+        if conf is not None:
+            self.scores[i] = conf
+    
+    def bbox(self, i: int) -> tuple:
+        x1, y1, x2, y2 = self.boxes[i].tolist()
+        return (x1, y1, x2, y2)
+    
+    def detection(self, i: int) -> Detection:
+        return Detection(self.bbox(i), float(self.scores[i]), self.label(i), int(self.class_ids[i]))
+    
+    def to_detections(self) -> List[Detection]:
+        boxes = self.boxes.tolist()
+        scores = self.scores.tolist()
+        class_ids = self.class_ids.tolist()
+        labels = self.labels
+        return [Detection(tuple(b), s, l, c) for b, s, l, c in zip(boxes, scores, labels, class_ids)]
+    
+    def to_dicts(self) -> List[Dict]:
+        return [d.to_dict() for d in self.to_detections()]
+    
+    def offset(self, dx: int, dy: int) -> "DetectionBatch":
+        if not len(self) or (dx == 0 and dy == 0):
+            return self
+        boxes = self.boxes + np.array([dx, dy, dx, dy], dtype=np.int32)
+        return DetectionBatch(boxes, self.scores, self.class_ids, self.class_names, self._labels)
+    
+    def scale(self, sx: float, sy: float) -> "DetectionBatch":
+        boxes = (self.boxes * np.array([sx, sy, sx, sy], dtype=np.float32)).astype(np.int32)
+        return DetectionBatch(boxes, self.scores, self.class_ids, self.class_names, self._labels)
+    
+    def filter(self, mask: np.ndarray) -> "DetectionBatch":
+        if mask.all():
+            return self
+        return self._take(mask)
+    
+    def label_mask(self, names: Iterable[str]) -> np.ndarray:
+        names = set(names)
+        if self._labels is not None:
+            return np.array([l in names for l in self._labels], dtype=bool)
+        lookup = np.array([n in names for n in self.class_names] + [False], dtype=bool)
+        ids = np.where((self.class_ids >= 0) & (self.class_ids < len(self.class_names)), self.class_ids, len(self.class_names))
+        mask = lookup[ids]
+        unnamed = ids == len(self.class_names)
+        if unnamed.any():
+            mask[unnamed] = [str(c) in names for c in self.class_ids[unnamed].tolist()]
+        return mask
+    
+    def filter_labels(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None) -> "DetectionBatch":
+        mask = np.ones(len(self), dtype=bool)
+        if exclude:
+            mask &= ~self.label_mask(exclude)
+        if include:
+            mask &= self.label_mask(include)
+        return self.filter(mask)
+    
+    def centers(self) -> np.ndarray:
+        return np.stack([(self.boxes[:, 0] + self.boxes[:, 2]) // 2, (self.boxes[:, 1] + self.boxes[:, 3]) // 2], axis=1)
+    
+    def areas(self) -> np.ndarray:
+        wh = np.clip(self.boxes[:, 2:] - self.boxes[:, :2], 0, None)
+        return wh[:, 0] * wh[:, 1]
+    
+    def iou(self, other: Union["DetectionBatch", np.ndarray]) -> np.ndarray:
+        other_boxes = other.boxes if isinstance(other, DetectionBatch) else np.asarray(other, dtype=np.int32).reshape(-1, 4)
+        return box_iou(self.boxes, other_boxes)
+    
+    @staticmethod
+    def concat(batches: List["DetectionBatch"]) -> "DetectionBatch":
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return DetectionBatch.empty()
+        labels = None
+        if any(b._labels is not None for b in batches):
+            labels = np.concatenate([np.array(b.labels, dtype=object) for b in batches])
+        return DetectionBatch(
+            np.concatenate([b.boxes for b in batches]),
+            np.concatenate([b.scores for b in batches]),
+            np.concatenate([b.class_ids for b in batches]),
+            batches[0].class_names,
+            labels
+        )
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(np.clip(a[:, 2:] - a[:, :2], 0, None), axis=1)
+    area_b = np.prod(np.clip(b[:, 2:] - b[:, :2], 0, None), axis=1)
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Optional, Callable, Deque
+from core.events import SignEvent, SignEventType
+from core.processor import FrameProcessor
+from utils.logger import log
+
+
+class SignEventStream:
+    def __init__(self, processor: FrameProcessor, max_pending: int = 256):
+        self.processor = processor
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: Deque[SignEvent] = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._finished = False
+    
+    async def __aenter__(self) -> "SignEventStream":
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.stop()
+    
+    def start(self, video: bool = False, roi_getter: Optional[Callable] = None):
+        if self._thread:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._finished = False
+        self._stop.clear()
+        self.processor.sign_state.add_listener(self._on_event)
+        self._thread = threading.Thread(target=self._run, args=(video, roi_getter), daemon=True)
+        self._thread.start()
+    
+    async def stop(self):
+        self._stop.set()
+        if self._thread:
+            await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+            self._thread = None
+        self.processor.sign_state.remove_listener(self._on_event)
+    
+    def _run(self, video: bool, roi_getter: Optional[Callable]):
+        stream = self.processor.stream_video if video else self.processor.stream_camera
+        try:
+            for _ in stream(roi_getter):
+                if self._stop.is_set():
+                    break
+        except Exception as e:
+            log.error(f"Event stream pipeline failed: {e}")
+        finally:
+            self._finished = True
+            self._notify()
+    
+    def _on_event(self, event: SignEvent):
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self._drop_one()
+            self._pending.append(event)
+        self._notify()
+    
+    def _drop_one(self):
+        for i, queued in enumerate(self._pending):
+            if queued.type == SignEventType.VOTE_PROGRESS:
+                del self._pending[i]
+                break
+        else:
+            self._pending.popleft()
+        self.dropped += 1
+    
+    def _notify(self):
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    def __aiter__(self) -> "SignEventStream":
+        return self
+    
+    async def __anext__(self) -> SignEvent:
+        if self._wakeup is None:
+            raise StopAsyncIteration
+        while True:
+            with self._lock:
+                if self._pending:
+                    return self._pending.popleft()
+                self._wakeup.clear()
+            if self._finished or self._thread is None:
+                raise StopAsyncIteration
+            await self._wakeup.wait()
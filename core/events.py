@@ -0,0 +1,27 @@
+from enum import Enum
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict
+
+
+class SignEventType(str, Enum):
+    CANDIDATE_CREATED = "sign_candidate_created"
+    VOTE_PROGRESS = "vote_progress"
+    DECIDED = "sign_decided"
+    EXPIRED = "sign_expired"
+
+
+@dataclass
+class SignEvent:
+    type: SignEventType
+    tracker_id: int
+    label: str
+    confidence: float
+    timestamp: float
+    votes: int = 0
+    votes_needed: int = 0
+    bbox: Optional[tuple] = None
+    
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["type"] = self.type.value
+        return data
@@ -0,0 +1,137 @@
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+from core.detections import DetectionBatch
+
+
+class FlowTracker:
+    def __init__(
+        self,
+        max_width: int = 640,
+        max_points: int = 16,
+        min_points: int = 4,
+        max_fb_error: float = 1.5,
+        win_size: Tuple[int, int] = (15, 15),
+        max_level: int = 2
+    ):
+        self.max_width = max_width
+        self.max_points = max_points
+        self.min_points = min_points
+        self.max_fb_error = max_fb_error
+        self.lk_params = dict(
+            winSize=win_size,
+            maxLevel=max_level,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        self.track_ids: List[int] = []
+        self._batch: Optional[DetectionBatch] = None
+        self._boxes: Optional[np.ndarray] = None
+        self._prev: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+        self._owners: Optional[np.ndarray] = None
+        self._scale = 1.0
+        self._frame_size = (0, 0)
+    
+    @property
+    def active(self) -> bool:
+        return self._batch is not None
+    
+    def reset(self):
+        self._batch = None
+        self._boxes = None
+        self._prev = None
+        self._points = None
+        self._owners = None
+        self.track_ids = []
+    
+    def _gray(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+        self._frame_size = (w, h)
+        self._scale = min(1.0, self.max_width / w)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if self._scale < 1.0:
+            gray = cv2.resize(gray, (int(w * self._scale), int(h * self._scale)), interpolation=cv2.INTER_AREA)
+        return gray
+    
+    def seed(self, frame: np.ndarray, batch: DetectionBatch, track_ids: List[int]) -> bool:
+        gray = self._gray(frame)
+        gh, gw = gray.shape[:2]
+        points, owners = [], []
+        for i, (x1, y1, x2, y2) in enumerate((batch.boxes * self._scale).astype(np.int32).tolist()):
+            mx, my = (x2 - x1) // 10, (y2 - y1) // 10
+            x1, y1 = max(0, x1 + mx), max(0, y1 + my)
+            x2, y2 = min(gw, x2 - mx), min(gh, y2 - my)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                self.reset()
+                return False
+            corners = cv2.goodFeaturesToTrack(gray[y1:y2, x1:x2], self.max_points, 0.01, 3)
+            if corners is None or len(corners) < self.min_points:
+                self.reset()
+                return False
+            corners = corners.reshape(-1, 2) + (x1, y1)
+            points.append(corners)
+            owners.append(np.full(len(corners), i, dtype=np.int32))
+        
+        self._batch = batch
+        self._boxes = batch.boxes.astype(np.float32) * self._scale
+        self.track_ids = list(track_ids)
+        self._prev = gray
+        self._points = np.concatenate(points).astype(np.float32) if points else np.empty((0, 2), np.float32)
+        self._owners = np.concatenate(owners) if owners else np.empty(0, np.int32)
+        return True
+    
+    def propagate(self, frame: np.ndarray) -> Optional[DetectionBatch]:
+        if self._batch is None:
+            return None
+        gray = self._gray(frame)
+        if gray.shape != self._prev.shape:
+            self.reset()
+            return None
+        if not len(self._batch):
+            self._prev = gray
+            return self._batch
+        
+        p0 = self._points.reshape(-1, 1, 2)
+        p1, st, _ = cv2.calcOpticalFlowPyrLK(self._prev, gray, p0, None, **self.lk_params)
+        back, st_back, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev, p1, None, **self.lk_params)
+        fb_error = np.linalg.norm((back - p0).reshape(-1, 2), axis=1)
+        good = (st.reshape(-1) == 1) & (st_back.reshape(-1) == 1) & (fb_error < self.max_fb_error)
+        
+        old = self._points[good]
+        new = p1.reshape(-1, 2)[good]
+        owners = self._owners[good]
+        counts = np.bincount(owners, minlength=len(self._batch))
+        if (counts < self.min_points).any():
+            self.reset()
+            return None
+        
+        boxes = self._boxes.copy()
+        for i in range(len(boxes)):
+            mask = owners == i
+            src, dst = old[mask], new[mask]
+            c0, c1 = src.mean(axis=0), dst.mean(axis=0)
+            d0 = np.linalg.norm(src - c0, axis=1)
+            d1 = np.linalg.norm(dst - c1, axis=1)
+            valid = d0 > 1e-3
+            scale = float(np.median(d1[valid] / d0[valid])) if valid.any() else 1.0
+            scale = min(max(scale, 0.8), 1.25)
+            bc = (boxes[i, :2] + boxes[i, 2:]) / 2
+            half = (boxes[i, 2:] - boxes[i, :2]) / 2 * scale
+            center = bc + np.median(dst - src, axis=0)
+            boxes[i] = np.concatenate([center - half, center + half])
+        
+        w, h = self._frame_size
+        out = boxes / self._scale
+        out[:, [0, 2]] = np.clip(out[:, [0, 2]], 0, w - 1)
+        out[:, [1, 3]] = np.clip(out[:, [1, 3]], 0, h - 1)
+        if ((out[:, 2] - out[:, 0]) < 2).any() or ((out[:, 3] - out[:, 1]) < 2).any():
+            self.reset()
+            return None
+        
+        self._boxes = boxes
+        self._prev = gray
+        self._points = new.astype(np.float32)
+        self._owners = owners
+        batch = self._batch[:]
+        batch.boxes = np.ascontiguousarray(np.rint(out), dtype=np.int32)
+        return batch
@@ -0,0 +1,144 @@
+import time
+import threading
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BufferKey = Tuple[tuple, str]
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class FrameBuffer:
+    __slots__ = ("array", "key", "refs", "pooled", "_pool")
+    
+    def __init__(self, array: np.ndarray, pool: "FramePool", pooled: bool = True):
+        self.array = array
+        self.key: BufferKey = (array.shape, array.dtype.str)
+        self.refs = 1
+        self.pooled = pooled
+        self._pool = pool
+    
+    def retain(self) -> "FrameBuffer":
+        with self._pool._lock:
+            if self.refs <= 0:
+                raise RuntimeError("retain on a released frame buffer")
+            self.refs += 1
+        return self
+    
+    def release(self):
+        self._pool._release(self)
+
+
+class FramePool:
+    def __init__(self, max_buffers: int = 8):
+        self.max_buffers = max_buffers
+        self.allocated = 0
+        self.allocated_bytes = 0
+        self.reused = 0
+        self.overflow = 0
+        self.peak_in_use = 0
+        self._free: "OrderedDict[BufferKey, List[FrameBuffer]]" = OrderedDict()
+        self._owned = 0
+        self._in_use = 0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def _allocate(self, shape: tuple, dtype) -> np.ndarray:
+        array = np.empty(shape, dtype=dtype)
+        self.allocated += 1
+        self.allocated_bytes += array.nbytes
+        return array
+    
+    def _evict_one(self) -> bool:
+        for key, free in self._free.items():
+            if free:
+                free.pop()
+                self._owned -= 1
+                if not free:
+                    del self._free[key]
+                return True
+        return False
+    
+    def _checkout(self, buf: FrameBuffer) -> FrameBuffer:
+        self._in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self._in_use)
+        return buf
+    
+    def _wrap(self, array: np.ndarray) -> FrameBuffer:
+        while self._owned >= self.max_buffers and self._evict_one():
+            pass
+        pooled = self._owned < self.max_buffers
+        if pooled:
+            self._owned += 1
+        else:
+            self.overflow += 1
+        return self._checkout(FrameBuffer(array, self, pooled))
+    
+    def acquire(self, shape: tuple, dtype=np.uint8) -> FrameBuffer:
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buf = free.pop()
+                buf.refs = 1
+                self.reused += 1
+                self._free.move_to_end(key)
+                return self._checkout(buf)
+            
+            return self._wrap(self._allocate(shape, dtype))
+    
+    def adopt(self, array: np.ndarray) -> FrameBuffer:
+        with self._lock:
+            self.allocated += 1
+            self.allocated_bytes += array.nbytes
+            return self._wrap(array)
+    
+    def _release(self, buf: FrameBuffer):
+        with self._lock:
+            if buf.refs <= 0:
+                raise RuntimeError("frame buffer released twice")
+            buf.refs -= 1
+            if buf.refs:
+                return
+            self._in_use -= 1
+            if buf.pooled:
+                self._free.setdefault(buf.key, []).append(buf)
+    
+    @contextmanager
+    def borrow(self, shape: tuple, dtype=np.uint8):
+        buf = self.acquire(shape, dtype)
+        try:
+            yield buf.array
+        finally:
+            buf.release()
+    
+    def clear(self):
+        with self._lock:
+            for free in self._free.values():
+                self._owned -= len(free)
+            self._free.clear()
+    
+    def stats(self) -> Dict:
+        elapsed = max(1e-9, time.perf_counter() - self._started)
+        with self._lock:
+            return {
+                "buffers": self._owned,
+                "in_use": self._in_use,
+                "peak_in_use": self.peak_in_use,
+                "allocated": self.allocated,
+                "reused": self.reused,
+                "overflow": self.overflow,
+                "alloc_mb_per_s": round(self.allocated_bytes / elapsed / (1 << 20), 3),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
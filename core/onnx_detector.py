@@ -1,30 +1,15 @@
 import cv2
 import numpy as np
-from typing import List, Dict
+from typing import List, Optional
+from core.detections import Detection, DetectionBatch
 from utils.logger import log
 
 
-class Detection:
-    def __init__(self, bbox: tuple, conf: float, label: str, class_id: int):
-        self.bbox = bbox
-        self.conf = conf
-        self.label = label
-        self.class_id = class_id
-    
-    def to_dict(self) -> Dict:
-        return {
-            "bbox": self.bbox,
-            "conf": self.conf,
-            "label": self.label,
-            "class_id": self.class_id
-        }
-
-
 class ONNXDetector:
-    def __init__(self):
+    def __init__(self, class_names: Optional[List[str]] = None):
         self._net = None
         self._model_path = None
-        self._class_names = []
+        self._class_names = class_names or []
     
     @property
     def is_loaded(self) -> bool:
@@ -54,53 +39,53 @@ class ONNXDetector:
         self._model_path = None
     
     def detect(self, image: np.ndarray, conf: float = 0.5, imgsz: int = 320) -> List[Detection]:
-        if not self._net:
-            return []
-        
-        h, w = image.shape[:2]
+        return self.detect_batch(image, conf, imgsz).to_detections()
+    
+    def forward(self, image: np.ndarray, imgsz: int = 320) -> np.ndarray:
         blob = cv2.dnn.blobFromImage(image, 1/255.0, (imgsz, imgsz), swapRB=True, crop=False)
         self._net.setInput(blob)
-        outputs = self._net.forward()
-        
-        detections = []
-        output = outputs[0].T
-        
-        for row in output:
-            scores = row[4:]
-            class_id = np.argmax(scores)
-            confidence = scores[class_id]
-            
-            if confidence < conf:
-                continue
-            
-            cx, cy, bw, bh = row[:4]
-            x1 = int((cx - bw/2) * w / imgsz)
-            y1 = int((cy - bh/2) * h / imgsz)
-            x2 = int((cx + bw/2) * w / imgsz)
-            y2 = int((cy + bh/2) * h / imgsz)
-            
-            label = self._class_names[class_id] if class_id < len(self._class_names) else str(class_id)
-            detections.append(Detection(
-                bbox=(x1, y1, x2, y2),
-                conf=float(confidence),
-                label=label,
-                class_id=int(class_id)
-            ))
+        return self._net.forward()[0].T
+    
+    def detect_batch(self, image: np.ndarray, conf: float = 0.5, imgsz: int = 320, iou: float = 0.5) -> DetectionBatch:
+        if not self._net:
+            return DetectionBatch.empty(self._class_names)
         
-        return self._nms(detections)
+        h, w = image.shape[:2]
+        return self.decode(self.forward(image, imgsz), conf, w / imgsz, h / imgsz, iou)
+    
+    def decode(self, output: np.ndarray, conf: float, sx: float, sy: float, iou: float = 0.5) -> DetectionBatch:
+        return self._nms(self.candidates(output, conf, sx, sy), iou)
     
-    def _nms(self, detections: List[Detection], iou_threshold: float = 0.5) -> List[Detection]:
-        if not detections:
-            return []
+    def candidates(self, output: np.ndarray, conf: float, sx: float, sy: float) -> DetectionBatch:
+        scores = output[:, 4:]
+        class_ids = np.argmax(scores, axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+        keep = confidences >= conf
+        if not keep.any():
+            return DetectionBatch.empty(self._class_names)
         
-        boxes = np.array([d.bbox for d in detections])
-        scores = np.array([d.conf for d in detections])
+        cx, cy, bw, bh = output[keep, :4].T
+        boxes = np.stack([
+            (cx - bw / 2) * sx,
+            (cy - bh / 2) * sy,
+            (cx + bw / 2) * sx,
+            (cy + bh / 2) * sy
+        ], axis=1).astype(np.int32)
+        return DetectionBatch(boxes, confidences[keep], class_ids[keep], self._class_names)
+    
+    def _nms(self, batch: DetectionBatch, iou_threshold: float = 0.5) -> DetectionBatch:
+        if not len(batch):
+            return batch
         
+        xywh = batch.boxes.copy()
+        xywh[:, 2:] -= xywh[:, :2]
         indices = cv2.dnn.NMSBoxes(
-            boxes.tolist(),
-            scores.tolist(),
+            xywh.tolist(),
+            batch.scores.tolist(),
             score_threshold=0.0,
             nms_threshold=iou_threshold
         )
         
-        return [detections[i] for i in indices.flatten()] if len(indices) > 0 else []
+        if len(indices) == 0:
+            return DetectionBatch.empty(self._class_names)
+        return batch[np.asarray(indices).flatten()]
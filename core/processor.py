@@ -3,36 +3,49 @@ import time
 import os
 import numpy as np
 from collections import Counter
-from typing import Optional, Generator, Tuple, List, Dict
-from core.onnx_detector import ONNXDetector, Detection
+from typing import Optional, Generator, Tuple, List, Dict, Callable
+from core.onnx_detector import ONNXDetector
+from core.detections import DetectionBatch
 from core.classifier import SpeedClassifier
+from core.events import SignEvent, SignEventType
+from core.resolution import ResolutionController
+from core.shared_frames import SharedFrameRing
+from core.spatial_prior import SpatialPrior
+from core.flow_tracker import FlowTracker
+from core.frame_pool import FrameBuffer, FramePool
+from core.sign_journal import SignJournal
 from config.settings import Settings
 from config.constants import MODELS_DIR
+from utils.telemetry import Telemetry
+from utils.profiler import PipelineProfiler
 
 
 class SignTracker:
     MAX_HISTORY = 30
     
-    def __init__(self, sign_id: int, votes_needed: int = 5):
+    def __init__(self, sign_id: int, votes_needed: int = 5, timestamp: Optional[float] = None):
         self.sign_id = sign_id
         self.votes_needed = votes_needed
         self.votes: List[str] = []
+        self.confidences: List[float] = []
         self.final_result: Optional[str] = None
-        self.last_seen = time.time()
+        self.last_seen = timestamp if timestamp is not None else time.time()
         self.center: tuple = (0, 0)
+        self.bbox: Optional[tuple] = None
         self.history: List[tuple] = []
     
-    def update_position(self, center: tuple):
+    def update_position(self, center: tuple, timestamp: Optional[float] = None):
         self.center = center
         self.history.append(center)
         if len(self.history) > self.MAX_HISTORY:
             self.history.pop(0)
-        self.last_seen = time.time()
+        self.last_seen = timestamp if timestamp is not None else time.time()
     
-    def add_vote(self, label: str, instant_complete: bool = False):
+    def add_vote(self, label: str, instant_complete: bool = False, conf: float = 0.0):
         if self.final_result:
             return
         self.votes.append(label)
+        self.confidences.append(conf)
         if instant_complete or len(self.votes) >= self.votes_needed:
             self.final_result = Counter(self.votes).most_common(1)[0][0]
     
@@ -40,6 +53,12 @@ class SignTracker:
     def is_complete(self) -> bool:
         return self.final_result is not None
     
+    @property
+    def confidence(self) -> float:
+        label = self.final_result or (self.votes[-1] if self.votes else None)
+        confs = [c for v, c in zip(self.votes, self.confidences) if v == label]
+        return sum(confs) / len(confs) if confs else 0.0
+    
     @property
     def progress(self) -> str:
         return f"{len(self.votes)}/{self.votes_needed}"
@@ -48,36 +67,94 @@ class SignTracker:
 class MultiSignState:
     MAX_DISPLAY = 5
     
-    def __init__(self, votes_needed: int = 5, timeout: float = 2.0):
+    def __init__(self, votes_needed: int = 5, timeout: float = 2.0, decided_ttl: float = 0.0):
         self.votes_needed = votes_needed
         self.timeout = timeout
+        self.decided_ttl = decided_ttl
         self.trackers: Dict[int, SignTracker] = {}
         self._next_id = 0
+        self._listeners: List[Callable[[SignEvent], None]] = []
+    
+    def add_listener(self, callback: Callable[[SignEvent], None]):
+        self._listeners.append(callback)
     
-    def _get_tracker_id(self, bbox: tuple) -> int:
+    def remove_listener(self, callback: Callable[[SignEvent], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _emit(self, event_type: SignEventType, tracker: SignTracker, label: str, conf: float, timestamp: float):
+        if not self._listeners:
+            return
+        event = SignEvent(
+            type=event_type,
+            tracker_id=tracker.sign_id,
+            label=label,
+            confidence=conf,
+            timestamp=timestamp,
+            votes=len(tracker.votes),
+            votes_needed=tracker.votes_needed,
+            bbox=tracker.bbox
+        )
+        for callback in self._listeners:
+            callback(event)
+    
+    def _get_tracker_id(self, bbox: tuple, timestamp: Optional[float] = None) -> int:
         cx, cy = (bbox[0] + bbox[2]) // 2, (bbox[1] + bbox[3]) // 2
         for tid, t in self.trackers.items():
             dx, dy = abs(cx - t.center[0]), abs(cy - t.center[1])
             if dx < 100 and dy < 100:
-                t.update_position((cx, cy))
+                t.update_position((cx, cy), timestamp)
+                t.bbox = bbox
                 return tid
         
         new_id = self._next_id
         self._next_id += 1
-        tracker = SignTracker(new_id, self.votes_needed)
-        tracker.update_position((cx, cy))
+        tracker = SignTracker(new_id, self.votes_needed, timestamp)
+        tracker.update_position((cx, cy), timestamp)
+        tracker.bbox = bbox
         self.trackers[new_id] = tracker
         return new_id
     
-    def add_vote(self, bbox: tuple, label: str, instant_complete: bool = False):
-        tid = self._get_tracker_id(bbox)
-        self.trackers[tid].add_vote(label, instant_complete)
+    def add_vote(
+        self,
+        bbox: tuple,
+        label: str,
+        instant_complete: bool = False,
+        conf: float = 0.0,
+        timestamp: Optional[float] = None
+    ) -> int:
+        timestamp = timestamp if timestamp is not None else time.time()
+        next_id = self._next_id
+        tid = self._get_tracker_id(bbox, timestamp)
+        tracker = self.trackers[tid]
+        if tid == next_id:
+            self._emit(SignEventType.CANDIDATE_CREATED, tracker, label, conf, timestamp)
+        if tracker.is_complete:
+            return tid
+        tracker.add_vote(label, instant_complete, conf)
+        if tracker.is_complete:
+            self._emit(SignEventType.DECIDED, tracker, tracker.final_result, tracker.confidence, timestamp)
+        else:
+            self._emit(SignEventType.VOTE_PROGRESS, tracker, label, conf, timestamp)
+        return tid
+    
+    def move(self, tid: int, bbox: tuple, timestamp: float):
+        tracker = self.trackers.get(tid)
+        if tracker is None:
+            return
+        tracker.update_position(((bbox[0] + bbox[2]) // 2, (bbox[1] + bbox[3]) // 2), timestamp)
+        tracker.bbox = bbox
     
-    def cleanup(self):
-        now = time.time()
+    def cleanup(self, now: Optional[float] = None):
+        now = now if now is not None else time.time()
         expired = [tid for tid, t in self.trackers.items() if now - t.last_seen > self.timeout and not t.is_complete]
         for tid in expired:
-            del self.trackers[tid]
+            tracker = self.trackers.pop(tid)
+            label = tracker.votes[-1] if tracker.votes else ""
+            self._emit(SignEventType.EXPIRED, tracker, label, tracker.confidence, now)
+        if self.decided_ttl > 0:
+            for tid in [tid for tid, t in self.trackers.items() if t.is_complete and now - t.last_seen > self.decided_ttl]:
+                del self.trackers[tid]
     
     @property
     def results(self) -> List[str]:
@@ -97,76 +174,340 @@ class MultiSignState:
         self.trackers.clear()
 
 
+Vote = Tuple[int, tuple, str, float, bool]
+
+
+def apply_votes(sign_state: MultiSignState, votes: List[Vote], count: int, ts: float) -> List[int]:
+    track_ids = [-1] * count
+    for i, bbox, label, conf, instant in votes:
+        track_ids[i] = sign_state.add_vote(bbox, label, instant_complete=instant, conf=conf, timestamp=ts)
+    sign_state.cleanup(ts)
+    return track_ids
+
+
+def cascade_summary(stats: Dict, full_times: List[float], audited: bool = False) -> Dict:
+    frames = stats["frames"]
+    full_ms = sum(full_times) / len(full_times) if full_times else 0.0
+    baseline = frames * full_ms
+    cost = (frames - stats["skipped"]) * full_ms + stats["gate_ms"]
+    positives = stats["positive"] + stats["missed"]
+    return {
+        **stats,
+        "gate_ms": round(stats["gate_ms"] / stats["gated"], 2) if stats["gated"] else 0.0,
+        "full_ms": round(full_ms, 2),
+        "skip_rate": round(stats["skipped"] / frames, 4) if frames else 0.0,
+        "savings": round(1 - cost / baseline, 4) if baseline else 0.0,
+        "miss_rate": round(stats["missed"] / positives, 4) if audited and positives else None,
+    }
+
+
 class FrameProcessor:
     CLASSIFY_TRIGGER = "P.127"
     
-    def __init__(self, detector: Detector, settings: Settings):
+    def __init__(self, detector: ONNXDetector, settings: Settings):
         self.detector = detector
         self.settings = settings
         self.classifier: Optional[SpeedClassifier] = None
-        self.sign_state = MultiSignState(votes_needed=3)
+        self.sign_state = MultiSignState(
+            votes_needed=settings.detection.votes_needed,
+            decided_ttl=settings.detection.decided_ttl
+        )
         self._cap: Optional[cv2.VideoCapture] = None
-        self._stats = {"total": [], "yolo": []}
+        self.frames = FramePool(settings.detection.frame_pool_buffers)
+        self.current_frame: Optional[FrameBuffer] = None
+        self._capture_shape: Optional[tuple] = None
+        self._ring: Optional[SharedFrameRing] = None
+        self._slot_queue = None
+        self._stats = {"total": [], "yolo": [], "flow": []}
+        self.frame_timestamp = 0.0
+        self.clock: Optional[Callable[[], float]] = None
+        self.resolution: Optional[ResolutionController] = None
+        if settings.detection.adaptive_resolution:
+            self.resolution = ResolutionController(
+                settings.detection.resolution_ladder,
+                initial=settings.detection.input_size
+            )
+        self.prior: Optional[SpatialPrior] = None
+        self.active_roi: Optional[tuple] = None
+        self._prior_key: Optional[str] = None
+        self._frame_index = 0
+        self._frame_shape: tuple = (0, 0)
+        self._roi_burst = 0
+        if settings.detection.auto_roi:
+            self.prior = SpatialPrior()
+            self.sign_state.add_listener(self._update_prior)
+        self.gatekeeper: Optional[ONNXDetector] = None
+        self.cascade_audit = False
+        self.cascade_stats = {"frames": 0, "gated": 0, "skipped": 0, "fired": 0, "safety": 0, "positive": 0, "missed": 0, "gate_ms": 0.0}
+        self._since_full = 0
+        self.flow: Optional[FlowTracker] = None
+        self._track_ids: List[int] = []
+        self.local_votes = True
+        self.votes: List[Vote] = []
+        self._since_detect = 0
+        if settings.detection.detect_every > 1:
+            self.flow = FlowTracker()
+        self.telemetry: Optional[Telemetry] = None
+        if settings.detection.telemetry_sample > 0:
+            self.telemetry = Telemetry(settings.detection.telemetry_sample).start()
+        self.profiler: Optional[PipelineProfiler] = None
+        self.journal: Optional[SignJournal] = None
+        self._frame: Optional[np.ndarray] = None
         self._init_classifier()
     
+    def attach_journal(self, journal: SignJournal):
+        self.journal = journal
+        self.sign_state.add_listener(self._journal_event)
+    
+    def _mark(self, stage: str):
+        if self.profiler and self.profiler.active:
+            self.profiler.mark(stage)
+    
+    def _journal_event(self, event: SignEvent):
+        if event.type != SignEventType.DECIDED:
+            return
+        crop = None
+        if self.settings.detection.journal_thumbnails and self._frame is not None and event.bbox:
+            x1, y1, x2, y2 = event.bbox
+            crop = self._frame[max(0, y1):y2, max(0, x1):x2].copy()
+        self.journal.record(event, crop)
+    
+    def _update_prior(self, event: SignEvent):
+        if event.type == SignEventType.DECIDED and event.bbox:
+            self.prior.add(event.bbox, self._frame_shape)
+    
+    def _auto_roi(self, frame_shape: tuple) -> Optional[tuple]:
+        if not self.prior:
+            return None
+        if self._roi_burst > 0:
+            self._roi_burst -= 1
+            return None
+        refresh = self.settings.detection.auto_roi_refresh
+        if refresh > 0 and self._frame_index % refresh == 0:
+            return None
+        return self.prior.region(frame_shape)
+    
+    def _check_roi_escape(self, detections: DetectionBatch, frame_shape: tuple):
+        region = self.prior.region(frame_shape)
+        if region is None or not len(detections):
+            return
+        x1, y1, x2, y2 = region
+        boxes = detections.boxes
+        outside = (boxes[:, 0] < x1) | (boxes[:, 1] < y1) | (boxes[:, 2] > x2) | (boxes[:, 3] > y2)
+        if outside.any():
+            self._roi_burst = self.settings.detection.votes_needed + 1
+    
     def _init_classifier(self):
         classifier_path = os.path.join(MODELS_DIR, self.settings.detection.classifier_model)
         if os.path.exists(classifier_path):
             self.classifier = SpeedClassifier()
+            self.classifier.pool = self.frames
             self.classifier.load(classifier_path)
     
+    def set_detector(self, detector: ONNXDetector):
+        self.detector = detector
+    
     @property
     def fps(self) -> int:
         return self.settings.detection.frames_per_second
     
     @property
     def time_budget(self) -> float:
-        return 1000 / self.fps
+        return 1000 / self.process_rate
+    
+    @property
+    def process_rate(self) -> int:
+        return self.fps * max(1, self.settings.detection.detect_every)
+    
+    @property
+    def input_size(self) -> int:
+        if self.resolution:
+            return self.resolution.input_size
+        return self.settings.detection.input_size
     
     def open_camera(self, camera_id: int = 0) -> bool:
         self._cap = cv2.VideoCapture(camera_id)
+        if self.prior:
+            self._prior_key = f"camera_{camera_id}"
+            self.prior.load(self._prior_key)
         return self._cap.isOpened()
     
-    def open_video(self, path: str) -> bool:
+    def open_video(self, path: str, video_clock: bool = False) -> bool:
         self._cap = cv2.VideoCapture(path)
+        if video_clock:
+            self.clock = self._video_time
         return self._cap.isOpened()
     
+    def _video_time(self) -> float:
+        fps = self._cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return max(0.0, self._cap.get(cv2.CAP_PROP_POS_FRAMES) - 1) / fps
+    
+    def open_shared(self, ring: SharedFrameRing, slot_queue) -> bool:
+        self._ring = ring
+        self._slot_queue = slot_queue
+        return True
+    
     def close(self):
+        if self.prior and self._prior_key:
+            self.prior.save(self._prior_key)
+        if self.telemetry:
+            self.telemetry.stop()
+        if self.journal:
+            self.journal.stop()
+            self.sign_state.remove_listener(self._journal_event)
+            self.journal = None
         if self._cap:
             self._cap.release()
             self._cap = None
+        self._release_frame()
+        self.frames.clear()
+        if self._ring:
+            self._ring.close()
+            self._ring = None
+            self._slot_queue = None
+    
+    def _release_frame(self):
+        if self.current_frame:
+            self.current_frame.release()
+            self.current_frame = None
+    
+    def _retrieve(self) -> Optional[np.ndarray]:
+        self._release_frame()
+        buf = self.frames.acquire(self._capture_shape) if self._capture_shape else None
+        ret, frame = self._cap.retrieve(image=buf.array) if buf else self._cap.retrieve()
+        if not ret:
+            if buf:
+                buf.release()
+            return None
+        if buf is None or frame is not buf.array:
+            if buf:
+                buf.release()
+            buf = self.frames.adopt(frame)
+            self._capture_shape = frame.shape
+        self.current_frame = buf
+        return frame
     
     def _get_skip_frames(self) -> int:
         if not self._cap:
             return 1
         video_fps = self._cap.get(cv2.CAP_PROP_FPS)
-        return max(1, int(video_fps / self.fps))
+        return max(1, int(video_fps / self.process_rate))
     
-    def _process_detections(self, frame: np.ndarray, detections: List[Detection]) -> List[Detection]:
-        exclude_classes = self.settings.detection.exclude_classes
-        detections = [d for d in detections if d.label not in exclude_classes]
-        
-        active_classes = self.settings.detection.target_classes
-        filtered = [d for d in detections if d.label in active_classes] if active_classes else detections
+    def _process_detections(self, frame: np.ndarray, detections: DetectionBatch) -> DetectionBatch:
+        ts = self.frame_timestamp
+        filtered = detections.filter_labels(
+            include=self.settings.detection.target_classes,
+            exclude=self.settings.detection.exclude_classes
+        )
         
-        for det in filtered:
-            if det.label == self.CLASSIFY_TRIGGER and self.classifier and self.classifier.is_loaded:
-                sub_label, sub_conf = self.classifier.classify_crop(frame, det.bbox)
+        classify = self.classifier is not None and self.classifier.is_loaded
+        votes: List[Vote] = []
+        for i in range(len(filtered)):
+            label = filtered.label(i)
+            bbox = filtered.bbox(i)
+            if label == self.CLASSIFY_TRIGGER and classify:
+                sub_label, sub_conf = self.classifier.classify_crop(frame, bbox)
                 if sub_label and sub_conf > 0.3:
-                    det.label = sub_label
-                    det.conf = sub_conf
-                    if sub_conf > 0.9:
-                        self.sign_state.add_vote(det.bbox, sub_label, instant_complete=True)
-                    else:
-                        self.sign_state.add_vote(det.bbox, sub_label)
+                    filtered.set_label(i, sub_label, sub_conf)
+                    votes.append((i, bbox, sub_label, sub_conf, sub_conf > 0.9))
             else:
-                self.sign_state.add_vote(det.bbox, det.label)
+                votes.append((i, bbox, label, float(filtered.scores[i]), False))
         
-        self.sign_state.cleanup()
+        self.votes = votes
+        if self.local_votes:
+            self._frame = frame
+            self._track_ids = apply_votes(self.sign_state, votes, len(filtered), ts)
+            self._frame = None
+        else:
+            self._track_ids = [-1] * len(filtered)
         return filtered
     
-    def process_frame(self, frame: np.ndarray, roi: Optional[tuple] = None) -> Tuple[List[Detection], float]:
+    def _gate(self, image: np.ndarray) -> Tuple[bool, Optional[tuple]]:
+        det = self.settings.detection
+        stats = self.cascade_stats
+        stats["frames"] += 1
+        if self._since_full >= det.cascade_every - 1:
+            stats["safety"] += 1
+            self._since_full = 0
+            return True, None
+        
         t0 = time.perf_counter()
+        gate = self.gatekeeper.detect_batch(image, conf=det.gatekeeper_conf, imgsz=det.gatekeeper_size)
+        stats["gate_ms"] += (time.perf_counter() - t0) * 1000
+        stats["gated"] += 1
+        if not len(gate):
+            self._since_full += 1
+            stats["skipped"] += 1
+            return False, None
+        self._since_full = 0
+        stats["fired"] += 1
+        return True, self._gate_region(gate.boxes, image.shape) if det.cascade_regions else None
+    
+    def _gate_region(self, boxes: np.ndarray, shape: tuple) -> Optional[tuple]:
+        h, w = shape[:2]
+        x1, y1 = np.maximum(boxes[:, :2].min(axis=0), 0).tolist()
+        x2, y2 = np.minimum(boxes[:, 2:].max(axis=0), (w, h)).tolist()
+        if x2 <= x1 or y2 <= y1:
+            return None
+        pad = max(x2 - x1, y2 - y1) // 2 + 16
+        half = self.input_size // 2
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        hw = max((x2 - x1) // 2 + pad, half)
+        hh = max((y2 - y1) // 2 + pad, half)
+        gx1, gy1 = max(0, cx - hw), max(0, cy - hh)
+        gx2, gy2 = min(w, cx + hw), min(h, cy + hh)
+        if (gx2 - gx1) * (gy2 - gy1) > 0.6 * w * h:
+            return None
+        return gx1, gy1, gx2, gy2
+    
+    def _audit_skip(self, image: np.ndarray):
+        det = self.settings.detection
+        full = self.detector.detect_batch(image, conf=det.conf_threshold, imgsz=self.input_size, iou=det.nms_iou)
+        if len(full):
+            self.cascade_stats["missed"] += 1
+    
+    @property
+    def detect_times(self) -> List[float]:
+        return self._stats["yolo"]
+    
+    def cascade_summary(self) -> Dict:
+        return cascade_summary(self.cascade_stats, self.detect_times, self.cascade_audit)
+    
+    def _track_frame(self, frame: np.ndarray, t0: float) -> Optional[Tuple[DetectionBatch, float]]:
+        if not self.flow.active or self._since_detect >= self.settings.detection.detect_every - 1:
+            return None
+        tracked = self.flow.propagate(frame)
+        if tracked is None:
+            return None
+        
+        ts = self.frame_timestamp
+        for tid, bbox in zip(self.flow.track_ids, tracked.boxes.tolist()):
+            if tid >= 0:
+                self.sign_state.move(tid, tuple(bbox), ts)
+        self.sign_state.cleanup(ts)
+        self._since_detect += 1
+        time_ms = (time.perf_counter() - t0) * 1000
+        self._stats["flow"].append(time_ms)
+        return tracked, time_ms
+    
+    def process_frame(self, frame: np.ndarray, roi: Optional[tuple] = None) -> Tuple[DetectionBatch, float]:
+        t0 = time.perf_counter()
+        self.frame_timestamp = self.clock() if self.clock else time.time()
+        self._frame_index += 1
+        self._frame_shape = frame.shape
+        
+        if self.flow:
+            self._mark("flow")
+            tracked = self._track_frame(frame, t0)
+            if tracked:
+                if self.telemetry and self.telemetry.sample():
+                    self._record(tracked[1], 0.0, len(tracked[0]), len(tracked[0]), roi, "flow")
+                return tracked
+        
+        auto = roi is None and self.prior is not None
+        if auto:
+            roi = self._auto_roi(frame.shape)
+        self.active_roi = roi
         
         if roi:
             rx1, ry1, rx2, ry2 = roi
@@ -175,64 +516,158 @@ class FrameProcessor:
             cropped = frame
             rx1, ry1 = 0, 0
         
-        detections = self.detector.detect(
-            cropped,
-            conf=self.settings.detection.conf_threshold,
-            imgsz=self.settings.detection.input_size
-        )
+        fired, region = True, None
+        if self.gatekeeper:
+            self._mark("gate")
+            fired, region = self._gate(cropped)
         
-        if roi:
-            for det in detections:
-                ox1, oy1, ox2, oy2 = det.bbox
-                det.bbox = (ox1 + rx1, oy1 + ry1, ox2 + rx1, oy2 + ry1)
+        if fired:
+            self._mark("detect")
+            image, dx, dy = cropped, rx1, ry1
+            if region:
+                gx1, gy1, gx2, gy2 = region
+                image, dx, dy = cropped[gy1:gy2, gx1:gx2], rx1 + gx1, ry1 + gy1
+            d0 = time.perf_counter()
+            detections = self.detector.detect_batch(
+                image,
+                conf=self.settings.detection.conf_threshold,
+                imgsz=self.input_size,
+                iou=self.settings.detection.nms_iou
+            ).offset(dx, dy)
+            t1 = time.perf_counter()
+            self._stats["yolo"].append((t1 - d0) * 1000)
+            if self.gatekeeper and len(detections):
+                self.cascade_stats["positive"] += 1
+        else:
+            detections = DetectionBatch.empty(self.detector.class_names)
+            t1 = time.perf_counter()
+        raw_count = len(detections)
+        if auto and roi is None:
+            self._check_roi_escape(detections, frame.shape)
         
+        self._mark("postprocess")
         detections = self._process_detections(frame, detections)
         time_ms = (time.perf_counter() - t0) * 1000
         self._stats["total"].append(time_ms)
+        if self.flow:
+            self.flow.seed(frame, detections, self._track_ids)
+            self._since_detect = 0
+        if self.telemetry and self.telemetry.sample():
+            self._record(time_ms, (t1 - t0) * 1000, raw_count, len(detections), roi, "detect" if fired else "gate")
+        if self.resolution and fired:
+            self.resolution.update(time_ms, self.time_budget)
+        if not fired and self.cascade_audit:
+            self._audit_skip(cropped)
         return detections, time_ms
+    
+    def _record(self, time_ms: float, detect_ms: float, raw_count: int, kept: int, roi: Optional[tuple], mode: str):
+        self.telemetry.record({
+            "ts": round(self.frame_timestamp, 3),
+            "frame": self._frame_index,
+            "mode": mode,
+            "total_ms": round(time_ms, 2),
+            "detect_ms": round(detect_ms, 2),
+            "raw": raw_count,
+            "kept": kept,
+            "trackers": len(self.sign_state.trackers),
+            "input": self.input_size,
+            "roi": roi is not None,
+        })
 
     
-    def stream_camera(self, roi_getter=None) -> Generator[Tuple[np.ndarray, List[Detection], float], None, None]:
+    def stream_camera(self, roi_getter=None) -> Generator[Tuple[np.ndarray, DetectionBatch, float], None, None]:
         if not self._cap:
             return
         
         last_time = time.perf_counter()
-        interval = 1.0 / self.fps
+        interval = 1.0 / self.process_rate
         
         while self._cap.isOpened():
-            ret, frame = self._cap.read()
-            if not ret:
+            self._mark("capture")
+            if not self._cap.grab():
                 break
             
             now = time.perf_counter()
             if now - last_time < interval:
                 continue
             last_time = now
+            frame = self._retrieve()
+            if frame is None:
+                break
             
             roi = roi_getter(frame.shape) if roi_getter else None
             detections, time_ms = self.process_frame(frame, roi)
             yield frame, detections, time_ms
     
-    def stream_video(self, roi_getter=None) -> Generator[Tuple[np.ndarray, List[Detection], float], None, None]:
+    def stream_video(
+        self,
+        roi_getter=None,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ) -> Generator[Tuple[np.ndarray, DetectionBatch, float], None, None]:
         if not self._cap:
             return
         
         skip = self._get_skip_frames()
-        frame_idx = 0
+        frame_idx = start_frame
+        if start_frame:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
         
         while self._cap.isOpened():
-            ret, frame = self._cap.read()
-            if not ret:
+            if end_frame is not None and frame_idx >= end_frame:
+                break
+            self._mark("capture")
+            if not self._cap.grab():
                 break
             
             frame_idx += 1
             if frame_idx % skip != 0:
                 continue
+            frame = self._retrieve()
+            if frame is None:
+                break
             
             roi = roi_getter(frame.shape) if roi_getter else None
             detections, time_ms = self.process_frame(frame, roi)
             yield frame, detections, time_ms
     
+    def stream_shared(self, roi_getter=None, results=None) -> Generator[Tuple[np.ndarray, DetectionBatch, float], None, None]:
+        if not self._ring:
+            return
+        
+        while True:
+            msg = self._slot_queue.get()
+            if msg is None:
+                break
+            slot, seq, ts = msg
+            frame = self._ring.read(slot, seq)
+            if frame is None:
+                continue
+            
+            roi = roi_getter(frame.shape) if roi_getter else None
+            detections, time_ms = self.process_frame(frame, roi)
+            if not self._ring.is_valid(slot, seq):
+                continue
+            if results is not None:
+                results.put((slot, seq, ts, detections.to_dicts(), self.votes, time_ms))
+            yield frame, detections, time_ms
+    
+    def replay(self, cache) -> Generator[Tuple[DetectionBatch, float], None, None]:
+        det = self.settings.detection
+        classifier, self.classifier = self.classifier, cache
+        try:
+            for index in range(len(cache)):
+                t0 = time.perf_counter()
+                self.frame_timestamp, dx, dy, forward_ms = cache.seek(index)
+                self._frame_index += 1
+                detections = cache.detect_batch(None, conf=det.conf_threshold, imgsz=self.input_size, iou=det.nms_iou)
+                detections = self._process_detections(None, detections.offset(dx, dy))
+                time_ms = forward_ms + (time.perf_counter() - t0) * 1000
+                self._stats["total"].append(time_ms)
+                yield detections, time_ms
+        finally:
+            self.classifier = classifier
+    
     def get_avg_time(self) -> float:
         if not self._stats["total"]:
             return 0
@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import hashlib
+import numpy as np
+from typing import Dict, Optional, Tuple
+from config.constants import CACHE_DIR
+from core.classifier import decide
+from core.detections import DetectionBatch
+from core.onnx_detector import ONNXDetector
+from utils.file_handler import FileHandler
+
+REPLAY_DIR = os.path.join(CACHE_DIR, "replay")
+SCORE_FLOOR = 0.05
+HASH_SAMPLE = 4 << 20
+FRAME_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("sx", "<f4"),
+    ("sy", "<f4"),
+    ("dx", "<i4"),
+    ("dy", "<i4"),
+    ("forward_ms", "<f4"),
+    ("rows", "<i4"),
+    ("logits", "<i4"),
+])
+
+
+def video_hash(path: str, sample: int = HASH_SAMPLE) -> str:
+    size = os.path.getsize(path)
+    hasher = hashlib.md5(str(size).encode())
+    with open(path, "rb") as f:
+        for offset in sorted({0, max(0, size // 2 - sample // 2), max(0, size - sample)}):
+            f.seek(offset)
+            hasher.update(f.read(sample))
+    return hasher.hexdigest()
+
+
+def _memmap(path: str, dtype, count: int, width: Optional[int] = None) -> np.ndarray:
+    shape = (count, width) if width is not None else (count,)
+    if count == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class CacheRecorder:
+    def __init__(self, cache: "ReplayCache", processor, floor: float = SCORE_FLOOR):
+        self.cache = cache
+        self.processor = processor
+        self.detector = processor.detector
+        classifier = processor.classifier
+        self.classifier = classifier if classifier is not None and classifier.is_loaded else None
+        self.floor = floor
+        self.frames = 0
+        self.rows = 0
+        self.logit_count = 0
+        self._width = 0
+        self._offset = (0, 0)
+        self._logits: Dict[tuple, np.ndarray] = {}
+        
+        FileHandler.ensure_dir(cache.path)
+        FileHandler.safe_delete(cache.meta_path)
+        self._files = {name: open(cache.file(name), "wb") for name in ("frames", "rows", "boxes", "logits")}
+        processor.flow = None
+        processor.gatekeeper = None
+        processor.resolution = None
+        processor.prior = None
+        processor.detector = self
+        processor.classifier = self
+    
+    @property
+    def class_names(self):
+        return self.detector.class_names
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.classifier is not None
+    
+    def detect_batch(self, image: np.ndarray, conf: float = 0.5, imgsz: int = 320, iou: float = 0.5) -> DetectionBatch:
+        t0 = time.perf_counter()
+        output = self.detector.forward(image, imgsz)
+        forward_ms = (time.perf_counter() - t0) * 1000
+        rows = np.ascontiguousarray(output[output[:, 4:].max(axis=1) >= self.floor], dtype=np.float32)
+        self._width = output.shape[1]
+        
+        h, w = image.shape[:2]
+        sx, sy = w / imgsz, h / imgsz
+        self._logits = {}
+        if self.classifier:
+            candidates = self.detector.candidates(rows, self.floor, sx, sy)
+            for i in range(len(candidates)):
+                bbox = candidates.bbox(i)
+                if candidates.label(i) != self.processor.CLASSIFY_TRIGGER or bbox in self._logits:
+                    continue
+                x1, y1, x2, y2 = bbox
+                crop = image[y1:y2, x1:x2]
+                if crop.size:
+                    self._logits[bbox] = self.classifier.logits(crop)
+        
+        roi = self.processor.active_roi
+        self._offset = (roi[0], roi[1]) if roi else (0, 0)
+        record = np.array([(
+            self.processor.frame_timestamp, sx, sy, self._offset[0], self._offset[1], forward_ms, len(rows), len(self._logits)
+        )], dtype=FRAME_DTYPE)
+        self._files["frames"].write(record.tobytes())
+        self._files["rows"].write(rows.tobytes())
+        if self._logits:
+            self._files["boxes"].write(np.array(list(self._logits), dtype=np.int32).tobytes())
+            self._files["logits"].write(np.stack(list(self._logits.values())).tobytes())
+        self.frames += 1
+        self.rows += len(rows)
+        self.logit_count += len(self._logits)
+        return self.detector.decode(rows, conf, sx, sy, iou)
+    
+    def classify_crop(self, frame: np.ndarray, bbox: tuple) -> Tuple[str, float]:
+        dx, dy = self._offset
+        logits = self._logits.get((bbox[0] - dx, bbox[1] - dy, bbox[2] - dx, bbox[3] - dy))
+        if logits is None:
+            return "", 0.0
+        return decide(logits, self.classifier.CLASSES)
+    
+    def _detach(self):
+        for f in self._files.values():
+            f.close()
+        self.processor.detector = self.detector
+        self.processor.classifier = self.classifier
+    
+    def finish(self, **extra) -> Dict:
+        self._detach()
+        meta = {
+            **extra,
+            "frames": self.frames,
+            "rows": self.rows,
+            "width": self._width,
+            "logits": self.logit_count,
+            "logit_width": len(self.classifier.CLASSES) if self.classifier else 0,
+            "floor": self.floor,
+            "class_names": list(self.detector.class_names),
+            "classifier_classes": list(self.classifier.CLASSES) if self.classifier else [],
+        }
+        FileHandler.atomic_write(self.cache.meta_path, json.dumps(meta, indent=1).encode("utf-8"))
+        return meta
+    
+    def abort(self):
+        self._detach()
+
+
+class CacheReplay:
+    def __init__(self, cache: "ReplayCache", meta: Dict):
+        self.meta = meta
+        self.floor = meta["floor"]
+        self.classes = meta["classifier_classes"]
+        self.frames = _memmap(cache.file("frames"), FRAME_DTYPE, meta["frames"])
+        self.rows = _memmap(cache.file("rows"), np.float32, meta["rows"], meta["width"])
+        self.boxes = _memmap(cache.file("boxes"), np.int32, meta["logits"], 4)
+        self.logits = _memmap(cache.file("logits"), np.float32, meta["logits"], meta["logit_width"])
+        self._row_offsets = np.concatenate([[0], np.cumsum(self.frames["rows"], dtype=np.int64)])
+        self._logit_offsets = np.concatenate([[0], np.cumsum(self.frames["logits"], dtype=np.int64)])
+        self._decoder = ONNXDetector(meta["class_names"])
+        self._index = 0
+        self._frame_logits: Optional[Dict[tuple, int]] = None
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+    
+    @property
+    def class_names(self):
+        return self._decoder.class_names
+    
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self.classes)
+    
+    def seek(self, index: int) -> Tuple[float, int, int, float]:
+        self._index = index
+        self._frame_logits = None
+        frame = self.frames[index]
+        return float(frame["ts"]), int(frame["dx"]), int(frame["dy"]), float(frame["forward_ms"])
+    
+    def detect_batch(self, image: Optional[np.ndarray] = None, conf: float = 0.5, imgsz: int = 320, iou: float = 0.5) -> DetectionBatch:
+        if conf < self.floor:
+            raise ValueError(f"conf {conf} is below the cached score floor {self.floor}")
+        frame = self.frames[self._index]
+        rows = self.rows[self._row_offsets[self._index]:self._row_offsets[self._index + 1]]
+        return self._decoder.decode(np.asarray(rows), conf, float(frame["sx"]), float(frame["sy"]), iou)
+    
+    def classify_crop(self, frame: Optional[np.ndarray], bbox: tuple) -> Tuple[str, float]:
+        if self._frame_logits is None:
+            start, end = self._logit_offsets[self._index], self._logit_offsets[self._index + 1]
+            self._frame_logits = {tuple(b): start + i for i, b in enumerate(self.boxes[start:end].tolist())}
+        record = self.frames[self._index]
+        dx, dy = int(record["dx"]), int(record["dy"])
+        row = self._frame_logits.get((bbox[0] - dx, bbox[1] - dy, bbox[2] - dx, bbox[3] - dy))
+        if row is None:
+            return "", 0.0
+        return decide(self.logits[row], self.classes)
+
+
+class ReplayCache:
+    def __init__(self, path: str):
+        self.path = path
+    
+    @classmethod
+    def for_video(
+        cls,
+        video_path: str,
+        model_md5: str,
+        input_size: int,
+        process_rate: int,
+        classifier_md5: str = "",
+        root: str = REPLAY_DIR
+    ) -> "ReplayCache":
+        key = f"{video_hash(video_path)[:16]}-{(model_md5 or 'nomd5')[:12]}-{(classifier_md5 or 'nocls')[:12]}-{input_size}-{process_rate}"
+        return cls(os.path.join(root, key))
+    
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+    
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+    
+    @property
+    def meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @property
+    def complete(self) -> bool:
+        return self.meta is not None
+    
+    def record(self, processor, floor: float = SCORE_FLOOR) -> CacheRecorder:
+        return CacheRecorder(self, processor, floor)
+    
+    def open(self) -> Optional[CacheReplay]:
+        meta = self.meta
+        return CacheReplay(self, meta) if meta else None
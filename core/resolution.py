@@ -0,0 +1,61 @@
+from collections import deque
+from typing import List, Deque
+from utils.logger import log
+
+
+class ResolutionController:
+    DEFAULT_LADDER = [224, 256, 320, 416]
+    
+    def __init__(
+        self,
+        ladder: List[int] = None,
+        initial: int = 320,
+        window: int = 15,
+        high_water: float = 0.95,
+        low_water: float = 0.8,
+        cooldown: int = 30
+    ):
+        self.ladder = sorted(set(ladder or self.DEFAULT_LADDER))
+        self.window = window
+        self.high_water = high_water
+        self.low_water = low_water
+        self.cooldown = cooldown
+        self._index = min(range(len(self.ladder)), key=lambda i: abs(self.ladder[i] - initial))
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._frames_since_change = cooldown
+    
+    @property
+    def input_size(self) -> int:
+        return self.ladder[self._index]
+    
+    def _projected(self, index: int, latency: float) -> float:
+        ratio = self.ladder[index] / self.input_size
+        return latency * ratio * ratio
+    
+    def update(self, time_ms: float, budget_ms: float) -> int:
+        self._samples.append(time_ms)
+        self._frames_since_change += 1
+        if len(self._samples) < self.window or self._frames_since_change < self.cooldown:
+            return self.input_size
+        
+        ordered = sorted(self._samples)
+        p75 = ordered[int(len(ordered) * 0.75)]
+        median = ordered[len(ordered) // 2]
+        
+        if p75 > budget_ms * self.high_water and self._index > 0:
+            self._change(self._index - 1, p75, budget_ms)
+        elif self._index < len(self.ladder) - 1 and self._projected(self._index + 1, p75) < budget_ms * self.low_water:
+            self._change(self._index + 1, median, budget_ms)
+        return self.input_size
+    
+    def _change(self, index: int, latency: float, budget_ms: float):
+        old = self.input_size
+        self._index = index
+        self._samples.clear()
+        self._frames_since_change = 0
+        log.info(f"Input size {old} -> {self.input_size} (latency {latency:.0f}ms, budget {budget_ms:.0f}ms)")
+    
+    def reset(self, initial: int):
+        self._index = min(range(len(self.ladder)), key=lambda i: abs(self.ladder[i] - initial))
+        self._samples.clear()
+        self._frames_since_change = self.cooldown
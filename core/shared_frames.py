@@ -0,0 +1,267 @@
+import time
+import copy
+import heapq
+import queue
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Optional, Tuple, Union
+from utils.logger import log
+
+WRITING = -1
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def put_latest(q, item):
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+class SharedFrameRing:
+    def __init__(self, shape: Tuple[int, int, int], slots: int = 4, name: Optional[str] = None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.frame_bytes = int(np.prod(self.shape))
+        self._owner = name is None
+        if self._owner:
+            self._frames = shared_memory.SharedMemory(create=True, size=self.frame_bytes * slots)
+            self._header = shared_memory.SharedMemory(create=True, size=8 * slots * 2)
+        else:
+            frames_name, header_name = name.split(":")
+            self._frames = _attach(frames_name)
+            self._header = _attach(header_name)
+        self._seq = np.ndarray((slots,), dtype=np.int64, buffer=self._header.buf)
+        self._timestamps = np.ndarray((slots,), dtype=np.float64, buffer=self._header.buf, offset=8 * slots)
+        self._views = [
+            np.ndarray(self.shape, dtype=np.uint8, buffer=self._frames.buf, offset=i * self.frame_bytes)
+            for i in range(slots)
+        ]
+        self._next_seq = 0
+        if self._owner:
+            self._seq[:] = WRITING
+    
+    @property
+    def name(self) -> str:
+        return f"{self._frames.name}:{self._header.name}"
+    
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, int, int], int]:
+        return self.name, self.shape, self.slots
+    
+    @classmethod
+    def attach(cls, spec: Tuple[str, Tuple[int, int, int], int]) -> "SharedFrameRing":
+        name, shape, slots = spec
+        return cls(shape, slots, name)
+    
+    def view(self, slot: int) -> np.ndarray:
+        return self._views[slot]
+    
+    def begin_write(self) -> Tuple[int, np.ndarray]:
+        slot = self._next_seq % self.slots
+        self._seq[slot] = WRITING
+        return slot, self._views[slot]
+    
+    def commit(self, slot: int, timestamp: Optional[float] = None) -> Tuple[int, int, float]:
+        seq = self._next_seq
+        self._next_seq += 1
+        ts = timestamp if timestamp is not None else time.time()
+        self._timestamps[slot] = ts
+        self._seq[slot] = seq
+        return slot, seq, ts
+    
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Tuple[int, int, float]:
+        slot, view = self.begin_write()
+        if frame.shape == self.shape:
+            np.copyto(view, frame)
+        else:
+            import cv2
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=view)
+        return self.commit(slot, timestamp)
+    
+    def is_valid(self, slot: int, seq: int) -> bool:
+        return int(self._seq[slot]) == seq
+    
+    def read(self, slot: int, seq: int) -> Optional[np.ndarray]:
+        return self._views[slot] if self.is_valid(slot, seq) else None
+    
+    def close(self):
+        self._views = []
+        self._seq = None
+        self._timestamps = None
+        self._frames.close()
+        self._header.close()
+        if self._owner:
+            self._frames.unlink()
+            self._header.unlink()
+
+
+def capture_process(
+    source: Union[int, str],
+    spec: Tuple[str, Tuple[int, int, int], int],
+    slot_queue: mp.Queue,
+    stop_event,
+    max_fps: float = 0,
+    readers: int = 1
+):
+    import cv2
+    
+    ring = SharedFrameRing.attach(spec)
+    cap = cv2.VideoCapture(source)
+    interval = 1.0 / max_fps if max_fps > 0 else 0.0
+    last = 0.0
+    native = ring.shape[:2] == (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
+    live = isinstance(source, int)
+    try:
+        while cap.isOpened() and not stop_event.is_set():
+            now = time.perf_counter()
+            if interval and now - last < interval:
+                if not cap.grab():
+                    break
+                continue
+            last = now
+            slot, view = ring.begin_write()
+            if native:
+                ret, _ = cap.read(view)
+            else:
+                ret, frame = cap.read()
+                if ret:
+                    cv2.resize(frame, (ring.shape[1], ring.shape[0]), dst=view)
+            if not ret:
+                break
+            if live:
+                put_latest(slot_queue, ring.commit(slot))
+            else:
+                slot_queue.put(ring.commit(slot))
+    finally:
+        cap.release()
+        for _ in range(readers):
+            try:
+                slot_queue.put(None, timeout=1)
+            except queue.Full:
+                break
+        ring.close()
+
+
+def inference_process(
+    spec: Tuple[str, Tuple[int, int, int], int],
+    slot_queue: mp.Queue,
+    result_queue: mp.Queue,
+    settings,
+    model_path: str,
+    class_names: list
+):
+    from core.onnx_detector import ONNXDetector
+    from core.processor import FrameProcessor
+    
+    settings = copy.deepcopy(settings)
+    settings.detection.detect_every = 1
+    settings.detection.auto_roi = False
+    settings.detection.telemetry_sample = 0
+    detector = ONNXDetector()
+    if not detector.load(model_path, class_names):
+        result_queue.put(None)
+        return
+    processor = FrameProcessor(detector, settings)
+    processor.local_votes = False
+    processor.open_shared(SharedFrameRing.attach(spec), slot_queue)
+    try:
+        for _ in processor.stream_shared(results=result_queue):
+            pass
+    finally:
+        processor.close()
+        result_queue.put(None)
+
+
+class SharedFramePipeline:
+    def __init__(self, source: Union[int, str], shape: Tuple[int, int, int], workers: int = 1, slots: int = 0):
+        self.source = source
+        self.workers = workers
+        self.ring = SharedFrameRing(shape, slots or 2 * workers + 2)
+        self._ctx = mp.get_context("spawn")
+        self.slot_queue = self._ctx.Queue(maxsize=max(2, workers))
+        self.result_queue = self._ctx.Queue(maxsize=32)
+        self._stop = self._ctx.Event()
+        self._processes = []
+        self.sign_state = None
+    
+    def start(self, settings, model_path: str, class_names: list, max_fps: float = 0):
+        from core.processor import MultiSignState
+        
+        self.sign_state = MultiSignState(
+            votes_needed=settings.detection.votes_needed,
+            decided_ttl=settings.detection.decided_ttl
+        )
+        capture = self._ctx.Process(
+            target=capture_process,
+            args=(self.source, self.ring.spec, self.slot_queue, self._stop, max_fps, self.workers),
+            daemon=True
+        )
+        self._processes.append(capture)
+        for _ in range(self.workers):
+            self._processes.append(self._ctx.Process(
+                target=inference_process,
+                args=(self.ring.spec, self.slot_queue, self.result_queue, settings, model_path, class_names),
+                daemon=True
+            ))
+        for p in self._processes:
+            p.start()
+        log.info(f"Shared frame pipeline started: {self.workers} worker(s), {self.ring.slots} slots")
+    
+    def _vote(self, item: tuple) -> tuple:
+        from core.processor import apply_votes
+        
+        slot, seq, ts, detections, votes, time_ms = item
+        apply_votes(self.sign_state, votes, len(detections), ts)
+        return slot, seq, ts, detections, time_ms
+    
+    def results(self, timeout: float = 5.0):
+        finished = 0
+        pending = []
+        next_seq, newest = 0, -1
+        while finished < self.workers:
+            try:
+                item = self.result_queue.get(timeout=timeout)
+            except queue.Empty:
+                if not any(p.is_alive() for p in self._processes):
+                    break
+                continue
+            if item is None:
+                finished += 1
+                continue
+            if item[1] < next_seq:
+                continue
+            heapq.heappush(pending, (item[1], item))
+            newest = max(newest, item[1])
+            while pending and (pending[0][0] == next_seq or pending[0][0] <= newest - self.ring.slots):
+                seq, ready = heapq.heappop(pending)
+                next_seq = seq + 1
+                yield self._vote(ready)
+        while pending:
+            yield self._vote(heapq.heappop(pending)[1])
+    
+    def frame(self, slot: int, seq: int) -> Optional[np.ndarray]:
+        return self.ring.read(slot, seq)
+    
+    def stop(self):
+        self._stop.set()
+        for p in self._processes:
+            p.join(timeout=2)
+            if p.is_alive():
+                p.terminate()
+        self._processes = []
+        self.ring.close()
@@ -0,0 +1,208 @@
+import os
+import time
+import queue
+import sqlite3
+import threading
+import cv2
+import numpy as np
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional, List, Tuple
+from config.constants import LOGS_DIR
+from core.events import SignEvent
+from utils.file_handler import FileHandler
+from utils.logger import log
+
+JOURNAL_FILE = os.path.join(LOGS_DIR, "signs.db")
+THUMB_SIZE = 96
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signs (
+    id INTEGER PRIMARY KEY,
+    trip TEXT NOT NULL,
+    ts REAL NOT NULL,
+    recorded REAL NOT NULL,
+    label TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    votes INTEGER NOT NULL,
+    votes_needed INTEGER NOT NULL,
+    x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER,
+    thumbnail BLOB
+);
+CREATE INDEX IF NOT EXISTS signs_ts ON signs(ts);
+CREATE INDEX IF NOT EXISTS signs_label_ts ON signs(label, ts);
+CREATE INDEX IF NOT EXISTS signs_trip_ts ON signs(trip, ts);
+"""
+COLUMNS = "id, trip, ts, recorded, label, confidence, votes, votes_needed, x1, y1, x2, y2"
+
+
+@dataclass
+class JournalEntry:
+    id: int
+    trip: str
+    ts: float
+    recorded: float
+    label: str
+    confidence: float
+    votes: int
+    votes_needed: int
+    bbox: Optional[tuple] = None
+    thumbnail: Optional[bytes] = None
+    
+    @classmethod
+    def from_row(cls, row: tuple) -> "JournalEntry":
+        bbox = tuple(row[8:12]) if row[8] is not None else None
+        thumbnail = row[12] if len(row) > 12 else None
+        return cls(*row[:8], bbox=bbox, thumbnail=thumbnail)
+
+
+class SignJournal:
+    def __init__(
+        self,
+        path: str = JOURNAL_FILE,
+        trip: Optional[str] = None,
+        max_pending: int = 1024,
+        flush_every: int = 64
+    ):
+        self.path = path
+        self.trip = trip or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.flush_every = flush_every
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Tuple[SignEvent, Optional[np.ndarray], float]]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        FileHandler.ensure_dir(os.path.dirname(path))
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def start(self) -> "SignJournal":
+        if not self._thread:
+            self._thread = threading.Thread(target=self._write_loop, daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    def record(self, event: SignEvent, crop: Optional[np.ndarray] = None):
+        try:
+            self._queue.put_nowait((event, crop, time.time()))
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+    
+    @staticmethod
+    def _thumbnail(crop: Optional[np.ndarray]) -> Optional[bytes]:
+        if crop is None or crop.size == 0:
+            return None
+        h, w = crop.shape[:2]
+        scale = min(1.0, THUMB_SIZE / max(h, w))
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        ok, data = cv2.imencode(".jpg", crop, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        return data.tobytes() if ok else None
+    
+    def _row(self, item: Tuple[SignEvent, Optional[np.ndarray], float]) -> tuple:
+        event, crop, recorded = item
+        x1, y1, x2, y2 = (int(v) for v in event.bbox) if event.bbox else (None, None, None, None)
+        return (
+            self.trip, event.timestamp, recorded, event.label, float(event.confidence),
+            event.votes, event.votes_needed, x1, y1, x2, y2, self._thumbnail(crop)
+        )
+    
+    def _write_loop(self):
+        try:
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            log.error(f"Sign journal unavailable: {e}")
+            return
+        
+        running = True
+        while running:
+            batch = []
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    running = False
+                    break
+                batch.append(self._row(item))
+                if len(batch) >= self.flush_every:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO signs (trip, ts, recorded, label, confidence, votes, votes_needed, "
+                            "x1, y1, x2, y2, thumbnail) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            batch
+                        )
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    log.error(f"Sign journal write failed: {e}")
+        conn.close()
+    
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        label: Optional[str] = None,
+        trip: Optional[str] = None,
+        limit: int = 100,
+        thumbnails: bool = False
+    ) -> List[JournalEntry]:
+        if not os.path.exists(self.path):
+            return []
+        where, params = [], []
+        if label:
+            if label.endswith("*"):
+                where.append("label >= ? AND label < ?")
+                prefix = label[:-1]
+                params += [prefix, prefix + "\uffff"]
+            else:
+                where.append("label = ?")
+                params.append(label)
+        if trip:
+            where.append("trip = ?")
+            params.append(trip)
+        if start is not None:
+            where.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("ts < ?")
+            params.append(end)
+        columns = f"{COLUMNS}, thumbnail" if thumbnails else COLUMNS
+        sql = f"SELECT {columns} FROM signs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        params.append(limit)
+        
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=5)
+        try:
+            return [JournalEntry.from_row(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+    
+    def trips(self) -> List[Tuple[str, int, float, float]]:
+        if not os.path.exists(self.path):
+            return []
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=5)
+        try:
+            return conn.execute(
+                "SELECT trip, COUNT(*), MIN(ts), MAX(ts) FROM signs GROUP BY trip ORDER BY MIN(recorded) DESC"
+            ).fetchall()
+        finally:
+            conn.close()
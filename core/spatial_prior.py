@@ -0,0 +1,108 @@
+import os
+import numpy as np
+from typing import Optional, Tuple
+from config.constants import CACHE_DIR
+from utils.logger import log
+
+PRIORS_DIR = os.path.join(CACHE_DIR, "priors")
+
+
+class SpatialPrior:
+    def __init__(
+        self,
+        grid: Tuple[int, int] = (18, 32),
+        decay: float = 0.98,
+        min_mass: float = 12.0,
+        coverage: float = 0.96,
+        padding: float = 0.08
+    ):
+        self.grid = grid
+        self.decay = decay
+        self.min_mass = min_mass
+        self.coverage = coverage
+        self.padding = padding
+        self._heat = np.zeros(grid, dtype=np.float64)
+        self._scale = 1.0
+    
+    @property
+    def heatmap(self) -> np.ndarray:
+        return self._heat * self._scale
+    
+    @property
+    def mass(self) -> float:
+        return float(self._heat.sum() * self._scale)
+    
+    @property
+    def is_confident(self) -> bool:
+        return self.mass >= self.min_mass
+    
+    def add(self, bbox: tuple, frame_shape: tuple, weight: float = 1.0):
+        self._scale *= self.decay
+        if self._scale < 1e-6:
+            self._heat *= self._scale
+            self._scale = 1.0
+        fh, fw = frame_shape[:2]
+        rows, cols = self.grid
+        x1, y1, x2, y2 = bbox
+        c1 = int(np.clip(x1 / fw * cols, 0, cols - 1))
+        c2 = int(np.clip((x2 - 1) / fw * cols, c1, cols - 1))
+        r1 = int(np.clip(y1 / fh * rows, 0, rows - 1))
+        r2 = int(np.clip((y2 - 1) / fh * rows, r1, rows - 1))
+        cells = (r2 - r1 + 1) * (c2 - c1 + 1)
+        self._heat[r1:r2+1, c1:c2+1] += weight / cells / self._scale
+    
+    def _bounds(self, marginal: np.ndarray) -> Tuple[int, int]:
+        cdf = np.cumsum(marginal) / marginal.sum()
+        tail = (1 - self.coverage) / 2
+        lo = int(np.searchsorted(cdf, tail, side="right"))
+        hi = int(np.searchsorted(cdf, 1 - tail, side="left"))
+        return lo, max(lo, hi) + 1
+    
+    def region(self, frame_shape: tuple) -> Optional[tuple]:
+        if not self.is_confident:
+            return None
+        fh, fw = frame_shape[:2]
+        rows, cols = self.grid
+        r1, r2 = self._bounds(self._heat.sum(axis=1))
+        c1, c2 = self._bounds(self._heat.sum(axis=0))
+        pad_x, pad_y = int(fw * self.padding), int(fh * self.padding)
+        x1 = max(0, int(c1 * fw / cols) - pad_x)
+        y1 = max(0, int(r1 * fh / rows) - pad_y)
+        x2 = min(fw, int(c2 * fw / cols) + pad_x)
+        y2 = min(fh, int(r2 * fh / rows) + pad_y)
+        if (x2 - x1) * (y2 - y1) >= 0.9 * fw * fh:
+            return None
+        return (x1, y1, x2, y2)
+    
+    def reset(self):
+        self._heat[:] = 0
+        self._scale = 1.0
+    
+    @staticmethod
+    def path_for(key: str) -> str:
+        return os.path.join(PRIORS_DIR, f"{key}.npy")
+    
+    def save(self, key: str) -> bool:
+        try:
+            os.makedirs(PRIORS_DIR, exist_ok=True)
+            np.save(self.path_for(key), self.heatmap)
+            return True
+        except Exception as e:
+            log.warning(f"Failed to save spatial prior: {e}")
+            return False
+    
+    def load(self, key: str) -> bool:
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return False
+        try:
+            heat = np.load(path)
+        except Exception as e:
+            log.warning(f"Failed to load spatial prior: {e}")
+            return False
+        if heat.shape != self.grid:
+            return False
+        self._heat = heat.astype(np.float64)
+        self._scale = 1.0
+        log.info(f"Spatial prior loaded: {key} (mass {self.mass:.1f})")
+        return True
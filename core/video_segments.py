@@ -0,0 +1,191 @@
+import os
+import copy
+import time
+import multiprocessing as mp
+import cv2
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from utils.logger import log
+
+PARALLEL_DECIDED_TTL = 10.0
+
+
+@dataclass
+class VideoSegment:
+    index: int
+    start: int
+    end: int
+    warmup: int
+    tail: int
+    
+    def owns(self, frame: int) -> bool:
+        return self.start <= frame < self.end
+
+
+def plan_segments(frame_count: int, fps: float, segments: int, overlap_s: float = 4.0, min_length_s: float = 20.0) -> List[VideoSegment]:
+    overlap = int(round(overlap_s * fps))
+    min_length = max(1, int(min_length_s * fps))
+    count = max(1, min(segments, frame_count // min_length))
+    bounds = [frame_count * i // count for i in range(count + 1)]
+    return [
+        VideoSegment(
+            index=i,
+            start=bounds[i],
+            end=bounds[i + 1],
+            warmup=max(0, bounds[i] - overlap),
+            tail=min(frame_count, bounds[i + 1] + overlap)
+        )
+        for i in range(count)
+    ]
+
+
+def process_segment(job: tuple) -> Dict:
+    segment, video_path, fps, settings, model_path, class_names = job
+    from core.onnx_detector import ONNXDetector
+    from core.processor import FrameProcessor
+    from core.events import SignEventType
+    
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    
+    detector = ONNXDetector()
+    if not detector.load(model_path, class_names):
+        raise RuntimeError(f"Cannot load model in worker: {model_path}")
+    processor = FrameProcessor(detector, settings)
+    events: List[Dict] = []
+    
+    def on_event(event):
+        if event.type == SignEventType.DECIDED:
+            events.append(event.to_dict())
+    
+    processor.sign_state.add_listener(on_event)
+    if not processor.open_video(video_path, video_clock=True):
+        raise RuntimeError(f"Cannot open video in worker: {video_path}")
+    frames = 0
+    t0 = time.perf_counter()
+    try:
+        for _ in processor.stream_video(start_frame=segment.warmup, end_frame=segment.tail):
+            frames += 1
+    finally:
+        processor.close()
+    detector.unload()
+    
+    kept = []
+    for event in events:
+        frame = int(round(event["timestamp"] * fps))
+        if frame < segment.start:
+            continue
+        event["segment"] = segment.index
+        event["owned"] = segment.owns(frame)
+        kept.append(event)
+    return {
+        "segment": segment.index,
+        "frames": frames,
+        "elapsed": time.perf_counter() - t0,
+        "events": kept,
+    }
+
+
+def _same_sign(a: Dict, b: Dict, window: float) -> bool:
+    if a["label"] != b["label"] or abs(a["timestamp"] - b["timestamp"]) > window:
+        return False
+    if not a["bbox"] or not b["bbox"]:
+        return True
+    ax, ay = (a["bbox"][0] + a["bbox"][2]) / 2, (a["bbox"][1] + a["bbox"][3]) / 2
+    bx, by = (b["bbox"][0] + b["bbox"][2]) / 2, (b["bbox"][1] + b["bbox"][3]) / 2
+    return abs(ax - bx) < 100 and abs(ay - by) < 100
+
+
+def merge_events(results: List[Dict], window: float) -> List[Dict]:
+    candidates = sorted(
+        (event for result in results for event in result["events"]),
+        key=lambda e: (e["timestamp"], not e["owned"], e["segment"])
+    )
+    merged: List[Dict] = []
+    for event in candidates:
+        duplicate = next((i for i, kept in enumerate(merged) if kept["segment"] != event["segment"] and _same_sign(kept, event, window)), None)
+        if duplicate is None:
+            merged.append(event)
+        elif event["owned"] and not merged[duplicate]["owned"]:
+            merged[duplicate] = event
+    merged.sort(key=lambda e: e["timestamp"])
+    for event in merged:
+        event.pop("owned")
+    return merged
+
+
+class ParallelVideoProcessor:
+    def __init__(
+        self,
+        video_path: str,
+        settings,
+        model_path: str,
+        class_names: list,
+        workers: int = 0,
+        overlap_s: float = 4.0
+    ):
+        self.video_path = video_path
+        self.settings = copy.deepcopy(settings)
+        self.settings.detection.telemetry_sample = 0
+        self.settings.detection.adaptive_resolution = False
+        self.model_path = model_path
+        self.class_names = list(class_names)
+        self.workers = workers or os.cpu_count() or 1
+        self.overlap_s = overlap_s
+        det = self.settings.detection
+        if det.detect_every > 1:
+            det.detect_every = 1
+            log.info("detect_every set to 1 for segmented processing: the detect/flow phase would restart in every segment")
+        if det.auto_roi:
+            det.auto_roi = False
+            log.info("auto_roi disabled for segmented processing: the learned prior depends on history before each segment")
+        if det.gatekeeper_model:
+            det.gatekeeper_model = ""
+            log.info("Gatekeeper cascade disabled for segmented processing: segments run the full detector on every frame")
+        ttl = det.decided_ttl
+        if ttl <= 0:
+            ttl = det.decided_ttl = PARALLEL_DECIDED_TTL
+            log.info(f"decided_ttl set to {ttl:.0f}s for segmented processing")
+        if overlap_s < ttl + 2.0:
+            self.overlap_s = ttl + 2.0
+            log.info(f"Segment overlap raised to {self.overlap_s:.1f}s to cover decided_ttl")
+        self._ctx = mp.get_context("spawn")
+    
+    def _probe(self) -> Optional[tuple]:
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            if not cap.isOpened():
+                return None
+            return int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS) or 30.0
+        finally:
+            cap.release()
+    
+    def run(self, on_segment: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        probe = self._probe()
+        if not probe:
+            log.error(f"Cannot open video: {self.video_path}")
+            return None
+        frame_count, fps = probe
+        segments = plan_segments(frame_count, fps, self.workers, self.overlap_s)
+        log.info(f"Processing {self.video_path} in {len(segments)} segment(s) on {min(self.workers, len(segments))} worker(s)")
+        
+        t0 = time.perf_counter()
+        jobs = [(s, self.video_path, fps, self.settings, self.model_path, self.class_names) for s in segments]
+        results = []
+        with self._ctx.Pool(min(self.workers, len(segments))) as pool:
+            for result in pool.imap_unordered(process_segment, jobs):
+                results.append(result)
+                if on_segment:
+                    on_segment(result)
+        results.sort(key=lambda r: r["segment"])
+        window = self.overlap_s + self.settings.detection.votes_needed / max(1, self.settings.detection.frames_per_second)
+        return {
+            "events": merge_events(results, window),
+            "segments": [{k: v for k, v in r.items() if k != "events"} for r in results],
+            "frames": sum(r["frames"] for r in results),
+            "elapsed": time.perf_counter() - t0,
+        }
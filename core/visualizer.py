@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from typing import List, Optional
+from typing import Optional
 
 
 class Visualizer:
@@ -15,38 +15,44 @@ class Visualizer:
     
     def draw_detections(self, frame: np.ndarray, detections: list) -> np.ndarray:
         result = frame.copy()
-        
-        for det in detections:
-            x1, y1, x2, y2 = det.bbox
-            label = f"{det.label} {det.conf:.2f}"
-            cv2.rectangle(result, (x1, y1), (x2, y2), self.BOX_COLOR, 2)
-            cv2.putText(result, label, (x1, y1 - 5), self.FONT, 0.5, self.BOX_COLOR, 2)
-        
+        self.draw_detections_into(result, detections)
         return result
     
     def draw_status(self, frame: np.ndarray, time_ms: float, det_count: int) -> np.ndarray:
         result = frame.copy()
-        status = f"T:{time_ms:.0f}ms Det:{det_count}"
-        color = self.TEXT_COLOR if time_ms <= self.time_budget else self.WARNING_COLOR
-        cv2.putText(result, status, (10, 30), self.FONT, 0.7, color, 2)
+        self.draw_status_into(result, time_ms, det_count)
         return result
     
     def draw_sign_result(
-        self, 
-        frame: np.ndarray, 
-        final_result: Optional[str], 
+        self,
+        frame: np.ndarray,
+        final_result: Optional[str],
         progress: str
     ) -> np.ndarray:
         result = frame.copy()
-        h, w = result.shape[:2]
+        self.draw_sign_result_into(result, final_result, progress)
+        return result
+    
+    def draw_detections_into(self, out: np.ndarray, detections: list):
+        for det in detections:
+            x1, y1, x2, y2 = det.bbox
+            label = f"{det.label} {det.conf:.2f}"
+            cv2.rectangle(out, (x1, y1), (x2, y2), self.BOX_COLOR, 2)
+            cv2.putText(out, label, (x1, y1 - 5), self.FONT, 0.5, self.BOX_COLOR, 2)
+    
+    def draw_status_into(self, out: np.ndarray, time_ms: float, det_count: int):
+        status = f"T:{time_ms:.0f}ms Det:{det_count}"
+        color = self.TEXT_COLOR if time_ms <= self.time_budget else self.WARNING_COLOR
+        cv2.putText(out, status, (10, 30), self.FONT, 0.7, color, 2)
+    
+    def draw_sign_result_into(self, out: np.ndarray, final_result: Optional[str], progress: str):
+        h, w = out.shape[:2]
         
         if final_result:
-            cv2.rectangle(result, (w - 200, 10), (w - 10, 60), (0, 0, 0), -1)
-            cv2.putText(result, final_result, (w - 190, 45), self.FONT, 1.0, self.RESULT_COLOR, 2)
+            cv2.rectangle(out, (w - 200, 10), (w - 10, 60), (0, 0, 0), -1)
+            cv2.putText(out, final_result, (w - 190, 45), self.FONT, 1.0, self.RESULT_COLOR, 2)
         else:
-            cv2.putText(result, f"Vote: {progress}", (w - 120, 30), self.FONT, 0.6, self.TEXT_COLOR, 2)
-        
-        return result
+            cv2.putText(out, f"Vote: {progress}", (w - 120, 30), self.FONT, 0.6, self.TEXT_COLOR, 2)
     
     def render(
         self,
@@ -56,7 +62,44 @@ class Visualizer:
         sign_result: Optional[str] = None,
         sign_progress: str = "0/5"
     ) -> np.ndarray:
-        result = self.draw_detections(frame, detections)
-        result = self.draw_status(result, time_ms, len(detections))
-        result = self.draw_sign_result(result, sign_result, sign_progress)
-        return result
+        return self.render_into(frame, detections, time_ms, sign_result, sign_progress)
+    
+    def render_into(
+        self,
+        frame: np.ndarray,
+        detections: list,
+        time_ms: float,
+        sign_result: Optional[str] = None,
+        sign_progress: str = "0/5",
+        out: Optional[np.ndarray] = None,
+        in_place: bool = False
+    ) -> np.ndarray:
+        if in_place:
+            out = frame
+        elif out is None:
+            out = frame.copy()
+        elif out is not frame:
+            np.copyto(out, frame)
+        
+        self.draw_detections_into(out, detections)
+        self.draw_status_into(out, time_ms, len(detections))
+        self.draw_sign_result_into(out, sign_result, sign_progress)
+        return out
+
+
+def blend_rect(
+    out: np.ndarray,
+    rect: tuple,
+    color: tuple,
+    alpha: float
+):
+    x1, y1, x2, y2 = rect
+    h, w = out.shape[:2]
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(w, x2), min(h, y2)
+    if x2 <= x1 or y2 <= y1:
+        return
+    region = out[y1:y2, x1:x2]
+    fill = np.empty_like(region)
+    fill[:] = color
+    cv2.addWeighted(fill, alpha, region, 1 - alpha, 0, region)
@@ -1,40 +1,69 @@
 import sys
+import time
 import cv2
 import argparse
+from datetime import datetime
+from typing import Optional
 from config.settings import Settings
 from config.constants import WINDOW_NAME
 from core.processor import FrameProcessor
+from core.sign_journal import SignJournal
+from core.events import SignEvent, SignEventType
+from core.video_segments import ParallelVideoProcessor
 from services.model_service import ModelService
 from services.update_checker import UpdateChecker
 from ui.dashboard import Dashboard
+from ui.preview_server import PreviewServer
 from utils.logger import log
+from utils.profiler import PipelineProfiler
 from version import __version__, __app_name__
 
 
 class Application:
     def __init__(self):
         self.settings = Settings.load()
-        self.model_service = ModelService()
+        self.model_service = ModelService(self.settings.detection.model_pool_mb)
         self.update_checker = UpdateChecker(self.settings)
         self.dashboard: Dashboard = None
+        self.preview: Optional[PreviewServer] = None
+        self.headless = False
+        self.notice = ""
+        self.profiler = PipelineProfiler()
     
     def init(self) -> bool:
         log.info(f"{__app_name__} v{__version__} starting...")
         
         if self.settings.ota.auto_update:
-            info = self.update_checker.check()
-            if info.available:
-                log.info(f"New version available: {info.version}")
+            self.update_checker.check_async(on_result=self._on_update)
+            self.update_checker.start_scheduled(on_update=self._on_update)
         
         model_name = self.settings.detection.model_name
         if not self.model_service.load_model(model_name):
             log.error(f"Failed to load model: {model_name}")
             return False
+        gatekeeper = self.settings.detection.gatekeeper_model
+        if gatekeeper and not self.model_service.load_gatekeeper(gatekeeper):
+            log.warning(f"Failed to load gatekeeper model: {gatekeeper}, running full detector on every frame")
         
         self.dashboard = Dashboard(self.settings, self.model_service)
+        if self.notice:
+            self.dashboard.set_notice(self.notice)
+        self.profiler.install_signal()
         log.info("Application initialized")
         return True
     
+    def _on_update(self, info):
+        if not info.available:
+            return
+        log.info(f"New version available: {info.version}")
+        self.notice = f"Update available: v{info.version}"
+    
+    def shutdown(self):
+        self.update_checker.stop()
+        self.profiler.stop()
+        if self.preview:
+            self.preview.stop()
+    
     def run_camera(self, camera_id: int = 0):
         processor = FrameProcessor(self.model_service.detector, self.settings)
         
@@ -42,29 +71,7 @@ class Application:
             log.error(f"Cannot open camera: {camera_id}")
             return
         
-        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(WINDOW_NAME, 1280, 720)
-        cv2.setMouseCallback(WINDOW_NAME, self.dashboard.handle_mouse)
-        
-        try:
-            for frame, detections, time_ms in processor.stream_camera(self.dashboard.get_frame_roi):
-                display = self.dashboard.render(
-                    frame, detections, time_ms,
-                    processor.sign_state.results,
-                    processor.sign_state.progress_list,
-                    processor.sign_state.active_trackers
-                )
-                cv2.imshow(WINDOW_NAME, display)
-                
-                key = cv2.waitKey(1)
-                if key == ord('q'):
-                    break
-                self.dashboard.handle_key(key)
-        finally:
-            processor.close()
-            cv2.destroyAllWindows()
-        
-        log.info(f"Average processing time: {processor.get_avg_time():.1f}ms")
+        self._run_stream(processor, processor.stream_camera(self.dashboard.get_frame_roi))
     
     def run_video(self, video_path: str):
         processor = FrameProcessor(self.model_service.detector, self.settings)
@@ -73,35 +80,155 @@ class Application:
             log.error(f"Cannot open video: {video_path}")
             return
         
-        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(WINDOW_NAME, 1280, 720)
-        cv2.setMouseCallback(WINDOW_NAME, self.dashboard.handle_mouse)
+        self._run_stream(processor, processor.stream_video(self.dashboard.get_frame_roi))
+    
+    def run_video_parallel(self, video_path: str, workers: int, overlap_s: float):
+        model = self.model_service.current_model
+        parallel = ParallelVideoProcessor(
+            video_path, self.settings, model.path, self.model_service.detector.class_names, workers, overlap_s
+        )
+        started = time.time()
+        result = parallel.run(lambda r: log.info(f"Segment {r['segment']} done: {r['frames']} frames in {r['elapsed']:.1f}s"))
+        if not result:
+            return
+        
+        journal = SignJournal().start() if self.settings.detection.journal else None
+        for event in result["events"]:
+            log.info(f"t={event['timestamp']:.2f}s {event['label']} {event['confidence']:.0%} ({event['votes']}/{event['votes_needed']})")
+            if journal:
+                journal.record(SignEvent(
+                    SignEventType.DECIDED, event["tracker_id"], event["label"], event["confidence"], started + event["timestamp"],
+                    event["votes"], event["votes_needed"], tuple(event["bbox"]) if event["bbox"] else None
+                ))
+        if journal:
+            journal.stop()
+        log.info(f"{len(result['events'])} signs from {result['frames']} frames in {result['elapsed']:.1f}s")
+    
+    def _run_stream(self, processor: FrameProcessor, frames):
+        show = not self.headless
+        if show:
+            cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
+            cv2.resizeWindow(WINDOW_NAME, 1280, 720)
+            cv2.setMouseCallback(WINDOW_NAME, self.dashboard.handle_mouse)
+        if self.preview:
+            processor.sign_state.add_listener(lambda e: self.preview.publish_event(e.to_dict()))
+        processor.profiler = self.profiler
+        processor.gatekeeper = self.model_service.gatekeeper
+        if self.settings.detection.journal:
+            processor.attach_journal(SignJournal().start())
         
         try:
-            for frame, detections, time_ms in processor.stream_video(self.dashboard.get_frame_roi):
+            for frame, detections, time_ms in frames:
+                self.profiler.poll()
+                if self.profiler.active:
+                    self.profiler.mark("render")
+                self._sync_model(processor)
+                if self.notice != self.dashboard.notice:
+                    self.dashboard.set_notice(self.notice)
+                if self.preview and self.preview.stats_due():
+                    self.preview.publish_stats(self._stats(processor, detections, time_ms))
+                streaming = self.preview is not None and self.preview.clients > 0
+                if not show and not streaming:
+                    continue
+                
                 display = self.dashboard.render(
                     frame, detections, time_ms,
                     processor.sign_state.results,
                     processor.sign_state.progress_list,
-                    processor.sign_state.active_trackers
+                    processor.sign_state.active_trackers,
+                    processor.input_size
                 )
-                cv2.imshow(WINDOW_NAME, display)
+                if streaming:
+                    self.preview.publish_frame(display)
+                if not show:
+                    continue
                 
+                if self.profiler.active:
+                    self.profiler.mark("display")
+                cv2.imshow(WINDOW_NAME, display)
                 key = cv2.waitKey(1)
                 if key == ord('q'):
                     break
+                if key == ord('p') or key == ord('P'):
+                    self.profiler.request()
                 self.dashboard.handle_key(key)
+        except KeyboardInterrupt:
+            pass
         finally:
+            self.profiler.stop()
             processor.close()
-            cv2.destroyAllWindows()
+            if show:
+                cv2.destroyAllWindows()
         
         log.info(f"Average processing time: {processor.get_avg_time():.1f}ms")
+        if processor.gatekeeper:
+            cascade = processor.cascade_summary()
+            log.info(
+                f"Cascade: {cascade['skipped']}/{cascade['frames']} frames skipped by gatekeeper, "
+                f"{cascade['safety']} safety runs, estimated compute saved {cascade['savings']:.0%}"
+            )
+        models = self.model_service.pool.stats()
+        log.info(
+            f"Model pool: {len(models['resident'])} resident, "
+            f"{models['resident_bytes'] / 1024 / 1024:.1f}/{models['budget_bytes'] / 1024 / 1024:.0f} MB, "
+            f"hits {models['hits']}, misses {models['misses']}"
+        )
+        pool = processor.frames.stats()
+        log.info(
+            f"Frame pool: {pool['allocated']} allocated, {pool['reused']} reused, "
+            f"peak {pool['peak_in_use']} in use, {pool['alloc_mb_per_s']} MB/s, peak RSS {pool['peak_rss_mb']} MB"
+        )
+    
+    def _sync_model(self, processor: FrameProcessor):
+        detector = self.model_service.apply_pending_swap()
+        if detector:
+            processor.set_detector(detector)
+            self.dashboard.refresh_classes()
+            return
+        
+        wanted = self.settings.detection.model_name
+        current = self.model_service.current_model
+        if current and wanted != current.name and not self.model_service.is_switching:
+            def done(ok: bool, fallback=current.name):
+                if not ok:
+                    self.settings.detection.model_name = fallback
+            self.model_service.switch_model_async(wanted, processor.input_size, done)
+    
+    def _stats(self, processor: FrameProcessor, detections, time_ms: float) -> dict:
+        return {
+            "time_ms": round(time_ms, 1),
+            "avg_time_ms": round(processor.get_avg_time(), 1),
+            "budget_ms": round(processor.time_budget, 1),
+            "input_size": processor.input_size,
+            "detections": detections.to_dicts(),
+            "results": processor.sign_state.results,
+            "progress": processor.sign_state.progress_list,
+            "frame_pool": processor.frames.stats(),
+            "model_pool": self.model_service.pool.stats(),
+        }
+    
+    def start_preview(self, port: int, host: str = "127.0.0.1", max_fps: float = 10) -> bool:
+        self.preview = PreviewServer(host, port, max_fps)
+        if not self.preview.start():
+            self.preview = None
+            return False
+        return True
     
     def list_models(self):
         models = self.model_service.list_models()
         log.info(f"Found {len(models)} model(s):")
         for m in models:
-            log.info(f"  - {m.name} ({m.size / 1024 / 1024:.1f} MB)")
+            shape = "x".join(str(d) for d in m.input_shape) if m.input_shape else "?"
+            log.info(f"  - {m.name} ({m.size / 1024 / 1024:.1f} MB, md5 {(m.md5 or '?')[:8]}, input {shape})")
+    
+    def show_journal(self, label: str = "", trip: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None):
+        journal = SignJournal()
+        if not label and not trip and since is None and until is None:
+            for trip_id, count, first, last in journal.trips()[:10]:
+                log.info(f"Trip {trip_id}: {count} signs ({last - first:.0f}s)")
+        for entry in journal.query(since, until, label or None, trip, limit=50):
+            when = datetime.fromtimestamp(entry.recorded).strftime("%Y-%m-%d %H:%M:%S")
+            log.info(f"{when} [{entry.trip}] t={entry.ts:.2f} {entry.label} {entry.confidence:.0%} ({entry.votes}/{entry.votes_needed}) {entry.bbox}")
     
     def check_update(self):
         info = self.update_checker.check()
@@ -112,6 +239,13 @@ class Application:
             log.info("No updates available")
 
 
+def _time_arg(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
 def main():
     parser = argparse.ArgumentParser(description=f"{__app_name__} v{__version__}")
     parser.add_argument("--camera", type=int, metavar="ID", help="Camera ID")
@@ -119,6 +253,16 @@ def main():
     parser.add_argument("--model", type=str, metavar="NAME", help="Model name to use")
     parser.add_argument("--list-models", action="store_true", help="List available models")
     parser.add_argument("--check-update", action="store_true", help="Check for updates")
+    parser.add_argument("--preview", type=int, metavar="PORT", help="Serve MJPEG/JSON preview on PORT")
+    parser.add_argument("--preview-host", type=str, default="127.0.0.1", metavar="HOST", help="Preview bind address")
+    parser.add_argument("--preview-fps", type=float, default=10, metavar="FPS", help="Preview encode rate cap")
+    parser.add_argument("--headless", action="store_true", help="Do not open an OpenCV window")
+    parser.add_argument("--workers", type=int, metavar="N", help="Process --video in N parallel segments (headless)")
+    parser.add_argument("--overlap", type=float, default=4.0, metavar="SEC", help="Segment overlap for --workers")
+    parser.add_argument("--journal", nargs="?", const="", metavar="LABEL", help="Show journaled signs, optionally for LABEL ('P.127*' for a prefix)")
+    parser.add_argument("--trip", type=str, metavar="ID", help="Limit --journal to one trip")
+    parser.add_argument("--since", type=_time_arg, metavar="TIME", help="Limit --journal to signs at/after TIME (epoch seconds or ISO date)")
+    parser.add_argument("--until", type=_time_arg, metavar="TIME", help="Limit --journal to signs before TIME")
     
     args = parser.parse_args()
     
@@ -131,6 +275,10 @@ def main():
         app.list_models()
         return
     
+    if args.journal is not None:
+        app.show_journal(args.journal, args.trip, args.since, args.until)
+        return
+    
     if args.check_update:
         if not app.init():
             return
@@ -140,10 +288,19 @@ def main():
     if not app.init():
         sys.exit(1)
     
-    if args.video:
-        app.run_video(args.video)
-    else:
-        app.run_camera(args.camera if args.camera is not None else 0)
+    app.headless = args.headless
+    if args.preview is not None and not app.start_preview(args.preview, args.preview_host, args.preview_fps):
+        sys.exit(1)
+    
+    try:
+        if args.video and args.workers:
+            app.run_video_parallel(args.video, args.workers, args.overlap)
+        elif args.video:
+            app.run_video(args.video)
+        else:
+            app.run_camera(args.camera if args.camera is not None else 0)
+    finally:
+        app.shutdown()
 
 
 if __name__ == "__main__":
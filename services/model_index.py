@@ -0,0 +1,118 @@
+import os
+import json
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+from config.constants import CACHE_DIR
+from utils.file_handler import FileHandler
+from utils.onnx_meta import read_input_shape
+from utils.logger import log
+
+INDEX_FILE = os.path.join(CACHE_DIR, "model_index.json")
+
+
+@dataclass
+class ModelMeta:
+    path: str
+    size: int
+    mtime_ns: int
+    md5: Optional[str]
+    class_names: List[str] = field(default_factory=list)
+    names_mtime_ns: int = 0
+    input_shape: Optional[list] = None
+
+
+class ModelIndex:
+    VERSION = 1
+    
+    def __init__(self, index_file: str = INDEX_FILE):
+        self.index_file = index_file
+        self._entries: Dict[str, ModelMeta] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+    
+    def _load(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            self._entries = {p: ModelMeta(**m) for p, m in data.get("models", {}).items()}
+        except Exception as e:
+            log.warning(f"Model index unreadable, rebuilding: {e}")
+            self._entries = {}
+    
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({
+                "version": self.VERSION,
+                "models": {p: asdict(m) for p, m in self._entries.items()}
+            }, indent=1).encode("utf-8")
+            FileHandler.ensure_dir(os.path.dirname(self.index_file))
+            if FileHandler.atomic_write(self.index_file, payload):
+                self._dirty = False
+    
+    @staticmethod
+    def _names_path(path: str) -> str:
+        return f"{os.path.splitext(path)[0]}.json"
+    
+    @staticmethod
+    def _read_names(names_path: str) -> List[str]:
+        try:
+            with open(names_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("names", [])
+        except (OSError, ValueError):
+            return []
+    
+    def get(self, path: str) -> Optional[ModelMeta]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        names_path = self._names_path(path)
+        names_mtime = os.stat(names_path).st_mtime_ns if os.path.exists(names_path) else 0
+        
+        with self._lock:
+            meta = self._entries.get(path)
+            if meta and meta.size == st.st_size and meta.mtime_ns == st.st_mtime_ns:
+                if meta.names_mtime_ns != names_mtime:
+                    meta.class_names = self._read_names(names_path) if names_mtime else []
+                    meta.names_mtime_ns = names_mtime
+                    self._dirty = True
+                return meta
+        
+        log.debug(f"Indexing model: {path}")
+        meta = ModelMeta(
+            path=path,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            md5=FileHandler.md5(path),
+            class_names=self._read_names(names_path) if names_mtime else [],
+            names_mtime_ns=names_mtime,
+            input_shape=read_input_shape(path)
+        )
+        with self._lock:
+            self._entries[path] = meta
+            self._dirty = True
+        return meta
+    
+    def refresh(self, paths: List[str]) -> List[ModelMeta]:
+        keep = set(paths)
+        with self._lock:
+            stale = [p for p in self._entries if p not in keep and not os.path.exists(p)]
+            for p in stale:
+                del self._entries[p]
+                self._dirty = True
+        metas = [m for m in (self.get(p) for p in paths) if m]
+        self.save()
+        return metas
+    
+    def invalidate(self, path: str):
+        with self._lock:
+            if self._entries.pop(path, None):
+                self._dirty = True
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict, Callable
+from core.onnx_detector import ONNXDetector
+from utils.logger import log
+
+PoolKey = Tuple[str, str]
+
+
+class ModelPool:
+    def __init__(self, budget_bytes: int, on_evict: Optional[Callable[[ONNXDetector], None]] = None):
+        self.budget_bytes = budget_bytes
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[PoolKey, Tuple[ONNXDetector, int]]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+    
+    def __contains__(self, key: PoolKey) -> bool:
+        return key in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident_bytes
+    
+    def holds(self, detector: ONNXDetector) -> bool:
+        with self._lock:
+            return any(d is detector for d, _ in self._entries.values())
+    
+    def get(self, key: PoolKey) -> Optional[ONNXDetector]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: PoolKey, detector: ONNXDetector, size_bytes: int, protect: Optional[PoolKey] = None):
+        with self._lock:
+            if key in self._entries:
+                self._resident_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (detector, size_bytes)
+            self._resident_bytes += size_bytes
+            evicted = self._evict({key, protect})
+        for name, det in evicted:
+            log.info(f"Model evicted from pool: {name}")
+            if self.on_evict:
+                self.on_evict(det)
+    
+    def _evict(self, keep: set) -> list:
+        evicted = []
+        for key in list(self._entries):
+            if self._resident_bytes <= self.budget_bytes:
+                break
+            if key in keep:
+                continue
+            detector, size = self._entries.pop(key)
+            self._resident_bytes -= size
+            evicted.append((key[0], detector))
+        return evicted
+    
+    def remove(self, key: PoolKey) -> Optional[ONNXDetector]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._resident_bytes -= entry[1]
+            return entry[0]
+    
+    def remove_name(self, name: str) -> list:
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == name]
+        return [d for d in (self.remove(k) for k in keys) if d]
+    
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._resident_bytes = 0
+        if self.on_evict:
+            for detector, _ in entries:
+                self.on_evict(detector)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "resident": [k[0] for k in self._entries],
+                "resident_bytes": self._resident_bytes,
+                "budget_bytes": self.budget_bytes,
+            }
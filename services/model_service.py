@@ -1,11 +1,14 @@
 import os
-import json
+import threading
+import numpy as np
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple, Callable
 from config.constants import MODELS_DIR
 from core.onnx_detector import ONNXDetector, Detection
 from utils.logger import log
 from utils.file_handler import FileHandler
+from services.model_index import ModelIndex, ModelMeta
+from services.model_pool import ModelPool, PoolKey
 
 
 @dataclass
@@ -14,15 +17,23 @@ class LocalModel:
     path: str
     size: int
     md5: Optional[str] = None
+    input_shape: Optional[list] = None
 
 
 class ModelService:
     SUPPORTED_EXTENSIONS = ('.onnx',)
     
-    def __init__(self):
+    def __init__(self, pool_budget_mb: int = 256):
         self._detector: Optional[ONNXDetector] = None
         self._current_model: Optional[LocalModel] = None
+        self._gatekeeper: Optional[ONNXDetector] = None
+        self._gatekeeper_model: Optional[LocalModel] = None
         FileHandler.ensure_dir(MODELS_DIR)
+        self.index = ModelIndex()
+        self.pool = ModelPool(pool_budget_mb * 1024 * 1024, on_evict=self._release)
+        self._swap_lock = threading.Lock()
+        self._pending: Optional[Tuple[ONNXDetector, LocalModel]] = None
+        self._switch_thread: Optional[threading.Thread] = None
     
     @property
     def detector(self) -> Optional[ONNXDetector]:
@@ -32,71 +43,198 @@ class ModelService:
     def current_model(self) -> Optional[LocalModel]:
         return self._current_model
     
+    @property
+    def gatekeeper(self) -> Optional[ONNXDetector]:
+        return self._gatekeeper
+    
+    @property
+    def gatekeeper_model(self) -> Optional[LocalModel]:
+        return self._gatekeeper_model
+    
     def list_models(self) -> List[LocalModel]:
-        models = []
-        for f in os.listdir(MODELS_DIR):
-            if f.endswith(self.SUPPORTED_EXTENSIONS):
-                path = os.path.join(MODELS_DIR, f)
-                models.append(LocalModel(
-                    name=f,
-                    path=path,
-                    size=os.path.getsize(path),
-                    md5=FileHandler.md5(path)
-                ))
-        return models
+        paths = [
+            os.path.join(MODELS_DIR, f) for f in sorted(os.listdir(MODELS_DIR))
+            if f.endswith(self.SUPPORTED_EXTENSIONS)
+        ]
+        return [self._local_model(meta) for meta in self.index.refresh(paths)]
+    
+    @staticmethod
+    def _local_model(meta: ModelMeta) -> LocalModel:
+        return LocalModel(
+            name=os.path.basename(meta.path),
+            path=meta.path,
+            size=meta.size,
+            md5=meta.md5,
+            input_shape=meta.input_shape
+        )
     
     def _load_class_names(self, model_name: str) -> List[str]:
-        base_name = os.path.splitext(model_name)[0]
-        json_path = os.path.join(MODELS_DIR, f"{base_name}.json")
-        if os.path.exists(json_path):
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('names', [])
-        return []
+        meta = self.index.get(os.path.join(MODELS_DIR, model_name))
+        return list(meta.class_names) if meta else []
     
-    def load_model(self, model_name: str) -> bool:
+    def _resolve_name(self, model_name: str) -> str:
         if not model_name.endswith(self.SUPPORTED_EXTENSIONS):
             for ext in self.SUPPORTED_EXTENSIONS:
                 test_path = os.path.join(MODELS_DIR, model_name + ext)
                 if os.path.exists(test_path):
-                    model_name += ext
-                    break
-        
+                    return model_name + ext
+        return model_name
+    
+    def _pool_key(self, model_name: str) -> Optional[PoolKey]:
+        meta = self.index.get(os.path.join(MODELS_DIR, self._resolve_name(model_name)))
+        return (os.path.basename(meta.path), meta.md5) if meta else None
+    
+    def _current_key(self) -> Optional[PoolKey]:
+        model = self._current_model
+        return (model.name, model.md5) if model else None
+    
+    def _release(self, detector: ONNXDetector):
+        pending = self._pending
+        if detector is self._detector or detector is self._gatekeeper or (pending and pending[0] is detector):
+            return
+        detector.unload()
+    
+    def is_resident(self, model_name: str) -> bool:
+        key = self._pool_key(model_name)
+        return key is not None and key in self.pool
+    
+    def _prepare(self, model_name: str) -> Optional[Tuple[ONNXDetector, LocalModel]]:
+        model_name = self._resolve_name(model_name)
         path = os.path.join(MODELS_DIR, model_name)
         
         if not os.path.exists(path):
             log.error(f"Model not found: {path}")
-            return False
+            return None
+        
+        meta = self.index.get(path)
+        if not meta:
+            return None
+        model = self._local_model(meta)
+        key = (model.name, model.md5)
+        detector = self.pool.get(key)
+        if detector:
+            log.info(f"Model resident in pool: {model_name}")
+            return detector, model
         
-        self._detector = ONNXDetector()
-        class_names = self._load_class_names(model_name)
-        success = self._detector.load(path, class_names)
+        detector = ONNXDetector()
+        if not detector.load(path, self._load_class_names(model_name)):
+            return None
         
-        if success:
-            self._current_model = LocalModel(
-                name=model_name,
-                path=path,
-                size=os.path.getsize(path),
-                md5=FileHandler.md5(path)
-            )
-            return True
-        return False
+        self.index.save()
+        self.pool.put(key, detector, meta.size, protect=self._current_key())
+        return detector, model
+    
+    def _install(self, detector: ONNXDetector, model: LocalModel):
+        with self._swap_lock:
+            old = self._detector
+            self._detector = detector
+            self._current_model = model
+        if old and old is not detector and old is not self._gatekeeper and not self.pool.holds(old):
+            old.unload()
+    
+    def load_gatekeeper(self, model_name: str) -> bool:
+        prepared = self._prepare(model_name)
+        if not prepared:
+            return False
+        detector, model = prepared
+        with self._swap_lock:
+            old = self._gatekeeper
+            self._gatekeeper = detector
+            self._gatekeeper_model = model
+        if old and old is not detector and old is not self._detector and not self.pool.holds(old):
+            old.unload()
+        log.info(f"Gatekeeper model loaded: {model.name}")
+        return True
+    
+    def unload_gatekeeper(self):
+        with self._swap_lock:
+            old = self._gatekeeper
+            self._gatekeeper = None
+            self._gatekeeper_model = None
+        if old and old is not self._detector and not self.pool.holds(old):
+            old.unload()
+    
+    def load_model(self, model_name: str) -> bool:
+        prepared = self._prepare(model_name)
+        if not prepared:
+            return False
+        self._install(*prepared)
+        return True
     
     def switch_model(self, model_name: str) -> bool:
-        self.unload()
         return self.load_model(model_name)
     
+    @property
+    def is_switching(self) -> bool:
+        return self._switch_thread is not None and self._switch_thread.is_alive()
+    
+    def switch_model_async(
+        self,
+        model_name: str,
+        warmup_size: int = 320,
+        on_done: Optional[Callable[[bool], None]] = None
+    ) -> bool:
+        if self.is_switching:
+            return False
+        
+        def worker():
+            resident = self.is_resident(model_name)
+            prepared = self._prepare(model_name)
+            if prepared and not resident:
+                detector, model = prepared
+                try:
+                    detector.detect_batch(np.zeros((warmup_size, warmup_size, 3), dtype=np.uint8), imgsz=warmup_size)
+                except Exception as e:
+                    log.error(f"Model warm-up failed, keeping current model: {e}")
+                    self.pool.remove((model.name, model.md5))
+                    detector.unload()
+                    prepared = None
+            if prepared:
+                with self._swap_lock:
+                    self._pending = prepared
+                log.info(f"Model ready for swap: {prepared[1].name}")
+            else:
+                log.error(f"Failed to load model: {model_name}, keeping current model")
+            if on_done:
+                on_done(prepared is not None)
+        
+        self._switch_thread = threading.Thread(target=worker, daemon=True)
+        self._switch_thread.start()
+        return True
+    
+    def apply_pending_swap(self) -> Optional[ONNXDetector]:
+        if self._pending is None:
+            return None
+        with self._swap_lock:
+            pending, self._pending = self._pending, None
+        if not pending:
+            return None
+        self._install(*pending)
+        log.info(f"Switched model: {pending[1].name}")
+        return pending[0]
+    
     def unload(self):
-        if self._detector:
-            self._detector.unload()
-        self._detector = None
-        self._current_model = None
+        with self._swap_lock:
+            old = self._detector
+            gatekeeper = self._gatekeeper
+            self._detector = None
+            self._current_model = None
+            self._gatekeeper = None
+            self._gatekeeper_model = None
+        self.pool.clear()
+        for detector in (old, gatekeeper):
+            if detector:
+                detector.unload()
     
     def delete_model(self, model_name: str) -> bool:
-        if self._current_model and self._current_model.name == model_name:
+        if any(m and m.name == model_name for m in (self._current_model, self._gatekeeper_model)):
             log.warning("Cannot delete currently loaded model")
             return False
         
         path = os.path.join(MODELS_DIR, model_name)
+        for detector in self.pool.remove_name(model_name):
+            detector.unload()
+        self.index.invalidate(path)
+        self.index.save()
         return FileHandler.safe_delete(path)
 
@@ -5,7 +5,9 @@ from config.settings import Settings
 from config.constants import MODELS_DIR, CACHE_DIR
 from utils.network import HttpClient
 from utils.file_handler import FileHandler
+from utils.delta import apply_delta, DeltaError
 from utils.logger import log
+from services.model_index import ModelIndex
 
 
 @dataclass
@@ -16,6 +18,9 @@ class ModelInfo:
     size: int
     md5: str
     download_url: str
+    delta_url: Optional[str] = None
+    delta_base_md5: Optional[str] = None
+    delta_size: int = 0
 
 
 class OTAService:
@@ -41,21 +46,56 @@ class OTAService:
         progress_cb: Optional[Callable[[int], None]] = None
     ) -> Optional[str]:
         cache_path = os.path.join(CACHE_DIR, f"{model.id}.pt.download")
+        patched_path = os.path.join(CACHE_DIR, f"{model.id}.pt.patched")
         final_path = os.path.join(MODELS_DIR, f"{model.id}.pt")
         
+        if self._apply_delta_update(model, final_path, patched_path, progress_cb):
+            return self._install(patched_path, final_path)
+        
         log.info(f"Downloading model: {model.name} v{model.version}")
         
-        if not self.client.download(model.download_url, cache_path, progress_cb):
+        if not self.client.download(model.download_url, cache_path, progress_cb, expected_md5=model.md5):
             log.error("Download failed")
-            FileHandler.safe_delete(cache_path)
             return None
         
-        actual_md5 = FileHandler.md5(cache_path)
-        if actual_md5 != model.md5:
-            log.error(f"MD5 mismatch: expected {model.md5}, got {actual_md5}")
-            FileHandler.safe_delete(cache_path)
-            return None
+        return self._install(cache_path, final_path)
+    
+    def _apply_delta_update(
+        self,
+        model: ModelInfo,
+        base_path: str,
+        out_path: str,
+        progress_cb: Optional[Callable[[int], None]] = None
+    ) -> bool:
+        if not model.delta_url or not model.delta_base_md5 or not os.path.exists(base_path):
+            return False
+        meta = ModelIndex().get(base_path)
+        if not meta or meta.md5 != model.delta_base_md5:
+            log.info("Installed model does not match delta base, using full download")
+            return False
+        
+        delta_path = os.path.join(CACHE_DIR, f"{model.id}.delta.download")
+        log.info(f"Downloading delta for {model.name} v{model.version} ({model.delta_size / 1024 / 1024:.1f} MB)")
+        if not self.client.download(model.delta_url, delta_path, progress_cb):
+            log.warning("Delta download failed, using full download")
+            return False
+        
+        try:
+            actual_md5 = apply_delta(base_path, delta_path, out_path)
+        except (OSError, DeltaError) as e:
+            log.warning(f"Delta patch failed: {e}, using full download")
+            actual_md5 = None
+        FileHandler.safe_delete(delta_path)
         
+        if actual_md5 != model.md5:
+            if actual_md5:
+                log.warning(f"Patched model MD5 mismatch: expected {model.md5}, got {actual_md5}, using full download")
+            FileHandler.safe_delete(out_path)
+            return False
+        log.info(f"Delta applied: {model.delta_size} bytes instead of {model.size}")
+        return True
+    
+    def _install(self, cache_path: str, final_path: str) -> str:
         FileHandler.backup(final_path)
         os.replace(cache_path, final_path)
         
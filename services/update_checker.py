@@ -1,8 +1,10 @@
 import threading
 import time
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict
 from config.settings import Settings
+from config.constants import UPDATE_CHECK_DEADLINE
 from utils.network import HttpClient
 from utils.logger import log
 from version import __version__, __build__
@@ -28,39 +30,83 @@ class UpdateChecker:
         self._timer: Optional[threading.Timer] = None
         self._on_update: Optional[Callable[[UpdateInfo], None]] = None
     
+    def _endpoint(self) -> str:
+        return f"/updates/check?version={__version__}&build={__build__}"
+    
+    @staticmethod
+    def _parse(resp: Dict) -> UpdateInfo:
+        if resp.get("update_available"):
+            info = UpdateInfo(
+                available=True,
+                version=resp.get("version", ""),
+                build=resp.get("build", ""),
+                url=resp.get("download_url", ""),
+                changelog=resp.get("changelog", ""),
+                mandatory=resp.get("mandatory", False)
+            )
+            log.info(f"Update available: v{info.version}")
+            return info
+        
+        log.info("App is up to date")
+        return UpdateInfo(available=False)
+    
     def check(self) -> UpdateInfo:
         try:
-            resp = self.client.get(f"/updates/check?version={__version__}&build={__build__}")
-            
-            if resp.get("update_available"):
-                info = UpdateInfo(
-                    available=True,
-                    version=resp.get("version", ""),
-                    build=resp.get("build", ""),
-                    url=resp.get("download_url", ""),
-                    changelog=resp.get("changelog", ""),
-                    mandatory=resp.get("mandatory", False)
-                )
-                log.info(f"Update available: v{info.version}")
-                return info
-            
-            log.info("App is up to date")
-            return UpdateInfo(available=False)
-            
+            return self._parse(self.client.get(self._endpoint()))
         except Exception as e:
             log.warning(f"Update check failed: {e}")
             return UpdateInfo(available=False)
     
+    def check_async(
+        self,
+        deadline: float = UPDATE_CHECK_DEADLINE,
+        on_result: Optional[Callable[[UpdateInfo], None]] = None
+    ) -> Future:
+        result: Future = Future()
+        lock = threading.Lock()
+        request = self.client.get_async(self._endpoint())
+        
+        def finish(info: UpdateInfo):
+            with lock:
+                if result.done():
+                    return
+                result.set_result(info)
+            if on_result:
+                on_result(info)
+        
+        def on_response(f: Future):
+            timer.cancel()
+            if f.cancelled():
+                return
+            try:
+                info = self._parse(f.result())
+            except Exception as e:
+                log.warning(f"Update check failed: {e}")
+                info = UpdateInfo(available=False)
+            finish(info)
+        
+        def on_deadline():
+            if request.cancel():
+                log.warning(f"Update check gave up after {deadline:g}s")
+                finish(UpdateInfo(available=False))
+        
+        timer = threading.Timer(deadline, on_deadline)
+        timer.daemon = True
+        timer.start()
+        request.add_done_callback(on_response)
+        return result
+    
     def download(self, info: UpdateInfo, progress_cb: Optional[Callable[[int], None]] = None) -> bool:
         if not info.url:
             return False
-        return self.client.download(info.url, "update.zip", progress_cb)
+        return self.client.download(info.url, "update.zip", progress_cb) is not None
     
     def start_scheduled(
         self,
-        interval_seconds: int,
+        interval_seconds: Optional[int] = None,
         on_update: Optional[Callable[[UpdateInfo], None]] = None
     ):
+        interval_seconds = interval_seconds or self.settings.ota.check_interval
         self._on_update = on_update
         self._schedule_next(interval_seconds)
         log.info(f"Update checker scheduled every {interval_seconds}s")
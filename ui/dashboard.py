@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 from typing import List, Optional, Dict
 from config.settings import Settings
+from core.detections import DetectionBatch
 from services.model_service import ModelService
 
 
@@ -13,6 +14,8 @@ class Dashboard:
     ACTIVE_COLOR = (0, 255, 100)
     INACTIVE_COLOR = (100, 100, 100)
     FONT = cv2.FONT_HERSHEY_SIMPLEX
+    RESULT_RECT = (450, 440, 350, 250)
+    STATS_RECT = (820, 20, 200, 125)
     
     def __init__(self, settings: Settings, model_service: ModelService, width: int = 1280, height: int = 720):
         self.settings = settings
@@ -27,6 +30,9 @@ class Dashboard:
         self.roi_end: Optional[tuple] = None
         self.roi_drawing = False
         self.roi_box: Optional[tuple] = None
+        self._background: Optional[np.ndarray] = None
+        self._canvas: Optional[np.ndarray] = None
+        self.notice = ""
         self._init_classes()
     
     def _init_classes(self):
@@ -34,11 +40,34 @@ class Dashboard:
         for name in names:
             self.active_classes[name] = True
         self._sync_settings()
+        self.invalidate()
+    
+    def refresh_classes(self):
+        previous = self.active_classes
+        self.active_classes = {}
+        for name in self.model_service.detector.class_names:
+            self.active_classes[name] = previous.get(name, True)
+        self.selected_class_idx = min(self.selected_class_idx, max(0, len(self.active_classes) - 1))
+        self._sync_settings()
+        self.invalidate()
+    
+    def invalidate(self):
+        self._background = None
+    
+    def set_notice(self, text: str):
+        self.notice = text
+        self.invalidate()
     
     def _sync_settings(self):
         self.settings.detection.target_classes = [k for k, v in self.active_classes.items() if v]
     
     def handle_key(self, key: int) -> bool:
+        changed = self._apply_key(key)
+        if changed:
+            self.invalidate()
+        return changed
+    
+    def _apply_key(self, key: int) -> bool:
         names = list(self.active_classes.keys())
         if not names:
             return False
@@ -57,8 +86,19 @@ class Dashboard:
         elif key == ord('r') or key == ord('R'):
             self.roi_box = None
             return True
+        elif key == ord('n') or key == ord('N'):
+            return self._cycle_model()
         return False
     
+    def _cycle_model(self) -> bool:
+        names = [m.name for m in self.model_service.list_models()]
+        if len(names) < 2:
+            return False
+        current = self.settings.detection.model_name
+        idx = names.index(current) if current in names else -1
+        self.settings.detection.model_name = names[(idx + 1) % len(names)]
+        return True
+    
     def handle_mouse(self, event: int, x: int, y: int, flags: int, param):
         cx, cy = self.camera_offset
         cw, ch = self.camera_size
@@ -83,6 +123,7 @@ class Dashboard:
                 self.roi_box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
             else:
                 self.roi_box = None
+            self.invalidate()
     
     def get_frame_roi(self, frame_shape: tuple) -> Optional[tuple]:
         if not self.roi_box:
@@ -101,44 +142,71 @@ class Dashboard:
         time_ms: float,
         sign_results: List[str],
         sign_progress: List[str],
-        active_trackers: list = None
+        active_trackers: list = None,
+        input_size: Optional[int] = None
     ) -> np.ndarray:
-        canvas = np.full((self.height, self.width, 3), self.BG_COLOR, dtype=np.uint8)
+        background = self._background
+        if background is None:
+            background = self._background = self._build_background()
+            if self._canvas is None or self._canvas.shape != background.shape:
+                self._canvas = background.copy()
+            else:
+                np.copyto(self._canvas, background)
+        else:
+            self._restore_dynamic(self._canvas, background)
         
+        canvas = self._canvas
         self._draw_camera_panel(canvas, camera_frame, detections, active_trackers or [])
-        self._draw_class_panel(canvas)
         self._draw_result_panel(canvas, sign_results, sign_progress)
-        self._draw_stats_panel(canvas, time_ms, len(detections))
-        self._draw_help(canvas)
+        self._draw_stats_panel(canvas, time_ms, len(detections), input_size)
         
         return canvas
     
+    def _build_background(self) -> np.ndarray:
+        canvas = np.full((self.height, self.width, 3), self.BG_COLOR, dtype=np.uint8)
+        self._draw_camera_frame(canvas)
+        self._draw_class_panel(canvas)
+        self._draw_result_frame(canvas)
+        self._draw_stats_frame(canvas)
+        self._draw_help(canvas)
+        return canvas
+    
+    def _dynamic_regions(self) -> List[tuple]:
+        return [
+            (self.RESULT_RECT[0] + 1, self.RESULT_RECT[1] + 30, self.RESULT_RECT[0] + self.RESULT_RECT[2], self.height),
+            (self.STATS_RECT[0] + 1, self.STATS_RECT[1] + 30, self.STATS_RECT[0] + self.STATS_RECT[2], self.STATS_RECT[1] + self.STATS_RECT[3]),
+        ]
+    
+    def _restore_dynamic(self, canvas: np.ndarray, background: np.ndarray):
+        for x1, y1, x2, y2 in self._dynamic_regions():
+            canvas[y1:y2, x1:x2] = background[y1:y2, x1:x2]
+    
+    def _draw_camera_frame(self, canvas: np.ndarray):
+        x, y = self.camera_offset
+        w, h = self.camera_size
+        cv2.rectangle(canvas, (x-2, y-2), (x+w+2, y+h+2), self.ACCENT_COLOR, 2)
+        label = "CAMERA (R: Reset ROI)" if self.roi_box else "CAMERA (Drag to set ROI)"
+        cv2.putText(canvas, label, (x, y + h + 20), self.FONT, 0.5, self.TEXT_COLOR, 1)
+    
     def _draw_camera_panel(self, canvas: np.ndarray, frame: np.ndarray, detections: list, trackers: list = None):
-        x, y = 20, 20
+        x, y = self.camera_offset
         w, h = self.camera_size
         fh, fw = frame.shape[:2]
         sx, sy = w / fw, h / fh
         
-        cv2.rectangle(canvas, (x-2, y-2), (x+w+2, y+h+2), self.ACCENT_COLOR, 2)
-        resized = cv2.resize(frame, (w, h))
+        view = canvas[y:y+h, x:x+w]
+        cv2.resize(frame, (w, h), dst=view)
         
-        for det in detections:
-            ox1, oy1, ox2, oy2 = det.bbox
-            dx1, dy1 = int(ox1 * sx), int(oy1 * sy)
-            dx2, dy2 = int(ox2 * sx), int(oy2 * sy)
-            cv2.rectangle(resized, (dx1, dy1), (dx2, dy2), self.ACTIVE_COLOR, 2)
-            cv2.putText(resized, det.label, (dx1, dy1 - 3), self.FONT, 0.4, self.ACTIVE_COLOR, 1)
+        scaled = DetectionBatch.from_detections(detections).scale(sx, sy)
+        for (dx1, dy1, dx2, dy2), label in zip(scaled.boxes.tolist(), scaled.labels):
+            cv2.rectangle(view, (dx1, dy1), (dx2, dy2), self.ACTIVE_COLOR, 2)
+            cv2.putText(view, label, (dx1, dy1 - 3), self.FONT, 0.4, self.ACTIVE_COLOR, 1)
         
         if self.roi_drawing and self.roi_start and self.roi_end:
-            cv2.rectangle(resized, self.roi_start, self.roi_end, (0, 255, 255), 2)
+            cv2.rectangle(view, self.roi_start, self.roi_end, (0, 255, 255), 2)
         elif self.roi_box:
             rx1, ry1, rx2, ry2 = self.roi_box
-            cv2.rectangle(resized, (rx1, ry1), (rx2, ry2), (0, 255, 255), 2)
-        
-        canvas[y:y+h, x:x+w] = resized
-        label = "CAMERA (R: Reset ROI)" if self.roi_box else "CAMERA (Drag to set ROI)"
-        cv2.putText(canvas, label, (x, y + h + 20), self.FONT, 0.5, self.TEXT_COLOR, 1)
-
+            cv2.rectangle(view, (rx1, ry1), (rx2, ry2), (0, 255, 255), 2)
     
     def _draw_class_panel(self, canvas: np.ndarray):
         x, y = 450, 20
@@ -167,13 +235,14 @@ class Dashboard:
             
             cv2.putText(canvas, f"{prefix}{indicator} {name}", (x+10, ty), self.FONT, 0.45, color, 1)
     
-    def _draw_result_panel(self, canvas: np.ndarray, results: List[str], progress: List[str]):
-        x, y = 450, 440
-        w, h = 350, 250
-        
+    def _draw_result_frame(self, canvas: np.ndarray):
+        x, y, w, h = self.RESULT_RECT
         cv2.rectangle(canvas, (x, y), (x+w, y+h), self.PANEL_COLOR, -1)
         cv2.rectangle(canvas, (x, y), (x+w, y+h), self.ACCENT_COLOR, 1)
         cv2.putText(canvas, "CLASSIFICATION RESULTS", (x+10, y+25), self.FONT, 0.5, self.ACCENT_COLOR, 1)
+    
+    def _draw_result_panel(self, canvas: np.ndarray, results: List[str], progress: List[str]):
+        x, y, w, h = self.RESULT_RECT
         
         ty = y + 55
         for res in results:
@@ -187,16 +256,21 @@ class Dashboard:
                 cv2.putText(canvas, f"  {prog}", (x+20, ty), self.FONT, 0.45, self.INACTIVE_COLOR, 1)
                 ty += 20
     
-    def _draw_stats_panel(self, canvas: np.ndarray, time_ms: float, det_count: int):
-        x, y = 820, 20
-        w, h = 200, 100
-        
+    def _draw_stats_frame(self, canvas: np.ndarray):
+        x, y, w, h = self.STATS_RECT
         cv2.rectangle(canvas, (x, y), (x+w, y+h), self.PANEL_COLOR, -1)
         cv2.rectangle(canvas, (x, y), (x+w, y+h), self.ACCENT_COLOR, 1)
         cv2.putText(canvas, "STATS", (x+10, y+25), self.FONT, 0.5, self.ACCENT_COLOR, 1)
+    
+    def _draw_stats_panel(self, canvas: np.ndarray, time_ms: float, det_count: int, input_size: Optional[int] = None):
+        x, y, w, h = self.STATS_RECT
+        input_size = input_size or self.settings.detection.input_size
         cv2.putText(canvas, f"Time: {time_ms:.0f}ms", (x+10, y+50), self.FONT, 0.45, self.TEXT_COLOR, 1)
         cv2.putText(canvas, f"Detections: {det_count}", (x+10, y+75), self.FONT, 0.45, self.TEXT_COLOR, 1)
+        cv2.putText(canvas, f"Input: {input_size}px", (x+10, y+100), self.FONT, 0.45, self.TEXT_COLOR, 1)
     
     def _draw_help(self, canvas: np.ndarray):
         x, y = 20, self.height - 40
-        cv2.putText(canvas, "W/S: Navigate  SPACE: Toggle class  Q: Quit", (x, y), self.FONT, 0.45, self.INACTIVE_COLOR, 1)
+        cv2.putText(canvas, "W/S: Navigate  SPACE: Toggle class  N: Next model  P: Profile  Q: Quit", (x, y), self.FONT, 0.45, self.INACTIVE_COLOR, 1)
+        if self.notice:
+            cv2.putText(canvas, self.notice, (x, y + 25), self.FONT, 0.45, self.ACCENT_COLOR, 1)
@@ -0,0 +1,214 @@
+import json
+import time
+import threading
+import cv2
+import numpy as np
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Deque
+from utils.logger import log
+
+BOUNDARY = "frame"
+INDEX_HTML = """<!doctype html>
+<html><head><title>Assistant Preview</title></head>
+<body style="background:#282828;color:#ddd;font-family:sans-serif">
+<img src="/stream.mjpg" style="max-width:100%">
+<pre id="stats"></pre>
+<script>
+setInterval(() => fetch('/stats').then(r => r.json()).then(s => {
+  document.getElementById('stats').textContent = JSON.stringify(s, null, 2);
+}), 1000);
+</script>
+</body></html>
+"""
+
+
+class PreviewServer:
+    MAX_EVENTS = 200
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, max_fps: float = 10, quality: int = 70):
+        self.host = host
+        self.port = port
+        self.interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.quality = quality
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads = []
+        self._running = False
+        self._clients = 0
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._jpeg_ready = threading.Condition(threading.Lock())
+        self._pending: Optional[np.ndarray] = None
+        self._spare: Optional[np.ndarray] = None
+        self._has_pending = False
+        self._last_publish = 0.0
+        self._last_stats = 0.0
+        self._jpeg: Optional[bytes] = None
+        self._jpeg_id = 0
+        self._stats: Dict = {}
+        self._events: Deque[Dict] = deque(maxlen=self.MAX_EVENTS)
+        self._event_seq = 0
+    
+    @property
+    def clients(self) -> int:
+        return self._clients
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+    
+    def start(self) -> bool:
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        except OSError as e:
+            log.error(f"Preview server failed to start: {e}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._encode_loop, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        log.info(f"Preview server running at {self.url}")
+        return True
+    
+    def stop(self):
+        self._running = False
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        with self._jpeg_ready:
+            self._jpeg_ready.notify_all()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for t in self._threads:
+            t.join(timeout=2)
+        self._threads = []
+    
+    def publish_frame(self, frame: np.ndarray):
+        if not self._clients:
+            return
+        now = time.perf_counter()
+        if now - self._last_publish < self.interval:
+            return
+        self._last_publish = now
+        with self._frame_ready:
+            if self._pending is None or self._pending.shape != frame.shape:
+                self._pending = np.empty_like(frame)
+            np.copyto(self._pending, frame)
+            self._has_pending = True
+            self._frame_ready.notify()
+    
+    def stats_due(self) -> bool:
+        now = time.perf_counter()
+        if now - self._last_stats < self.interval:
+            return False
+        self._last_stats = now
+        return True
+    
+    def publish_stats(self, stats: Dict):
+        self._stats = dict(stats, timestamp=time.time())
+    
+    def publish_event(self, event: Dict):
+        with self._lock:
+            self._event_seq += 1
+            self._events.append(dict(event, seq=self._event_seq))
+    
+    def _encode_loop(self):
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while self._running:
+            with self._frame_ready:
+                while self._running and not self._has_pending:
+                    self._frame_ready.wait(timeout=1.0)
+                if not self._running:
+                    return
+                work = self._pending
+                self._pending = self._spare
+                self._spare = None
+                self._has_pending = False
+            ok, encoded = cv2.imencode(".jpg", work, params)
+            with self._frame_ready:
+                if self._spare is None:
+                    self._spare = work
+            if not ok:
+                continue
+            with self._jpeg_ready:
+                self._jpeg = encoded.tobytes()
+                self._jpeg_id += 1
+                self._jpeg_ready.notify_all()
+    
+    def _wait_jpeg(self, last_id: int, timeout: float = 5.0):
+        with self._jpeg_ready:
+            if self._jpeg_id == last_id and self._running:
+                self._jpeg_ready.wait(timeout)
+            return self._jpeg_id, self._jpeg
+    
+    def _events_since(self, since: int) -> list:
+        with self._lock:
+            return [e for e in self._events if e["seq"] > since]
+    
+    def _client_connected(self, delta: int):
+        with self._lock:
+            self._clients += delta
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                log.debug(f"Preview {self.address_string()} {fmt % args}")
+            
+            def _send(self, body: bytes, content_type: str, status: int = 200):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _send_json(self, data):
+                self._send(json.dumps(data).encode(), "application/json")
+            
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                if path == "/":
+                    self._send(INDEX_HTML.encode(), "text/html; charset=utf-8")
+                elif path == "/stats":
+                    self._send_json(server._stats)
+                elif path == "/events":
+                    params = dict(p.split("=", 1) for p in query.split("&") if "=" in p)
+                    since = int(params.get("since", "0") or 0)
+                    self._send_json({"events": server._events_since(since)})
+                elif path == "/stream.mjpg":
+                    self._stream()
+                else:
+                    self._send(b"Not found", "text/plain", 404)
+            
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                server._client_connected(1)
+                last_id = 0
+                try:
+                    while server._running:
+                        jpeg_id, jpeg = server._wait_jpeg(last_id)
+                        if jpeg is None or jpeg_id == last_id:
+                            continue
+                        last_id = jpeg_id
+                        self.wfile.write(
+                            f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                        )
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    server._client_connected(-1)
+        
+        return Handler
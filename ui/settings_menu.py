@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 from typing import List, Callable
 from config.settings import Settings
+from core.visualizer import blend_rect
 from services.model_service import ModelService
 
 
@@ -89,23 +90,24 @@ class SettingsMenu:
             return frame
         
         result = frame.copy()
-        overlay = result.copy()
-        h, w = result.shape[:2]
+        self.draw_into(result)
+        return result
+    
+    def draw_into(self, out: np.ndarray):
+        if not self.visible:
+            return
         
         menu_w, menu_h = 300, 30 + len(self.items) * 35
         x, y = 20, 60
         
-        cv2.rectangle(overlay, (x, y), (x + menu_w, y + menu_h), (30, 30, 30), -1)
-        cv2.addWeighted(overlay, 0.85, result, 0.15, 0, result)
+        blend_rect(out, (x, y, x + menu_w + 1, y + menu_h + 1), (30, 30, 30), 0.85)
         
-        cv2.putText(result, "SETTINGS (M to close)", (x + 10, y + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        cv2.putText(out, "SETTINGS (M to close)", (x + 10, y + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
         
         for i, (name, getter, _) in enumerate(self.items):
             ty = y + 55 + i * 35
             color = (0, 255, 255) if i == self.selected else (200, 200, 200)
             prefix = "> " if i == self.selected else "  "
-            cv2.putText(result, f"{prefix}{name}: {getter()}", (x + 10, ty), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-        
-        cv2.putText(result, "W/S: Select  A/D: Change", (x + 10, y + menu_h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
+            cv2.putText(out, f"{prefix}{name}: {getter()}", (x + 10, ty), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
         
-        return result
+        cv2.putText(out, "W/S: Select  A/D: Change", (x + 10, y + menu_h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
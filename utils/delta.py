@@ -0,0 +1,252 @@
+import os
+import zlib
+import struct
+import hashlib
+import argparse
+import numpy as np
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"TSRDELT1"
+HEADER = struct.Struct("<8sQI16s16s")
+OP_COPY = 0
+OP_DATA = 1
+DEFAULT_CHUNK = 4096
+SCAN_SLICE = 16 << 20
+
+
+class DeltaError(Exception):
+    pass
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+class _OpWriter:
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        self.compressor = zlib.compressobj(6)
+        self.copy: Optional[Tuple[int, int]] = None
+        self.data = bytearray()
+        self.copied = 0
+        self.literal = 0
+    
+    def copy_block(self, offset: int, length: int):
+        self._flush_data()
+        if self.copy and self.copy[0] + self.copy[1] == offset:
+            self.copy = (self.copy[0], self.copy[1] + length)
+        else:
+            self._flush_copy()
+            self.copy = (offset, length)
+        self.copied += length
+    
+    def add_data(self, data: bytes):
+        self._flush_copy()
+        self.data += data
+        self.literal += len(data)
+        if len(self.data) >= 1 << 20:
+            self._flush_data()
+    
+    def _emit(self, data: bytes):
+        self.out.write(self.compressor.compress(data))
+    
+    def _flush_copy(self):
+        if self.copy:
+            self._emit(bytes([OP_COPY]) + _varint(self.copy[0]) + _varint(self.copy[1]))
+            self.copy = None
+    
+    def _flush_data(self):
+        if self.data:
+            self._emit(bytes([OP_DATA]) + _varint(len(self.data)))
+            self._emit(bytes(self.data))
+            self.data = bytearray()
+    
+    def close(self):
+        self._flush_copy()
+        self._flush_data()
+        self.out.write(self.compressor.flush())
+
+
+def _boundaries(data: bytes, avg_size: int, min_size: int, max_size: int) -> List[int]:
+    arr = np.frombuffer(data, dtype=np.uint8)
+    bits = max(1, avg_size.bit_length() - 1)
+    candidates = []
+    for start in range(0, max(0, len(arr) - 3), SCAN_SLICE):
+        part = arr[start:start + SCAN_SLICE + 3].astype(np.uint32)
+        window = part[:-3] | (part[1:-2] << 8) | (part[2:-1] << 16) | (part[3:] << 24)
+        hashed = window * np.uint32(2654435761)
+        candidates.append(np.flatnonzero((hashed >> np.uint32(32 - bits)) == 0) + start + 4)
+    candidates = np.concatenate(candidates) if candidates else np.empty(0, dtype=np.int64)
+    
+    cuts = []
+    pos = 0
+    while len(data) - pos > min_size:
+        i = np.searchsorted(candidates, pos + min_size)
+        cut = int(candidates[i]) if i < len(candidates) else len(data)
+        pos = min(cut, pos + max_size, len(data))
+        cuts.append(pos)
+    if pos < len(data):
+        cuts.append(len(data))
+    return cuts
+
+
+def _chunks(data: bytes, avg_size: int) -> Iterator[Tuple[int, int]]:
+    start = 0
+    for end in _boundaries(data, avg_size, avg_size // 4, avg_size * 4):
+        yield start, end
+        start = end
+
+
+def make_delta(base_path: str, target_path: str, delta_path: str, chunk_size: int = DEFAULT_CHUNK) -> Dict:
+    with open(base_path, "rb") as f:
+        base = f.read()
+    with open(target_path, "rb") as f:
+        target = f.read()
+    
+    index: Dict[bytes, int] = {}
+    for start, end in _chunks(base, chunk_size):
+        index.setdefault(hashlib.md5(base[start:end]).digest(), start)
+    
+    header = HEADER.pack(MAGIC, len(target), chunk_size, hashlib.md5(base).digest(), hashlib.md5(target).digest())
+    with open(delta_path, "wb") as out:
+        out.write(header)
+        ops = _OpWriter(out)
+        expected = 0
+        for start, end in _chunks(target, chunk_size):
+            chunk = target[start:end]
+            if base[expected:expected + len(chunk)] == chunk:
+                offset = expected
+            else:
+                offset = index.get(hashlib.md5(chunk).digest(), -1)
+                if offset >= 0 and base[offset:offset + len(chunk)] != chunk:
+                    offset = -1
+            if offset >= 0:
+                ops.copy_block(offset, len(chunk))
+                expected = offset + len(chunk)
+            else:
+                ops.add_data(chunk)
+                expected += len(chunk)
+        ops.close()
+    
+    return {
+        "base_md5": hashlib.md5(base).hexdigest(),
+        "target_size": len(target),
+        "delta_size": os.path.getsize(delta_path),
+        "copied": ops.copied,
+        "literal": ops.literal,
+    }
+
+
+class _Stream:
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.decompressor = zlib.decompressobj()
+        self.buf = bytearray()
+    
+    def read(self, n: int) -> bytes:
+        while len(self.buf) < n:
+            chunk = self.f.read(1 << 16)
+            if not chunk:
+                self.buf += self.decompressor.flush()
+                break
+            self.buf += self.decompressor.decompress(chunk)
+        data = bytes(self.buf[:n])
+        del self.buf[:n]
+        return data
+    
+    def varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            b = self.read(1)
+            if not b:
+                raise DeltaError("truncated delta")
+            result |= (b[0] & 0x7F) << shift
+            if not b[0] & 0x80:
+                return result
+            shift += 7
+
+
+def read_header(delta_path: str) -> Tuple[int, str, str]:
+    with open(delta_path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise DeltaError("truncated delta header")
+    magic, target_size, _, base_md5, target_md5 = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise DeltaError("not a model delta")
+    return target_size, base_md5.hex(), target_md5.hex()
+
+
+def apply_delta(base_path: str, delta_path: str, out_path: str) -> str:
+    target_size, _, _ = read_header(delta_path)
+    hasher = hashlib.md5()
+    written = 0
+    with open(base_path, "rb") as base, open(delta_path, "rb") as f, open(out_path, "wb") as out:
+        f.seek(HEADER.size)
+        stream = _Stream(f)
+        while True:
+            op = stream.read(1)
+            if not op:
+                break
+            if op[0] == OP_COPY:
+                offset = stream.varint()
+                remaining = stream.varint()
+                base.seek(offset)
+                while remaining:
+                    chunk = base.read(min(remaining, 1 << 20))
+                    if not chunk:
+                        raise DeltaError("copy past end of base file")
+                    out.write(chunk)
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+                    written += len(chunk)
+            elif op[0] == OP_DATA:
+                length = stream.varint()
+                chunk = stream.read(length)
+                if len(chunk) != length:
+                    raise DeltaError("truncated delta")
+                out.write(chunk)
+                hasher.update(chunk)
+                written += length
+            else:
+                raise DeltaError(f"unknown delta op {op[0]}")
+    if written != target_size:
+        raise DeltaError(f"delta produced {written} bytes, expected {target_size}")
+    return hasher.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or apply binary model deltas")
+    sub = parser.add_subparsers(dest="command", required=True)
+    make = sub.add_parser("make", help="Create a delta from base to target")
+    make.add_argument("base")
+    make.add_argument("target")
+    make.add_argument("delta")
+    make.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="Average chunk size in bytes")
+    apply = sub.add_parser("apply", help="Rebuild target from base and delta")
+    apply.add_argument("base")
+    apply.add_argument("delta")
+    apply.add_argument("out")
+    args = parser.parse_args()
+    
+    if args.command == "make":
+        info = make_delta(args.base, args.target, args.delta, args.chunk_size)
+        ratio = info["delta_size"] / max(1, info["target_size"])
+        print(f"delta_base_md5: {info['base_md5']}")
+        print(f"delta_size: {info['delta_size']} ({ratio:.1%} of target)")
+        print(f"copied {info['copied']} bytes, literal {info['literal']} bytes")
+    else:
+        print(apply_delta(args.base, args.delta, args.out))
+
+
+if __name__ == "__main__":
+    main()
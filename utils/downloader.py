@@ -0,0 +1,315 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import http.client
+import urllib.request
+import urllib.error
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, List, Callable
+from config.constants import API_TIMEOUT, API_RETRY_COUNT
+from utils.file_handler import FileHandler
+from utils.logger import log
+
+NETWORK_ERRORS = (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError, OSError)
+
+
+class RangeNotSatisfied(Exception):
+    pass
+
+
+@dataclass
+class Segment:
+    start: int
+    end: int
+    pos: int
+    
+    @property
+    def done(self) -> bool:
+        return self.pos >= self.end
+
+
+@dataclass
+class DownloadState:
+    url: str
+    size: int
+    validator: str = ""
+    segments: List[Segment] = field(default_factory=list)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional["DownloadState"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data["segments"] = [Segment(**s) for s in data.get("segments", [])]
+            return cls(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    def save(self, path: str):
+        FileHandler.atomic_write(path, json.dumps(asdict(self)).encode())
+
+
+class Downloader:
+    def __init__(
+        self,
+        headers: Optional[Dict] = None,
+        timeout: float = API_TIMEOUT,
+        retry_count: int = API_RETRY_COUNT,
+        segments: int = 4,
+        min_segment_size: int = 8 << 20,
+        chunk_size: int = 64 << 10,
+        checkpoint_bytes: int = 4 << 20
+    ):
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.retry_count = retry_count
+        self.segments = max(1, segments)
+        self.min_segment_size = min_segment_size
+        self.chunk_size = chunk_size
+        self.checkpoint_bytes = checkpoint_bytes
+    
+    def download(
+        self,
+        url: str,
+        dest: str,
+        expected_md5: Optional[str] = None,
+        progress_cb: Optional[Callable[[int], None]] = None
+    ) -> Optional[str]:
+        state_path = f"{dest}.state"
+        try:
+            size, validator, ranges = self._probe(url)
+        except NETWORK_ERRORS as e:
+            log.error(f"Download probe failed: {e}")
+            return None
+        
+        state = None
+        if ranges and os.path.exists(dest) and os.path.getsize(dest) == size:
+            state = DownloadState.load(state_path)
+        if state and (state.url != url or state.size != size or state.validator != validator):
+            log.info("Remote file changed, discarding partial download")
+            state = None
+        if state:
+            done = sum(s.pos - s.start for s in state.segments)
+            log.info(f"Resuming download at {done}/{size} bytes")
+        else:
+            FileHandler.safe_delete(dest)
+            state = DownloadState(url=url, size=size, validator=validator, segments=self._split(size, ranges))
+        
+        job = _Job(self, dest, state, state_path, progress_cb)
+        md5 = job.run()
+        if md5 is None:
+            return None
+        
+        FileHandler.safe_delete(state_path)
+        if expected_md5 and md5 != expected_md5:
+            log.error(f"MD5 mismatch: expected {expected_md5}, got {md5}")
+            FileHandler.safe_delete(dest)
+            return None
+        return md5
+    
+    def _split(self, size: int, ranges: bool) -> List[Segment]:
+        if size < 0:
+            return [Segment(0, -1, 0)]
+        count = self.segments if ranges else 1
+        count = max(1, min(count, size // self.min_segment_size))
+        step = -(-size // count) if size else 0
+        bounds = [min(i * step, size) for i in range(count)] + [size]
+        return [Segment(bounds[i], bounds[i + 1], bounds[i]) for i in range(count)]
+    
+    def _request(self, url: str, method: str = "GET", extra: Optional[Dict] = None) -> urllib.request.Request:
+        return urllib.request.Request(url, headers={**self.headers, **(extra or {})}, method=method)
+    
+    def _probe(self, url: str):
+        try:
+            with urllib.request.urlopen(self._request(url, "HEAD"), timeout=self.timeout) as resp:
+                headers = resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code not in (403, 405, 501):
+                raise
+            with urllib.request.urlopen(self._request(url, extra={"Range": "bytes=0-0"}), timeout=self.timeout) as resp:
+                headers = resp.headers
+                if resp.status == 206:
+                    total = headers.get("Content-Range", "").rpartition("/")[2]
+                    return int(total) if total.isdigit() else -1, self._validator(headers), total.isdigit()
+        
+        length = headers.get("Content-Length")
+        size = int(length) if length and length.isdigit() else -1
+        ranges = headers.get("Accept-Ranges", "").lower() == "bytes" and size >= 0
+        return size, self._validator(headers), ranges
+    
+    @staticmethod
+    def _validator(headers) -> str:
+        etag = headers.get("ETag", "")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return headers.get("Last-Modified", "")
+
+
+class _Job:
+    def __init__(self, downloader: Downloader, dest: str, state: DownloadState, state_path: str, progress_cb):
+        self.dl = downloader
+        self.dest = dest
+        self.state = state
+        self.state_path = state_path
+        self.progress_cb = progress_cb
+        self.hasher = hashlib.md5()
+        self.hashed = 0
+        self.failed = False
+        self._file = None
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._unsaved = 0
+        self._last_percent = -1
+    
+    def run(self) -> Optional[str]:
+        FileHandler.ensure_dir(os.path.dirname(os.path.abspath(self.dest)))
+        fd = os.open(self.dest, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        self._file = os.fdopen(fd, "r+b", buffering=0)
+        try:
+            if self.state.size >= 0 and os.fstat(fd).st_size != self.state.size:
+                self._file.truncate(self.state.size)
+            self._advance_hash()
+            pending = [s for s in self.state.segments if not s.done or s.end < 0]
+            if len(pending) > 1:
+                workers = [threading.Thread(target=self._fetch, args=(s,), daemon=True) for s in pending]
+                for t in workers:
+                    t.start()
+                for t in workers:
+                    t.join()
+            elif pending:
+                self._fetch(pending[0])
+            
+            with self._lock:
+                if not self.failed:
+                    self._advance_hash()
+                complete = not self.failed and all(s.done for s in self.state.segments)
+                if not complete:
+                    self._checkpoint()
+                    return None
+            if self.state.size < 0:
+                self._file.truncate(self.hashed)
+            return self.hasher.hexdigest()
+        finally:
+            self._file.close()
+    
+    def _fetch(self, segment: Segment):
+        attempt = 0
+        while not segment.done or segment.end < 0:
+            progressed = segment.pos
+            try:
+                self._stream(segment)
+                if segment.end < 0:
+                    segment.end = segment.pos
+                return
+            except RangeNotSatisfied as e:
+                log.error(f"Download failed: {e}")
+                break
+            except urllib.error.HTTPError as e:
+                if e.code < 500 or attempt >= self.dl.retry_count:
+                    log.error(f"Download failed: HTTP {e.code}")
+                    break
+            except NETWORK_ERRORS as e:
+                if segment.pos > progressed:
+                    attempt = 0
+                if attempt >= self.dl.retry_count:
+                    log.error(f"Download failed after {attempt} retries: {e}")
+                    break
+                log.warning(f"Download interrupted at {segment.pos} bytes: {e}")
+            if self.failed:
+                return
+            if segment.end < 0:
+                self._restart(segment)
+            time.sleep(min(2 ** attempt, 30) * 0.5)
+            attempt += 1
+        with self._lock:
+            self.failed = True
+    
+    def _stream(self, segment: Segment):
+        extra = {}
+        if segment.end >= 0 and (segment.pos > 0 or segment.end < self.state.size):
+            extra["Range"] = f"bytes={segment.pos}-{segment.end - 1}"
+            if self.state.validator:
+                extra["If-Range"] = self.state.validator
+        with urllib.request.urlopen(self.dl._request(self.state.url, extra=extra), timeout=self.dl.timeout) as resp:
+            if "Range" in extra and resp.status != 206:
+                if len(self.state.segments) > 1 or resp.headers.get("Content-Length") != str(self.state.size):
+                    raise RangeNotSatisfied("server ignored range request, remote file may have changed")
+                self._restart(segment)
+            buf = bytearray(self.dl.chunk_size)
+            view = memoryview(buf)
+            while not self.failed:
+                limit = self.dl.chunk_size if segment.end < 0 else min(self.dl.chunk_size, segment.end - segment.pos)
+                if limit <= 0:
+                    return
+                n = resp.readinto(view[:limit])
+                if not n:
+                    if segment.end >= 0:
+                        raise ConnectionError(f"connection closed with {segment.end - segment.pos} bytes left")
+                    return
+                self._write(segment, view[:n])
+    
+    def _write_at(self, data: memoryview, offset: int):
+        with self._io_lock:
+            self._file.seek(offset)
+            while data:
+                data = data[self._file.write(data):]
+    
+    def _read_at(self, size: int, offset: int) -> bytes:
+        with self._io_lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+    
+    def _write(self, segment: Segment, data: memoryview):
+        offset = segment.pos
+        self._write_at(data, offset)
+        with self._lock:
+            segment.pos += len(data)
+            if offset == self.hashed:
+                self.hasher.update(data)
+                self.hashed += len(data)
+            self._advance_hash()
+            self._unsaved += len(data)
+            if self._unsaved >= self.dl.checkpoint_bytes:
+                self._checkpoint()
+        self._report()
+    
+    def _restart(self, segment: Segment):
+        with self._lock:
+            segment.pos = segment.start
+            self.hasher = hashlib.md5()
+            self.hashed = 0
+    
+    def _frontier(self) -> int:
+        frontier = 0
+        for s in self.state.segments:
+            frontier = s.pos
+            if not s.done or s.end < 0:
+                break
+        return frontier
+    
+    def _advance_hash(self):
+        frontier = self._frontier()
+        while self.hashed < frontier:
+            data = self._read_at(min(self.dl.chunk_size * 4, frontier - self.hashed), self.hashed)
+            if not data:
+                break
+            self.hasher.update(data)
+            self.hashed += len(data)
+    
+    def _checkpoint(self):
+        if self.state.size < 0:
+            return
+        os.fsync(self._file.fileno())
+        self.state.save(self.state_path)
+        self._unsaved = 0
+    
+    def _report(self):
+        if not self.progress_cb or self.state.size <= 0:
+            return
+        done = sum(s.pos - s.start for s in self.state.segments)
+        percent = min(100, done * 100 // self.state.size)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress_cb(percent)
@@ -26,13 +26,18 @@ class FileHandler:
         return True
     
     @staticmethod
-    def md5(path: str) -> Optional[str]:
+    def md5(path: str, chunk_size: int = 1 << 20) -> Optional[str]:
         if not os.path.exists(path):
             return None
         hasher = hashlib.md5()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hasher.update(view[:n])
         return hasher.hexdigest()
     
     @staticmethod
@@ -1,8 +1,63 @@
 import os
+import glob
+import queue
+import atexit
 import logging
-from datetime import datetime
+from datetime import date
+from logging.handlers import QueueHandler, QueueListener
 from config.constants import LOGS_DIR
 
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_KEEP_DAYS = 14
+
+
+class DailyRotatingFileHandler(logging.FileHandler):
+    def __init__(self, log_dir: str, max_bytes: int = LOG_MAX_BYTES, keep_days: int = LOG_KEEP_DAYS):
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.keep_days = keep_days
+        self._day = date.today()
+        self._index = self._last_index()
+        super().__init__(self._path(), encoding="utf-8", delay=True)
+    
+    def _path(self) -> str:
+        suffix = f".{self._index}" if self._index else ""
+        return os.path.join(self.log_dir, f"{self._day:%Y%m%d}{suffix}.log")
+    
+    def _last_index(self) -> int:
+        index = 0
+        while os.path.exists(os.path.join(self.log_dir, f"{self._day:%Y%m%d}.{index + 1}.log")):
+            index += 1
+        return index
+    
+    def _reopen(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self._path())
+    
+    def _prune(self):
+        files = sorted(glob.glob(os.path.join(self.log_dir, "[0-9]" * 8 + "*.log")))
+        cutoff = f"{date.fromordinal(self._day.toordinal() - self.keep_days):%Y%m%d}"
+        for path in files:
+            if os.path.basename(path)[:8] < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def emit(self, record: logging.LogRecord):
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._index = 0
+            self._reopen()
+            self._prune()
+        elif self.max_bytes and self.stream and self.stream.tell() >= self.max_bytes:
+            self._index += 1
+            self._reopen()
+        super().emit(record)
+
 
 class Logger:
     _instances = {}
@@ -20,9 +75,9 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
         
+        self.listener = None
         if not self.logger.handlers:
-            log_file = os.path.join(LOGS_DIR, f"{datetime.now():%Y%m%d}.log")
-            fh = logging.FileHandler(log_file, encoding="utf-8")
+            fh = DailyRotatingFileHandler(LOGS_DIR)
             fh.setLevel(logging.DEBUG)
             
             ch = logging.StreamHandler()
@@ -32,8 +87,16 @@ class Logger:
             fh.setFormatter(fmt)
             ch.setFormatter(fmt)
             
-            self.logger.addHandler(fh)
-            self.logger.addHandler(ch)
+            records = queue.SimpleQueue()
+            self.logger.addHandler(QueueHandler(records))
+            self.listener = QueueListener(records, fh, ch, respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.stop)
+    
+    def stop(self):
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
     
     def info(self, msg: str):
         self.logger.info(msg)
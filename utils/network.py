@@ -1,38 +1,215 @@
-import urllib.request
-import urllib.error
+import os
 import json
-import time
-from typing import Optional, Dict, Callable
-from config.constants import API_TIMEOUT, API_RETRY_COUNT
+import hashlib
+import threading
+import http.client
+import urllib.error
+import urllib.parse
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Optional, Dict, Callable, Tuple, List
+from config.constants import API_TIMEOUT, API_RETRY_COUNT, CACHE_DIR
+from utils.downloader import Downloader
+from utils.file_handler import FileHandler
+
+HostKey = Tuple[str, str, int]
+RETRYABLE = (ConnectionError, TimeoutError, OSError, http.client.HTTPException)
+
+
+class ConnectionPool:
+    _pools: Dict[HostKey, "ConnectionPool"] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, key: HostKey, max_idle: int = 4):
+        self.key = key
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_url(cls, url: str) -> "ConnectionPool":
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname or "", port)
+        with cls._registry_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(key)
+            return cls._pools[key]
+    
+    @classmethod
+    def close_all(cls):
+        with cls._registry_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+    
+    def acquire(self, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                conn = self._idle.pop()
+                conn.timeout = timeout
+                return conn, True
+            self.created += 1
+        scheme, host, port = self.key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_cls(host, port, timeout=timeout), False
+    
+    def release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+    
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = os.path.join(CACHE_DIR, "http")):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        FileHandler.ensure_dir(cache_dir)
+    
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(url.encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.json", f"{base}.body"
+    
+    def validators(self, url: str) -> Dict[str, str]:
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+    
+    def body(self, url: str) -> Optional[bytes]:
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self.hits += 1
+        return data
+    
+    def store(self, url: str, headers, body: bytes):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        if FileHandler.atomic_write(body_path, body):
+            FileHandler.atomic_write(meta_path, json.dumps(meta).encode())
 
 
 class HttpClient:
-    def __init__(self, base_url: str = "", headers: Optional[Dict] = None):
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="http")
+    
+    def __init__(self, base_url: str = "", headers: Optional[Dict] = None, cache: Optional[ResponseCache] = None):
         self.base_url = base_url.rstrip("/")
         self.headers = headers or {}
         self.timeout = API_TIMEOUT
         self.retry_count = API_RETRY_COUNT
+        self.cache = cache or ResponseCache()
+        self.downloader = Downloader(headers=self.headers, timeout=self.timeout, retry_count=self.retry_count)
     
-    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
-        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
+    def _send(self, method: str, url: str, body: Optional[bytes], headers: Dict) -> Tuple[int, object, bytes]:
+        pool = ConnectionPool.for_url(url)
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        
+        while True:
+            conn, reused = pool.acquire(self.timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except RETRYABLE:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                pool.release(conn)
+            return resp.status, resp.headers, data
+    
+    def _attempt(self, method: str, url: str, body: Optional[bytes]) -> Dict:
         headers = {**self.headers, "Content-Type": "application/json"}
+        if method == "GET":
+            headers.update(self.cache.validators(url))
         
+        status, resp_headers, data = self._send(method, url, body, headers)
+        if status == 304:
+            cached = self.cache.body(url)
+            if cached is not None:
+                return json.loads(cached.decode())
+            status, resp_headers, data = self._send(method, url, body, {**self.headers, "Content-Type": "application/json"})
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, data[:200].decode(errors="replace"), resp_headers, None)
+        if method == "GET" and status == 200:
+            self.cache.store(url, resp_headers, data)
+        return json.loads(data.decode()) if data else {}
+    
+    def request_async(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Future:
+        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
         body = json.dumps(data).encode() if data else None
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+        future: Future = Future()
         
-        for attempt in range(self.retry_count):
+        def attempt(n: int):
+            if future.cancelled():
+                return
             try:
-                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                    return json.loads(resp.read().decode())
+                result = self._attempt(method, url, body)
+                try:
+                    future.set_result(result)
+                except InvalidStateError:
+                    pass
+                return
             except urllib.error.HTTPError as e:
-                if e.code < 500 or attempt == self.retry_count - 1:
-                    raise
-                time.sleep(2 ** attempt)
-            except urllib.error.URLError:
-                if attempt == self.retry_count - 1:
-                    raise
-                time.sleep(2 ** attempt)
-        return {}
+                error = e
+                retry = e.code >= 500
+            except RETRYABLE as e:
+                error = e
+                retry = True
+            except Exception as e:
+                error = e
+                retry = False
+            if future.cancelled():
+                return
+            if not retry or n >= self.retry_count - 1:
+                try:
+                    future.set_exception(error)
+                except InvalidStateError:
+                    pass
+                return
+            timer = threading.Timer(2 ** n, lambda: self._executor.submit(attempt, n + 1))
+            timer.daemon = True
+            timer.start()
+        
+        self._executor.submit(attempt, 0)
+        return future
+    
+    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
+        return self.request_async(method, endpoint, data).result()
     
     def get(self, endpoint: str) -> Dict:
         return self._request("GET", endpoint)
@@ -40,13 +217,17 @@ class HttpClient:
     def post(self, endpoint: str, data: Dict) -> Dict:
         return self._request("POST", endpoint, data)
     
-    def download(self, url: str, dest: str, progress_cb: Optional[Callable] = None) -> bool:
+    def get_async(self, endpoint: str) -> Future:
+        return self.request_async("GET", endpoint)
+    
+    def download(
+        self,
+        url: str,
+        dest: str,
+        progress_cb: Optional[Callable] = None,
+        expected_md5: Optional[str] = None
+    ) -> Optional[str]:
         try:
-            def report(block_num, block_size, total_size):
-                if progress_cb and total_size > 0:
-                    progress_cb(min(100, (block_num * block_size * 100) // total_size))
-            
-            urllib.request.urlretrieve(url, dest, reporthook=report)
-            return True
+            return self.downloader.download(url, dest, expected_md5, progress_cb)
         except Exception:
-            return False
+            return None
@@ -0,0 +1,151 @@
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+Dim = Union[int, str]
+
+
+def _read_varint(f: BinaryIO) -> Optional[int]:
+    result = 0
+    shift = 0
+    while True:
+        b = f.read(1)
+        if not b:
+            return None
+        byte = b[0]
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result
+        shift += 7
+
+
+def _varint_from(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf: bytes) -> Iterator[Tuple[int, int, Union[int, bytes]]]:
+    pos = 0
+    while pos < len(buf):
+        key, pos = _varint_from(buf, pos)
+        field, wire = key >> 3, key & 7
+        if wire == 0:
+            value, pos = _varint_from(buf, pos)
+        elif wire == 1:
+            value, pos = buf[pos:pos+8], pos + 8
+        elif wire == 2:
+            length, pos = _varint_from(buf, pos)
+            value, pos = buf[pos:pos+length], pos + length
+        elif wire == 5:
+            value, pos = buf[pos:pos+4], pos + 4
+        else:
+            return
+        yield field, wire, value
+
+
+def _fields_prefix(buf: bytes) -> Iterator[Tuple[int, int, Union[int, bytes]]]:
+    try:
+        for item in _fields(buf):
+            yield item
+    except IndexError:
+        return
+
+
+def _skip(f: BinaryIO, wire: int) -> bool:
+    if wire == 0:
+        return _read_varint(f) is not None
+    if wire == 1:
+        f.seek(8, 1)
+    elif wire == 2:
+        length = _read_varint(f)
+        if length is None:
+            return False
+        f.seek(length, 1)
+    elif wire == 5:
+        f.seek(4, 1)
+    else:
+        return False
+    return True
+
+
+def _find(f: BinaryIO, end: int, target: int) -> Iterator[int]:
+    while f.tell() < end:
+        key = _read_varint(f)
+        if key is None:
+            return
+        field, wire = key >> 3, key & 7
+        if field == target and wire == 2:
+            length = _read_varint(f)
+            start = f.tell()
+            yield length
+            f.seek(start + length)
+        elif not _skip(f, wire):
+            return
+
+
+def _shape(value_info: bytes) -> Optional[List[Dim]]:
+    for field, _, type_proto in _fields(value_info):
+        if field != 2:
+            continue
+        for tfield, _, tensor_type in _fields(type_proto):
+            if tfield != 1:
+                continue
+            for sfield, _, shape in _fields(tensor_type):
+                if sfield != 2:
+                    continue
+                dims: List[Dim] = []
+                for dfield, _, dim in _fields(shape):
+                    if dfield != 1:
+                        continue
+                    value: Dim = "?"
+                    for vfield, _, v in _fields(dim):
+                        if vfield == 1:
+                            value = v
+                        elif vfield == 2:
+                            value = v.decode("utf-8", "replace")
+                    dims.append(value)
+                return dims
+    return None
+
+
+def read_input_shape(path: str) -> Optional[List[Dim]]:
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(0)
+            for graph_len in _find(f, size, 7):
+                graph_end = f.tell() + graph_len
+                initializers = set()
+                inputs = []
+                while f.tell() < graph_end:
+                    key = _read_varint(f)
+                    if key is None:
+                        break
+                    field, wire = key >> 3, key & 7
+                    if field == 11 and wire == 2:
+                        length = _read_varint(f)
+                        inputs.append(f.read(length))
+                    elif field == 5 and wire == 2:
+                        length = _read_varint(f)
+                        start = f.tell()
+                        head = f.read(min(length, 4096))
+                        for tfield, _, value in _fields_prefix(head):
+                            if tfield == 8:
+                                initializers.add(value)
+                        f.seek(start + length)
+                    elif not _skip(f, wire):
+                        break
+                for value_info in inputs:
+                    name = next((v for fld, _, v in _fields(value_info) if fld == 1), b"")
+                    if name not in initializers:
+                        return _shape(value_info)
+                return None
+    except (OSError, IndexError, ValueError, AttributeError):
+        return None
+    return None
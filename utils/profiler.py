@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+import signal
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Optional, Dict
+from config.constants import LOGS_DIR
+from utils.file_handler import FileHandler
+from utils.logger import log
+
+
+class PipelineProfiler:
+    def __init__(self, duration: float = 10.0, interval: float = 0.005, log_dir: str = LOGS_DIR, trace_frames: int = 10):
+        self.duration = duration
+        self.interval = interval
+        self.log_dir = log_dir
+        self.trace_frames = trace_frames
+        self.active = False
+        self.stage = "idle"
+        self.frames = 0
+        self.last_output: Optional[str] = None
+        self._requested = False
+        self._started = 0.0
+        self._stage_since = 0.0
+        self._stage_time: Dict[str, float] = defaultdict(float)
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._owns_tracemalloc = False
+    
+    def install_signal(self, signum: Optional[int] = None) -> bool:
+        signum = signum or getattr(signal, "SIGUSR1", None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda *_: self.request())
+        return True
+    
+    def request(self):
+        self._requested = True
+    
+    def poll(self):
+        if self._requested:
+            self._requested = False
+            if self.active:
+                self.stop()
+            else:
+                self.start()
+        elif self.active:
+            self.frames += 1
+            if time.perf_counter() - self._started >= self.duration:
+                self.stop()
+    
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        self._stage_time[self.stage] += now - self._stage_since
+        self._stage_since = now
+        self.stage = stage
+    
+    def start(self):
+        if self.active:
+            return
+        self._stacks.clear()
+        self._stage_time.clear()
+        self._samples = 0
+        self.frames = 0
+        self.stage = "idle"
+        self._started = self._stage_since = time.perf_counter()
+        
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._owns_tracemalloc = True
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, args=(threading.get_ident(),), daemon=True)
+        self._sampler.start()
+        self.active = True
+        log.info(f"Profiling started for {self.duration:.0f}s")
+    
+    def stop(self) -> Optional[str]:
+        if not self.active:
+            return None
+        self.active = False
+        self.mark("idle")
+        self._profile.disable()
+        self._stop.set()
+        self._sampler.join(timeout=1)
+        snapshot = tracemalloc.take_snapshot()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        
+        FileHandler.ensure_dir(self.log_dir)
+        base = os.path.join(self.log_dir, f"profile-{datetime.now():%Y%m%d-%H%M%S}")
+        self._write_collapsed(f"{base}.collapsed")
+        self._profile.dump_stats(f"{base}.prof")
+        self._write_summary(f"{base}.txt", snapshot)
+        self._profile = None
+        self.last_output = base
+        log.info(f"Profile written: {base}.collapsed ({self._samples} samples, {self.frames} frames)")
+        return base
+    
+    def _sample_loop(self, thread_id: int):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                frame = frame.f_back
+            names.append(f"stage:{self.stage}")
+            self._stacks[";".join(reversed(names))] += 1
+            self._samples += 1
+    
+    def _write_collapsed(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    
+    def _write_summary(self, path: str, snapshot: tracemalloc.Snapshot):
+        elapsed = max(1e-9, time.perf_counter() - self._started)
+        lines = [f"duration {elapsed:.2f}s, frames {self.frames}, samples {self._samples}", "", "stage time:"]
+        total = sum(self._stage_time.values()) or 1e-9
+        for stage, seconds in sorted(self._stage_time.items(), key=lambda x: -x[1]):
+            per_frame = seconds * 1000 / self.frames if self.frames else 0.0
+            lines.append(f"  {stage:<12}{seconds:8.3f}s {seconds / total:6.1%} {per_frame:8.2f}ms/frame")
+        lines += ["", "top allocations:"]
+        for stat in snapshot.statistics("lineno")[:25]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:10.1f} KiB {stat.count:7d} blocks  {frame.filename}:{frame.lineno}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
@@ -0,0 +1,69 @@
+import os
+import json
+import queue
+import threading
+from datetime import date
+from typing import Optional, Dict, List
+from config.constants import LOGS_DIR
+from utils.file_handler import FileHandler
+
+
+class Telemetry:
+    def __init__(self, sample_every: int = 10, log_dir: str = LOGS_DIR, max_pending: int = 1024, flush_every: int = 64):
+        self.sample_every = max(1, sample_every)
+        self.log_dir = log_dir
+        self.flush_every = flush_every
+        self.recorded = 0
+        self.dropped = 0
+        self._count = 0
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        FileHandler.ensure_dir(log_dir)
+    
+    @property
+    def path(self) -> str:
+        return os.path.join(self.log_dir, f"telemetry-{date.today():%Y%m%d}.jsonl")
+    
+    def start(self) -> "Telemetry":
+        if not self._thread:
+            self._thread = threading.Thread(target=self._write_loop, daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def sample(self) -> bool:
+        self._count += 1
+        return self._count % self.sample_every == 0
+    
+    def record(self, row: Dict):
+        try:
+            self._queue.put_nowait(row)
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+    
+    def _write_loop(self):
+        running = True
+        while running:
+            batch: List[Dict] = []
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+                if len(batch) >= self.flush_every:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                lines = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in batch)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)